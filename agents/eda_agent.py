@@ -1,16 +1,21 @@
 # eda_agent.py
 
+import os
+
 import pandas as pd
 from tools.logging_tools import setup_logger, log_event, log_error
-from tools.data_tools import load_dataset
+from tools.data_tools import load_session_dataset, iter_dataset_chunks
+from tools.stream_stats import StreamingProfiler
+from tools.eda_tools import LazySummary, sampled_description
 from core.session_service import SessionService
 
 
 class EDAAgent:
     """
     EDA Agent:
-    - Loads dataset
-    - Computes basic statistics
+    - Loads dataset (or streams it in chunks when it is too large for memory)
+    - Computes basic statistics lazily, on first read of each summary field
+    - Describes columns from a stratified sample unless full statistics are requested
     - Returns summary dictionary
     """
 
@@ -18,25 +23,49 @@ class EDAAgent:
         self.logger = setup_logger("EDAAgent")
         self.session_service = session_service
 
-    def run(self, session_id: str):
+    def run(self, session_id: str, mode: str = "auto", chunksize: int = 100_000,
+            full_stats: bool = False, sample_rows: int = 20_000):
+        """
+        mode: "full" loads the whole frame, "streaming" profiles the file chunk by
+        chunk with bounded memory (approximate quantiles and distinct counts),
+        "auto" streams only when the file exceeds the dataset cache budget.
+        In "full" mode the summary is a LazySummary: each field is computed when it
+        is first read. "description" comes from a stratified sample of `sample_rows`
+        rows with 95% confidence bounds; full_stats=True describes every row instead.
+        """
         try:
             session = self.session_service.get_session(session_id)
 
-            dataset_path = session["dataset_path"]
+            # Prefer the columnar artifact written by IntakeAgent
+            dataset_path = session.get("data_path") or session["dataset_path"]
             target = session["target"]
 
+            if mode == "auto":
+                too_large = os.path.getsize(dataset_path) > self.session_service.dataset_cache.max_bytes
+                mode = "streaming" if too_large else "full"
+
+            if mode == "streaming":
+                return self._run_streaming(session_id, dataset_path, target, chunksize)
+
             log_event(self.logger, "EDAAgent", "Performing EDA...")
 
-            df = load_dataset(dataset_path)
+            df = load_session_dataset(self.session_service, session_id)
 
-            summary = {
-                "shape": df.shape,
-                "dtypes": df.dtypes.astype(str).to_dict(),
-                "missing_values": df.isnull().sum().to_dict(),
-                "target_distribution": df[target].value_counts().to_dict()
-                if df[target].nunique() < 30 else "Too many unique values",
-                "description": df.describe(include="all").fillna("").to_dict()
-            }
+            if full_stats:
+                describe = lambda frame: frame.describe(include="all").fillna("").to_dict()
+            else:
+                describe = lambda frame: sampled_description(frame, target, sample_rows=sample_rows)
+
+            # Fields re-fetch the frame through the dataset cache when they are computed,
+            # so a pending summary does not pin it in memory outside the cache budget
+            summary = LazySummary({
+                "shape": lambda frame: frame.shape,
+                "dtypes": lambda frame: frame.dtypes.astype(str).to_dict(),
+                "missing_values": lambda frame: frame.isnull().sum().to_dict(),
+                "target_distribution": lambda frame: frame[target].value_counts().to_dict()
+                if frame[target].nunique() < 30 else "Too many unique values",
+                "description": describe,
+            }, loader=lambda: load_session_dataset(self.session_service, session_id))
              #  save in session memory so ReportAgent can use it later
             self.session_service.update_session(session_id, "eda_summary", summary)
 
@@ -48,3 +77,18 @@ class EDAAgent:
         except Exception as e:
             log_error(self.logger, "EDAAgent", str(e))
             return {"status": "error", "message": str(e)}
+
+    def _run_streaming(self, session_id: str, dataset_path: str, target: str, chunksize: int):
+        log_event(self.logger, "EDAAgent", f"Performing streaming EDA (chunksize={chunksize})...")
+
+        profiler = StreamingProfiler(target)
+        for chunk in iter_dataset_chunks(dataset_path, chunksize=chunksize):
+            profiler.update(chunk)
+
+        summary = profiler.summary()
+        self.session_service.update_session(session_id, "eda_summary", summary)
+
+        log_event(self.logger, "EDAAgent",
+                  f"Streaming EDA completed: rows={summary['shape'][0]}, cols={summary['shape'][1]}")
+
+        return {"status": "success", "summary": summary}
@@ -0,0 +1,52 @@
+# feature_agent.py
+
+from tools.logging_tools import setup_logger, log_event, log_error
+from tools.data_tools import load_session_dataset, prepare_features
+from core.session_service import SessionService
+
+
+class FeatureAgent:
+    """
+    Feature Agent:
+    - Loads dataset
+    - Encodes features once into a float32 (or sparse CSR) matrix
+    - Computes train/validation split indices once
+    - Caches the result in session memory for every ModelAgent experiment
+    """
+
+    def __init__(self, session_service: SessionService):
+        self.logger = setup_logger("FeatureAgent")
+        self.session_service = session_service
+
+    def run(self, session_id: str, force: bool = False):
+        try:
+            session = self.session_service.get_session(session_id)
+            if session is None:
+                raise ValueError(f"Session '{session_id}' not found")
+
+            target_col = session["target"]
+            # Keyed by the original path: data_path moves to the columnar artifact after the first load
+            source = (session["dataset_path"], target_col)
+
+            features = session.get("features")
+            if features is not None and features.get("source") == source and not force:
+                log_event(self.logger, "FeatureAgent", "Reusing cached feature matrix")
+                return {"status": "success", "cached": True, "n_features": len(features["feature_names"])}
+
+            log_event(self.logger, "FeatureAgent", "Encoding features...")
+
+            df = load_session_dataset(self.session_service, session_id)
+            features = prepare_features(df, target_col)
+            features["source"] = source
+
+            self.session_service.update_session(session_id, "features", features)
+
+            log_event(self.logger, "FeatureAgent",
+                      f"Features ready: train={features['X_train'].shape}, "
+                      f"val={features['X_val'].shape}")
+
+            return {"status": "success", "cached": False, "n_features": len(features["feature_names"])}
+
+        except Exception as e:
+            log_error(self.logger, "FeatureAgent", str(e))
+            return {"status": "error", "message": str(e)}
@@ -0,0 +1,136 @@
+# importance_agent.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from tools.logging_tools import setup_logger, log_event, log_error
+from tools.importance_tools import group_importance
+from tools.model_registry import MODEL_REGISTRY, model_family, final_estimator, dropped_columns, predict_model
+from tools.shm_tools import share_arrays, attach_arrays, release_shared
+from core.session_service import SessionService
+from core.model_store import ModelStore
+from agents.feature_agent import FeatureAgent
+from agents.model_agent import ModelAgent, score_predictions
+
+# Validation data and model loaded once per worker process
+_WORKER_STATE = {}
+
+
+def _single_threaded(model):
+    # Workers already share the cores: one thread per model
+    threads = MODEL_REGISTRY[model_family(model)]["threads"]
+    if threads:
+        final_estimator(model).set_params(**{threads: 1})
+    return model
+
+
+def _init_importance_worker(specs: dict, store_root: str, model_pointer: dict, task_type: str):
+    """Process-pool initializer: attach the validation rows and load the model once."""
+    threadpool_limits(1)
+    arrays, handles = attach_arrays(specs)
+    _WORKER_STATE.update(arrays)
+    _WORKER_STATE["_handles"] = handles
+    _WORKER_STATE["model"] = _single_threaded(ModelStore(store_root).load(model_pointer))
+    _WORKER_STATE["task_type"] = task_type
+
+
+def _group_importance_in_worker(columns: list, baseline: float, n_repeats: int, random_state: int) -> dict:
+    state = _WORKER_STATE
+    return group_importance(state["model"], partial(score_predictions, state["task_type"]), state["X"],
+                            state["y"], columns, baseline, n_repeats=n_repeats, random_state=random_state)
+
+
+class ImportanceAgent:
+    """
+    Importance Agent:
+    - Loads the session's best stored model (no retraining)
+    - Computes permutation importance on the validation split, per input column:
+      one-hot / hashed blocks of a column are shuffled together
+    - Predicts all shuffles of a column in one batched call; columns are spread
+      over a process pool when n_workers > 1
+    - Saves the ranking to session["feature_importance"]
+    """
+
+    def __init__(self, session_service: SessionService, artifact_dir: str = ".artifacts"):
+        self.logger = setup_logger("ImportanceAgent")
+        self.session_service = session_service
+        self.model_agent = ModelAgent(session_service, artifact_dir=artifact_dir)
+
+    def run(self, session_id: str, n_repeats: int = 5, n_workers: int = 1, max_rows: int = 20_000,
+            random_state: int = 42):
+        """
+        max_rows: validation rows used (a random subset of larger splits).
+        """
+        blocks = []
+        try:
+            session = self.session_service.get_session(session_id)
+            if session is None:
+                raise ValueError(f"Session '{session_id}' not found")
+
+            feature_result = FeatureAgent(self.session_service).run(session_id)
+            if feature_result["status"] != "success":
+                raise RuntimeError(f"Feature preparation failed: {feature_result['message']}")
+            features = self.session_service.get_session(session_id)["features"]
+            model, experiment = self.model_agent.load_best_model(session_id)
+            task_type = session["task_type"]
+
+            X, y = features["X_val"], np.asarray(features["y_val"])
+            if X.shape[0] > max_rows:
+                rows = np.sort(np.random.default_rng(random_state).choice(X.shape[0], max_rows, replace=False))
+                X, y = X[rows], y[rows]
+
+            # Columns the model drops cannot matter to it
+            dropped = set(dropped_columns(model))
+            groups = {col: [i for i in positions if i not in dropped]
+                      for col, positions in features["encoder"].column_groups().items()}
+            groups = {col: positions for col, positions in groups.items() if positions}
+
+            baseline = score_predictions(task_type, y, predict_model(model, X))
+            log_event(self.logger, "ImportanceAgent",
+                      f"Permuting {len(groups)} columns x {n_repeats} repeats on {X.shape[0]} rows "
+                      f"(baseline score={baseline:.4f}, {n_workers} workers)")
+
+            tasks = [(positions, baseline, n_repeats, random_state + i)
+                     for i, positions in enumerate(groups.values())]
+            if n_workers <= 1:
+                score = partial(score_predictions, task_type)
+                results = [group_importance(model, score, X, y, *task[:2], n_repeats=task[2], random_state=task[3])
+                           for task in tasks]
+            else:
+                specs, blocks = share_arrays({"X": X, "y": y})
+                with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks)),
+                                         initializer=_init_importance_worker,
+                                         initargs=(specs, self.model_agent.model_store.root,
+                                                   experiment["artifact"], task_type)) as pool:
+                    results = list(pool.map(_group_importance_in_worker, *zip(*tasks)))
+
+            ranking = sorted(
+                ({"feature": str(col), "importance": result["importance"], "std": result["std"],
+                  "positions": positions}
+                 for (col, positions), result in zip(groups.items(), results)),
+                key=lambda item: item["importance"], reverse=True
+            )
+            importance = {
+                "model_name": experiment["model_name"],
+                "model_params": experiment["params"],
+                "baseline_score": baseline,
+                "rows": int(X.shape[0]),
+                "n_repeats": n_repeats,
+                "features": ranking
+            }
+            self.session_service.update_session(session_id, "feature_importance", importance)
+
+            top = ", ".join(f"{item['feature']}={item['importance']:.4f}" for item in ranking[:3])
+            log_event(self.logger, "ImportanceAgent", f"Top features: {top}")
+            return {"status": "success", "feature_importance": importance}
+
+        except Exception as e:
+            log_error(self.logger, "ImportanceAgent", str(e))
+            return {"status": "error", "message": str(e)}
+
+        finally:
+            release_shared(blocks)
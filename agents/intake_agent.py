@@ -1,7 +1,11 @@
 # intake_agent.py
 
 from tools.logging_tools import setup_logger, log_event, log_error
-from tools.data_tools import load_dataset, detect_task_type
+import os
+
+from tools.data_tools import (
+    read_prefix, infer_dtypes, scan_file, detect_task_type, columnar_artifact_path
+)
 from core.session_service import SessionService
 
 
@@ -9,38 +13,56 @@ class IntakeAgent:
     """
     Intake Agent:
     - Receives dataset path & target column
-    - Loads dataset
-    - Detects task type
-    - Updates session memory
+    - Infers schema, dtypes and task type from a bounded prefix of the file
+    - Counts rows and hashes the file in one streaming pass (no full parse)
+    - Updates session memory; the first full load converts the CSV to a columnar artifact
     """
 
-    def __init__(self, session_service: SessionService):
+    def __init__(self, session_service: SessionService, artifact_dir: str = ".artifacts",
+                 prefix_rows: int = 10_000):
         self.logger = setup_logger("IntakeAgent")
         self.session_service = session_service
+        self.artifact_dir = artifact_dir
+        self.prefix_rows = prefix_rows
 
     def run(self, session_id: str, dataset_path: str, target_col: str):
         try:
             log_event(self.logger, "IntakeAgent", f"Starting intake for dataset: {dataset_path}")
 
-            # Load dataset using custom tool
-            df = load_dataset(dataset_path)
+            prefix = read_prefix(dataset_path, n_rows=self.prefix_rows)
+            if target_col not in prefix.columns:
+                raise ValueError(f"Target column '{target_col}' not found in dataset")
+            dtypes = infer_dtypes(prefix)
 
             # Detect task type (classification / regression)
-            task_type = detect_task_type(df, target_col)
+            task_type = detect_task_type(prefix, target_col)
+
+            scan = scan_file(dataset_path)
+
+            artifact_path = columnar_artifact_path(dataset_path, self.artifact_dir)
+            # Already converted by an earlier run: later stages memory-map it, no CSV parse
+            data_path = artifact_path if os.path.exists(artifact_path) else dataset_path
+
+            log_event(self.logger, "IntakeAgent", f"Data layer: {data_path}")
 
             # Store in session memory
             self.session_service.update_session(session_id, "dataset_path", dataset_path)
+            self.session_service.update_session(session_id, "data_path", data_path)
+            self.session_service.update_session(session_id, "artifact_path", artifact_path)
+            self.session_service.update_session(session_id, "dtypes", dtypes)
+            # Content hash identifies the dataset for experiment memoization
+            self.session_service.update_session(session_id, "dataset_hash", scan["hash"])
             self.session_service.update_session(session_id, "target", target_col)
             self.session_service.update_session(session_id, "task_type", task_type)
 
             log_event(self.logger, "IntakeAgent",
-                      f"Session Updated: target={target_col}, task_type={task_type}")
+                      f"Session Updated: target={target_col}, task_type={task_type}, rows={scan['rows']}")
 
             return {
                 "status": "success",
                 "task_type": task_type,
-                "rows": len(df),
-                "columns": list(df.columns)
+                "rows": scan["rows"],
+                "columns": list(prefix.columns)
             }
 
         except Exception as e:
@@ -1,82 +1,282 @@
 # model_agent.py
 
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from tools.logging_tools import setup_logger, log_event, log_error
-from tools.data_tools import load_dataset, basic_train_val_split
+from tools.shm_tools import share_arrays, attach_arrays, release_shared
+from tools.data_tools import stratified_order
+from tools.cv_tools import normalize_cv, fold_assignments, fold_rows, score_summary, clearly_worse, project_score
+from tools.profiling_tools import track_stage
 from core.session_service import SessionService
+from core.model_store import ModelStore
+from agents.feature_agent import FeatureAgent
 
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.metrics import accuracy_score, r2_score
+from threadpoolctl import threadpool_limits
+
+from tools.model_registry import (
+    MODEL_REGISTRY, DEFAULT_FAMILY, build_model, fit_model, predict_model, model_params as params_of,
+    final_estimator, fitted_size, default_threads
+)
+
+# Params that do not change the fitted trees, ignored when matching a warm start
+_WARM_START_IGNORED = {"n_estimators", "warm_start", "n_jobs", "verbose"}
+
+# Training data attached from shared memory, one copy per worker process
+_WORKER_DATA = {}
+
+
+def score_predictions(task_type: str, y_true, y_pred) -> float:
+    """Validation metric: accuracy for classification, R^2 for regression."""
+    if task_type == "classification":
+        return float(accuracy_score(y_true, y_pred))
+    return float(r2_score(y_true, y_pred))
+
+
+def fit_and_score(model, task_type: str, X_train, y_train, X_val, y_val, n_threads: int | None = None) -> float:
+    """
+    Fit the model and return its validation score (accuracy or R^2).
+    Families with early stopping (hist_gbm) stop on a holdout of the training rows,
+    so the validation rows only score the model.
+    """
+    fit_model(model, X_train, y_train, n_threads=n_threads)
+    return score_predictions(task_type, y_val, predict_model(model, X_val, n_threads=n_threads))
+
+
+def can_warm_start(previous, model) -> bool:
+    """
+    True when `model` only asks for more trees than the already fitted `previous`
+    forest, so the existing trees can be kept and only the new ones grown.
+    """
+    if previous is None or type(previous) is not type(model):
+        return False
+    if not hasattr(previous, "estimators_"):
+        return False
+    old_params, new_params = previous.get_params(), model.get_params()
+    if new_params["n_estimators"] <= len(previous.estimators_):
+        return False
+    return all(old_params[key] == new_params[key]
+               for key in new_params if key not in _WARM_START_IGNORED)
+
+
+def experiment_fingerprint(session: dict, features: dict, model, cv: dict | None = None) -> str:
+    """
+    Fingerprint of everything that determines an experiment's score:
+    dataset content hash, target, split settings, model class and params
+    (and the cross-validation scheme for CV experiments).
+    """
+    fields = [
+        session.get("dataset_hash"),
+        session.get("target"),
+        features["test_size"],
+        features["random_state"],
+        model.__class__.__name__,
+        sorted((key, repr(value)) for key, value in model.get_params().items()
+               if key.rsplit("__", 1)[-1] not in ("warm_start", "n_jobs", "verbose")),
+    ]
+    if cv is not None:
+        fields.append(["cv", cv["n_splits"], cv["n_repeats"]])
+    payload = json.dumps(fields)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _init_worker(specs: dict):
+    """
+    Process-pool initializer: attach the shared training data once per worker
+    and keep OpenMP/BLAS to one thread, since the workers already share the cores.
+    """
+    threadpool_limits(1)
+    arrays, handles = attach_arrays(specs)
+    _WORKER_DATA.update(arrays)
+    _WORKER_DATA["_handles"] = handles
+
+
+def _run_experiment_in_worker(task_type: str, model_params: dict, store_root: str) -> dict:
+    """
+    Train one experiment inside a worker process and return its record.
+    The fitted model is saved to the artifact store here, so only its pointer
+    travels back to the parent.
+    """
+    data = _WORKER_DATA
+    model = build_model(task_type, model_params, n_threads=1)
+    score = fit_and_score(model, task_type, data["X_train"], data["y_train"],
+                          data["X_val"], data["y_val"], n_threads=1)
+    artifact = ModelStore(store_root).save(model)
+    return {
+        "model_name": final_estimator(model).__class__.__name__,
+        "task_type": task_type,
+        "params": params_of(model),
+        "score": score,
+        "warm_started": False,
+        "trees_fitted": fitted_size(model),
+        "artifact": artifact
+    }
+
+
+def _run_fold_in_worker(task_type: str, model_params: dict, repeat: int, fold: int) -> float:
+    """Train and score one cross-validation fold inside a worker process."""
+    data = _WORKER_DATA
+    train_rows, val_rows = fold_rows(data["cv_assignments"], repeat, fold)
+    model = build_model(task_type, model_params, n_threads=1)
+    return fit_and_score(model, task_type, data["X_train"][train_rows], data["y_train"][train_rows],
+                         data["X_train"][val_rows], data["y_train"][val_rows], n_threads=1)
 
 
 class ModelAgent:
     """
     Model Agent:
-    - Loads dataset
-    - Splits into train/validation
-    - Trains a baseline model (RandomForest)
+    - Reuses the session's cached feature matrix and split (built by FeatureAgent)
+    - Trains a baseline model (RandomForest) or any family of tools.model_registry
+      selected by model_params["model"] (hist_gbm, linear)
     - Computes score
     - Logs experiment into session memory
     - Updates best_score
     - Simulates a 'long-running' training step using status flags
+    - Can train several experiments concurrently in a process pool
+    - Keeps the last fitted forest and extends it with warm_start when an
+      experiment only increases n_estimators
+    - Optionally scores experiments by (repeated) k-fold cross-validation on the
+      training split, with folds shared across experiments and trained in parallel
+    - Saves every fitted model to a content-addressed artifact store (pointer in the
+      experiment record) and reloads the best one for prediction
     """
 
-    def __init__(self, session_service: SessionService):
+    def __init__(self, session_service: SessionService, artifact_dir: str = ".artifacts"):
         self.logger = setup_logger("ModelAgent")
         self.session_service = session_service
+        self.model_store = ModelStore(os.path.join(artifact_dir, "models"))
+
+    def _get_features(self, session_id: str) -> dict:
+        # Encoded matrix + split are built once per session and reused
+        features = self.session_service.get_session(session_id).get("features")
+        if features is not None:
+            return features
+        with track_stage(self.session_service, session_id, "model.encode"):
+            feature_result = FeatureAgent(self.session_service).run(session_id)
+        if feature_result["status"] != "success":
+            raise RuntimeError(f"Feature preparation failed: {feature_result['message']}")
+        return self.session_service.get_session(session_id)["features"]
 
-    def run(self, session_id: str, model_params: dict | None = None):
+    def _encoder_artifact(self, features: dict) -> dict:
+        # The fitted feature encoder is stored once per feature set, so a saved
+        # model can be applied to new data with the exact training encoding
+        if "encoder_artifact" not in features:
+            features["encoder_artifact"] = self.model_store.save(features["encoder"])
+        return features["encoder_artifact"]
+
+    def _reuse_memoized(self, session_id: str, task_type: str, memoized: dict) -> dict:
+        experiment = {**memoized, "memoized": True}
+        self.session_service.add_experiment(session_id, experiment)
+        log_event(self.logger, "ModelAgent",
+                  f"Memoized result reused with score={experiment['score']:.4f}")
+        best_score = self.session_service.get_session(session_id)["best_score"]
+        return {
+            "status": "success",
+            "task_type": task_type,
+            "model_name": experiment["model_name"],
+            "score": float(experiment["score"]),
+            "score_std": experiment.get("score_std"),
+            "pruned": experiment.get("pruned", False),
+            "best_score": float(best_score) if best_score is not None else None,
+            "training_status": "COMPLETED"
+        }
+
+    def run(self, session_id: str, model_params: dict | None = None, cv=None, n_workers: int = 1,
+            progressive: bool = False, fractions: tuple = (0.1, 0.25), margin: float = 0.0):
         """
         Train a baseline model for the current session.
 
-        model_params: optional dict to override default RandomForest params.
+        model_params: optional dict to override default RandomForest params;
+        {"model": "hist_gbm", ...} or {"model": "linear", ...} selects another family.
+        cv: optional fold count or {"n_splits", "n_repeats"}; scores the params by
+        cross-validation instead of the single validation split (see cross_validate).
+        n_workers: processes used to train the folds in parallel (CV only).
+        progressive: once the session has a best_score, first train on nested
+        stratified subsamples of the training split (`fractions`) and project the
+        full-data score from that learning curve (tools.cv_tools.project_score);
+        the full fit only runs if the projection + margin reaches best_score,
+        otherwise the experiment is logged as pruned.
         """
         if model_params is None:
             model_params = {}
+        if cv is not None:
+            return self.cross_validate(session_id, model_params, cv=cv, n_workers=n_workers)
 
         try:
             session = self.session_service.get_session(session_id)
             if session is None:
                 raise ValueError(f"Session '{session_id}' not found")
 
-            dataset_path = session["dataset_path"]
-            target_col = session["target"]
             task_type = session["task_type"]
 
             log_event(self.logger, "ModelAgent",
                       f"Starting model training for task_type={task_type}")
 
-            # Load data
-            df = load_dataset(dataset_path)
+            features = self._get_features(session_id)
+            X_train, X_val = features["X_train"], features["X_val"]
+            y_train, y_val = features["y_train"], features["y_val"]
 
-            # Basic split
-            X_train, X_val, y_train, y_val = basic_train_val_split(df, target_col)
+            n_threads = default_threads()
+            model = build_model(task_type, model_params, n_threads=n_threads)
+            fingerprint = experiment_fingerprint(session, features, model)
 
-            # Merge defaults with user params safely
-            default_params = {"n_estimators": 100, "random_state": 42}
+            # Same dataset/target/split/model/params already scored: reuse the result
+            memoized = self.session_service.lookup_result(fingerprint)
+            if memoized is not None:
+                return self._reuse_memoized(session_id, task_type, memoized)
 
-            # User parameters override defaults
-            combined_params = {**default_params, **model_params}
-
-            if task_type == "classification":
-                model = RandomForestClassifier(**combined_params)
-            else:
-                model = RandomForestRegressor(**combined_params)
+            # Reuse the previous forest when only the tree count grows
+            last_model = session.get("last_model") or {}
+            previous = last_model.get("estimator") if last_model.get("source") == features["source"] else None
+            warm_started = can_warm_start(previous, model)
+            trees_added = None
+            if warm_started:
+                trees_added = model.n_estimators - len(previous.estimators_)
+                previous.set_params(warm_start=True, n_estimators=model.n_estimators)
+                model = previous
+                log_event(self.logger, "ModelAgent",
+                          f"Warm start: growing {trees_added} new trees on the previous forest")
 
+            # Subsamples first: skip the full fit when it cannot catch up with the best
+            learning_curve = {}
+            best_score = session.get("best_score")
+            if progressive and not warm_started and best_score is not None:
+                with track_stage(self.session_service, session_id, "model.learning_curve"):
+                    learning_curve = self.learning_curve(session_id, model_params, fractions)
+                log_event(self.logger, "ModelAgent",
+                          f"Learning curve {learning_curve['subsample_scores']} on "
+                          f"{learning_curve['subsample_rows']} rows projects "
+                          f"{learning_curve['projected_score']:.4f} (best={best_score:.4f})")
+                if learning_curve["projected_score"] + margin < best_score:
+                    return self._prune_on_learning_curve(session_id, session, model, learning_curve)
 
             # --- Long-running operation simulation: mark as RUNNING ---
             self.session_service.update_session(session_id, "training_status", "RUNNING")
             log_event(self.logger, "ModelAgent", "Training status: RUNNING")
 
-            # Fit model (this could be long-running for big datasets)
-            model.fit(X_train, y_train)
+            # Fit model (this could be long-running for big datasets) and score it
+            with track_stage(self.session_service, session_id, "model.fit", rows=X_train.shape[0]):
+                fit_model(model, X_train, y_train, n_threads=n_threads)
+            if not warm_started:
+                trees_added = fitted_size(model)
 
-            # Predictions & score
-            y_pred = model.predict(X_val)
+            with track_stage(self.session_service, session_id, "model.predict", rows=X_val.shape[0]):
+                y_pred = predict_model(model, X_val, n_threads=n_threads)
+            score = score_predictions(task_type, y_val, y_pred)
+            if warm_started:
+                model.set_params(warm_start=False)
 
-            if task_type == "classification":
-                score = accuracy_score(y_val, y_pred)
-            else:
-                score = r2_score(y_val, y_pred)
+            # Perf records are persisted when their stage ends, so the size is filled in inside it
+            with track_stage(self.session_service, session_id, "model.save") as save_record:
+                artifact = self.model_store.save(model)
+                save_record["model_bytes"] = artifact["bytes"]
+                encoder_artifact = self._encoder_artifact(features)
+            self.session_service.update_session(
+                session_id, "last_model", {"estimator": model, "source": features["source"]}
+            )
 
             # --- Training done ---
             self.session_service.update_session(session_id, "training_status", "COMPLETED")
@@ -85,10 +285,17 @@ class ModelAgent:
 
             # Log experiment in session memory
             experiment = {
-                "model_name": model.__class__.__name__,
+                "model_name": final_estimator(model).__class__.__name__,
                 "task_type": task_type,
-                "params": model.get_params(),
-                "score": float(score)
+                "params": params_of(model),
+                "score": float(score),
+                "warm_started": warm_started,
+                "trees_fitted": trees_added,
+                "fingerprint": fingerprint,
+                "dataset_hash": session.get("dataset_hash"),
+                "artifact": artifact,
+                "encoder_artifact": encoder_artifact,
+                **learning_curve
             }
             self.session_service.add_experiment(session_id, experiment)
 
@@ -97,7 +304,7 @@ class ModelAgent:
             return {
                 "status": "success",
                 "task_type": task_type,
-                "model_name": model.__class__.__name__,
+                "model_name": final_estimator(model).__class__.__name__,
                 "score": float(score),
                 "best_score": float(best_score) if best_score is not None else None,
                 "training_status": "COMPLETED"
@@ -107,3 +314,319 @@ class ModelAgent:
             log_error(self.logger, "ModelAgent", str(e))
             self.session_service.update_session(session_id, "training_status", "ERROR")
             return {"status": "error", "message": str(e)}
+
+    def learning_curve(self, session_id: str, model_params: dict, fractions: tuple = (0.1, 0.25)) -> dict:
+        """
+        Scores of the params trained on growing nested subsamples of the training
+        split (full-size model, only the rows shrink) and the projected score with
+        every training row: {"subsample_rows", "subsample_scores", "projected_score"}.
+        """
+        n_train = self._get_features(session_id)["X_train"].shape[0]
+        rows = [max(2, int(round(n_train * fraction))) for fraction in sorted(fractions)]
+        scores = [self.evaluate(session_id, model_params, fraction, scale_size=False)
+                  for fraction in sorted(fractions)]
+        return {"subsample_rows": rows, "subsample_scores": scores,
+                "projected_score": project_score(rows, scores, n_train)}
+
+    def _prune_on_learning_curve(self, session_id: str, session: dict, model, learning_curve: dict) -> dict:
+        # Logged like a pruned CV experiment (no stored model, skipped by the planner),
+        # scored by its largest subsample; no fingerprint, so a later full run is not memoized away
+        experiment = {
+            "model_name": final_estimator(model).__class__.__name__,
+            "task_type": session["task_type"],
+            "params": params_of(model),
+            "score": max(learning_curve["subsample_scores"]),
+            "pruned": True,
+            "dataset_hash": session.get("dataset_hash"),
+            **learning_curve
+        }
+        self.session_service.add_experiment(session_id, experiment)
+        log_event(self.logger, "ModelAgent",
+                  f"Full fit skipped: projected score {learning_curve['projected_score']:.4f} "
+                  f"cannot reach best_score={session['best_score']:.4f}")
+        return {
+            "status": "success",
+            "task_type": session["task_type"],
+            "model_name": experiment["model_name"],
+            "score": experiment["score"],
+            "projected_score": learning_curve["projected_score"],
+            "pruned": True,
+            "best_score": session["best_score"],
+            "training_status": "PRUNED"
+        }
+
+    def _get_folds(self, features: dict, task_type: str, cv: dict):
+        # Fold ids over the training split, computed once per session and CV scheme
+        folds = features.setdefault("cv_folds", {})
+        key = (cv["n_splits"], cv["n_repeats"])
+        if key not in folds:
+            folds[key] = fold_assignments(features["y_train"], task_type, cv["n_splits"],
+                                          cv["n_repeats"], features["random_state"])
+        return folds[key]
+
+    def _best_cv_score(self, session: dict, cv: dict):
+        best = session["experiments"].best_by("cv", cv)
+        return best["score"] if best is not None else None
+
+    def cross_validate(self, session_id: str, model_params: dict | None = None, cv=5,
+                       n_workers: int = 1, prune: bool = True, min_folds: int = 2, prune_z: float = 2.0):
+        """
+        Score params by (repeated) k-fold cross-validation on the training split.
+
+        The experiment's score is the mean fold score, with score_std and the fold
+        scores in the record. With prune=True, folds stop as soon as the upper
+        bound (mean + prune_z standard errors, after min_folds folds) falls below
+        the session's best CV score; the experiment is then logged as pruned.
+        Folds run in a process pool over shared memory when n_workers > 1.
+        """
+        if model_params is None:
+            model_params = {}
+
+        blocks = []
+        try:
+            cv = normalize_cv(cv)
+            session = self.session_service.get_session(session_id)
+            if session is None:
+                raise ValueError(f"Session '{session_id}' not found")
+
+            task_type = session["task_type"]
+            features = self._get_features(session_id)
+            n_threads = default_threads(n_workers)
+            model = build_model(task_type, model_params, n_threads=n_threads)
+            fingerprint = experiment_fingerprint(session, features, model, cv=cv)
+
+            memoized = self.session_service.lookup_result(fingerprint)
+            if memoized is not None:
+                return self._reuse_memoized(session_id, task_type, memoized)
+
+            assignments = self._get_folds(features, task_type, cv)
+            best_mean = self._best_cv_score(session, cv) if prune else None
+            tasks = [(repeat, fold) for repeat in range(cv["n_repeats"]) for fold in range(cv["n_splits"])]
+            X, y = features["X_train"], features["y_train"]
+
+            log_event(self.logger, "ModelAgent",
+                      f"Cross-validating {cv['n_splits']} folds x {cv['n_repeats']} repeats "
+                      f"on {max(1, min(n_workers, len(tasks)))} workers")
+            self.session_service.update_session(session_id, "training_status", "RUNNING")
+
+            scores = []
+            pruned = False
+            with track_stage(self.session_service, session_id, "model.cv", rows=X.shape[0]):
+                if n_workers <= 1:
+                    for repeat, fold in tasks:
+                        train_rows, val_rows = fold_rows(assignments, repeat, fold)
+                        scores.append(fit_and_score(build_model(task_type, model_params, n_threads), task_type,
+                                                    X[train_rows], y[train_rows], X[val_rows], y[val_rows],
+                                                    n_threads=n_threads))
+                        if clearly_worse(scores, best_mean, min_folds, prune_z):
+                            pruned = True
+                            break
+                else:
+                    specs, blocks = share_arrays({"X_train": X, "y_train": y, "cv_assignments": assignments})
+                    with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks)), initializer=_init_worker,
+                                             initargs=(specs,)) as pool:
+                        futures = [pool.submit(_run_fold_in_worker, task_type, model_params, repeat, fold)
+                                   for repeat, fold in tasks]
+                        for future in as_completed(futures):
+                            scores.append(future.result())
+                            if clearly_worse(scores, best_mean, min_folds, prune_z):
+                                pruned = True
+                                # Folds that have not started are dropped; running ones finish
+                                for pending in futures:
+                                    pending.cancel()
+                                break
+
+            mean, std = score_summary(scores)
+            self.session_service.update_session(session_id, "training_status", "COMPLETED")
+            log_event(self.logger, "ModelAgent",
+                      f"CV score={mean:.4f}±{std:.4f} over {len(scores)} folds"
+                      + (f" (pruned: below best {best_mean:.4f})" if pruned else ""))
+
+            experiment = {
+                "model_name": final_estimator(model).__class__.__name__,
+                "task_type": task_type,
+                "params": params_of(model),
+                "score": mean,
+                "score_std": std,
+                "fold_scores": scores,
+                "cv": cv,
+                "pruned": pruned,
+                "warm_started": False,
+                "folds_fitted": len(scores),
+                "fingerprint": fingerprint,
+                "dataset_hash": session.get("dataset_hash")
+            }
+            self.session_service.add_experiment(session_id, experiment)
+            best_score = self.session_service.get_session(session_id)["best_score"]
+
+            return {
+                "status": "success",
+                "task_type": task_type,
+                "model_name": experiment["model_name"],
+                "score": mean,
+                "score_std": std,
+                "pruned": pruned,
+                "best_score": float(best_score) if best_score is not None else None,
+                "training_status": "COMPLETED"
+            }
+
+        except Exception as e:
+            log_error(self.logger, "ModelAgent", str(e))
+            self.session_service.update_session(session_id, "training_status", "ERROR")
+            return {"status": "error", "message": str(e)}
+
+        finally:
+            release_shared(blocks)
+
+    def evaluate(self, session_id: str, model_params: dict, fraction: float = 1.0,
+                 scale_size: bool = True) -> float:
+        """
+        Score a configuration trained on a stratified subsample of the training
+        split (the first `fraction` of a fixed stratified ordering, so growing
+        fractions are nested) with the family's size param (n_estimators, max_iter)
+        scaled by the same fraction unless scale_size=False.
+        Nothing is logged to the experiment list.
+        Used by PlannerAgent's budgeted search and by progressive training.
+        """
+        session = self.session_service.get_session(session_id)
+        task_type = session["task_type"]
+        features = self._get_features(session_id)
+
+        order = features.get("subsample_order")
+        if order is None:
+            order = stratified_order(features["y_train"], features["random_state"])
+            features["subsample_order"] = order
+
+        fraction = min(fraction, 1.0)
+        n_rows = max(2, int(round(len(order) * fraction)))
+        rows = order[:n_rows] if n_rows < len(order) else slice(None)
+
+        # Low-budget rungs also grow fewer trees: per-tree overhead dominates on small samples
+        params = dict(model_params)
+        spec = MODEL_REGISTRY[params.get("model", DEFAULT_FAMILY)]
+        size_param = spec["size_param"]
+        if size_param and scale_size:
+            size = params.get(size_param, spec["defaults"][size_param])
+            params[size_param] = max(10, int(round(size * fraction)))
+
+        n_threads = default_threads()
+        model = build_model(task_type, params, n_threads=n_threads)
+        return fit_and_score(model, task_type, features["X_train"][rows], features["y_train"][rows],
+                             features["X_val"], features["y_val"], n_threads=n_threads)
+
+    def experiment_done(self, session_id: str, model_params: dict | None = None, cv=None) -> bool:
+        """True when the session already holds an experiment for these params (and CV scheme)."""
+        session = self.session_service.get_session(session_id)
+        if session is None or not session.get("experiments"):
+            return False
+        model = build_model(session["task_type"], model_params or {})
+        fingerprint = experiment_fingerprint(session, self._get_features(session_id), model,
+                                             cv=normalize_cv(cv))
+        return session["experiments"].by_fingerprint(fingerprint) is not None
+
+    def load_best_model(self, session_id: str):
+        """
+        Return (model, experiment) for the best-scoring experiment of the session
+        that has a stored model, loaded from the artifact store without retraining.
+        CV experiments keep no single fitted model and are skipped.
+        The experiment's `encoder_artifact` points to the matching feature encoder.
+        """
+        session = self.session_service.get_session(session_id)
+        if session is None:
+            raise ValueError(f"Session '{session_id}' not found")
+        best = session["experiments"].best_by("stored_model")
+        if best is None:
+            raise ValueError(f"Session '{session_id}' has no stored models")
+        return self.model_store.load(best["artifact"]), best
+
+    def run_many(self, session_id: str, params_list: list, n_workers: int = 1, cv=None,
+                 progressive: bool = False):
+        """
+        Train several experiments, concurrently when n_workers > 1.
+        With cv, experiments run one after another (so each can be pruned against
+        the best so far) and the workers train the folds of each experiment.
+        With progressive, experiments also run one after another, each screened
+        on subsamples against the best so far (see run).
+
+        The prepared train/validation blocks are placed in shared memory once and
+        attached by each worker, so tasks only carry their model params. Results
+        are merged into the session from this process as they complete.
+        Experiments that are memoized or can warm-start from the last fitted
+        forest run in this process first, since they are cheap.
+        Returns one result dict per experiment (in completion order).
+        """
+        if cv is not None:
+            return [self.cross_validate(session_id, params, cv=cv, n_workers=n_workers) for params in params_list]
+        if progressive or n_workers <= 1 or len(params_list) <= 1:
+            return [self.run(session_id, model_params=params, progressive=progressive) for params in params_list]
+
+        blocks = []
+        try:
+            session = self.session_service.get_session(session_id)
+            if session is None:
+                raise ValueError(f"Session '{session_id}' not found")
+
+            task_type = session["task_type"]
+            features = self._get_features(session_id)
+
+            # Memoized and warm-startable experiments are cheap: run them here
+            last_model = session.get("last_model") or {}
+            previous = last_model.get("estimator") if last_model.get("source") == features["source"] else None
+            cheap, remote = [], []
+            for params in params_list:
+                model = build_model(task_type, params)
+                fingerprint = experiment_fingerprint(session, features, model)
+                if can_warm_start(previous, model) or self.session_service.lookup_result(fingerprint):
+                    cheap.append(params)
+                else:
+                    remote.append((params, fingerprint))
+            results = [self.run(session_id, model_params=params) for params in cheap]
+            if not remote:
+                return results
+            specs, blocks = share_arrays({
+                key: features[key] for key in ("X_train", "X_val", "y_train", "y_val")
+            })
+
+            n_workers = min(n_workers, len(remote))
+            log_event(self.logger, "ModelAgent",
+                      f"Training {len(remote)} experiments on {n_workers} workers")
+            self.session_service.update_session(session_id, "training_status", "RUNNING")
+
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(specs,)) as pool:
+                futures = {pool.submit(_run_experiment_in_worker, task_type, params,
+                                       self.model_store.root): fingerprint
+                           for params, fingerprint in remote}
+                for future in as_completed(futures):
+                    try:
+                        experiment = future.result()
+                    except Exception as e:
+                        log_error(self.logger, "ModelAgent", str(e))
+                        results.append({"status": "error", "message": str(e)})
+                        continue
+
+                    experiment["fingerprint"] = futures[future]
+                    experiment["dataset_hash"] = session.get("dataset_hash")
+                    experiment["encoder_artifact"] = self._encoder_artifact(features)
+
+                    self.session_service.add_experiment(session_id, experiment)
+                    log_event(self.logger, "ModelAgent",
+                              f"Training completed with score={experiment['score']:.4f}")
+                    results.append({
+                        "status": "success",
+                        "task_type": task_type,
+                        "model_name": experiment["model_name"],
+                        "score": experiment["score"],
+                        "training_status": "COMPLETED"
+                    })
+
+            self.session_service.update_session(session_id, "training_status", "COMPLETED")
+            return results
+
+        except Exception as e:
+            log_error(self.logger, "ModelAgent", str(e))
+            self.session_service.update_session(session_id, "training_status", "ERROR")
+            return [{"status": "error", "message": str(e)}]
+
+        finally:
+            release_shared(blocks)
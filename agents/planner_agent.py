@@ -1,21 +1,86 @@
 # planner_agent.py
 
 from tools.logging_tools import setup_logger, log_event, log_error
+from tools.search_tools import (
+    SearchBudget, config_key, sample_configurations, successive_halving, hyperband
+)
 from core.session_service import SessionService
 
 
+# One suggestion per model family (see tools.model_registry) for switching families
+FAMILY_SUGGESTIONS = {
+    "hist_gbm": {
+        "description": "Switch to histogram gradient boosting (early stopping on the validation split)",
+        "model_params": {"model": "hist_gbm"},
+        "cost": "full"
+    },
+    "random_forest": {
+        "description": "Switch to a RandomForest with default params",
+        "model_params": {"model": "random_forest"},
+        "cost": "full"
+    },
+    "linear": {
+        "description": "Try a scaled linear baseline (logistic / ridge regression)",
+        "model_params": {"model": "linear"},
+        "cost": "full"
+    },
+}
+
+
+def _matches(model_params: dict, experiment_params: dict) -> bool:
+    """True when an experiment already ran with every param of `model_params`."""
+    return bool(model_params) and all(experiment_params.get(key) == value for key, value in model_params.items())
+
+
+def drop_columns_suggestion(importance: dict | None, experiments, max_importance: float = 0.0) -> dict | None:
+    """
+    Suggest refitting the importance model without the input columns whose
+    permutation importance is at most `max_importance` (shuffling them did not
+    hurt the validation score), or None if there are none or it was tried.
+    """
+    if not importance:
+        return None
+    useless = [item for item in importance["features"] if item["importance"] <= max_importance]
+    if not useless or len(useless) == len(importance["features"]):
+        return None
+    params = dict(importance["model_params"])
+    params["drop_columns"] = sorted(set(params.get("drop_columns", []))
+                                    | {i for item in useless for i in item["positions"]})
+    if experiments.find(params):
+        return None
+    return {
+        "description": f"Drop {len(useless)} columns without permutation importance "
+                       f"({', '.join(item['feature'] for item in useless)}) for faster fits",
+        "model_params": params,
+        "cost": "full"
+    }
+
+
 class PlannerAgent:
     """
     Planner Agent:
     - Reads past experiments & best_score from session
-    - Suggests next model parameter experiments
+    - Suggests next model parameter experiments, including model-family changes
+      (hist_gbm, linear) not tried yet, skipping configurations that
+      cross-validation pruned as clearly worse than the best
+    - Suggests dropping input columns without permutation importance
+      (see ImportanceAgent) for cheaper fits
+    - Optionally runs a budgeted search (successive halving / Hyperband)
+      over many sampled configurations on growing subsamples
     """
 
     def __init__(self, session_service: SessionService):
         self.logger = setup_logger("PlannerAgent")
         self.session_service = session_service
 
-    def run(self, session_id: str, n_suggestions: int = 3):
+    def run(self, session_id: str, n_suggestions: int | None = 3):
+        """
+        Suggestions are ranked cheapest first: growing the last forest (warm start),
+        refitting without useless columns, switching to hist_gbm, the in-family
+        tweaks (max_depth, max_features), then the remaining family switches.
+        n_suggestions: keep only the top ones (default 3, None keeps all); the ones left out
+        are logged.
+        """
         try:
             session = self.session_service.get_session(session_id)
             if session is None:
@@ -37,37 +102,94 @@ class PlannerAgent:
                     "model_params": {}
                 })
             else:
-                # Simple heuristic based on last experiment
-                last_exp = experiments[-1]
+                # Simple heuristic based on last experiment; pruned CV experiments
+                # were clearly worse than the best, so do not build on them
+                last_exp = experiments.last(where=lambda exp: not exp.get("pruned")) or experiments[-1]
                 last_params = last_exp.get("params", {})
-                last_n_estimators = last_params.get("n_estimators", 100)
+                family = last_params.get("model", "random_forest")
+                tried = experiments.families()
 
-                # Suggest increasing trees
-                suggestions.append({
-                    "description": f"Increase n_estimators from {last_n_estimators} to {last_n_estimators * 2}",
-                    "model_params": {
-                        "n_estimators": last_n_estimators * 2
-                    }
-                })
+                if family == "random_forest":
+                    last_n_estimators = last_params.get("n_estimators", 100)
 
-                # Suggest limiting depth
-                suggestions.append({
-                    "description": "Try limiting max_depth to 5",
-                    "model_params": {
-                        "max_depth": 5
-                    }
-                })
+                    # Suggest increasing trees. Keeping the other params of the last
+                    # experiment lets ModelAgent warm-start its forest and only grow
+                    # the new trees, so this is the cheapest suggestion.
+                    grow_params = {**last_params, "n_estimators": last_n_estimators * 2}
+                    suggestions.append({
+                        "description": f"Increase n_estimators from {last_n_estimators} to {last_n_estimators * 2} "
+                                       f"(warm start: {last_n_estimators} new trees)",
+                        "model_params": grow_params,
+                        "cost": "incremental"
+                    })
 
-                # Suggest using fewer features via max_features
-                suggestions.append({
-                    "description": "Try max_features='sqrt'",
-                    "model_params": {
-                        "max_features": "sqrt"
-                    }
-                })
+                    # Histogram gradient boosting trains much faster than deep forests on large tables
+                    if "hist_gbm" not in tried:
+                        suggestions.append(FAMILY_SUGGESTIONS["hist_gbm"])
+
+                    # Suggest limiting depth
+                    suggestions.append({
+                        "description": "Try limiting max_depth to 5",
+                        "model_params": {
+                            "max_depth": 5
+                        },
+                        "cost": "full"
+                    })
+
+                    # Suggest using fewer features via max_features
+                    suggestions.append({
+                        "description": "Try max_features='sqrt'",
+                        "model_params": {
+                            "max_features": "sqrt"
+                        },
+                        "cost": "full"
+                    })
+
+                elif family == "hist_gbm":
+                    learning_rate = last_params.get("learning_rate", 0.1)
+                    max_iter = last_params.get("max_iter", 300)
+                    max_leaf_nodes = last_params.get("max_leaf_nodes", 31)
+
+                    # Early stopping picks the iteration count, so a lower rate only costs time
+                    suggestions.append({
+                        "description": f"Halve learning_rate to {learning_rate / 2:g} with up to {max_iter * 2} iterations",
+                        "model_params": {"model": "hist_gbm", "learning_rate": learning_rate / 2,
+                                         "max_iter": max_iter * 2},
+                        "cost": "full"
+                    })
+                    suggestions.append({
+                        "description": f"Grow larger trees (max_leaf_nodes={max_leaf_nodes * 2})",
+                        "model_params": {"model": "hist_gbm", "max_leaf_nodes": max_leaf_nodes * 2},
+                        "cost": "full"
+                    })
+                    suggestions.append({
+                        "description": "Add L2 regularization (l2_regularization=1.0)",
+                        "model_params": {"model": "hist_gbm", "l2_regularization": 1.0},
+                        "cost": "full"
+                    })
+
+                # Model-family changes not tried yet in this session
+                for option, suggestion in FAMILY_SUGGESTIONS.items():
+                    if option not in tried and suggestion not in suggestions:
+                        suggestions.append(suggestion)
+
+                # Fewer columns: cheaper fits, ranked right after the incremental suggestion
+                drop_suggestion = drop_columns_suggestion(session.get("feature_importance"), experiments)
+                if drop_suggestion is not None:
+                    suggestions.insert(1, drop_suggestion)
+
+            pruned_params = [exp.get("params", {}) for exp in experiments.pruned()]
+            suggestions = [
+                suggestion for suggestion in suggestions
+                if not any(_matches(suggestion["model_params"], params) for params in pruned_params)
+            ]
 
             # Trim to n_suggestions
-            suggestions = suggestions[:n_suggestions]
+            if n_suggestions is not None and len(suggestions) > n_suggestions:
+                log_event(self.logger, "PlannerAgent",
+                          f"Left out {len(suggestions) - n_suggestions} lower-ranked suggestions: "
+                          + "; ".join(suggestion["description"] for suggestion in suggestions[n_suggestions:]))
+                suggestions = suggestions[:n_suggestions]
 
             log_event(self.logger, "PlannerAgent",
                       f"Generated {len(suggestions)} suggestions")
@@ -81,3 +203,89 @@ class PlannerAgent:
         except Exception as e:
             log_error(self.logger, "PlannerAgent", str(e))
             return {"status": "error", "message": str(e)}
+
+    def search(
+        self,
+        session_id: str,
+        model_agent,
+        method: str = "hyperband",
+        n_configs: int = 54,
+        eta: int = 3,
+        min_fraction: float = 1 / 27,
+        max_fraction: float = 1 / 3,
+        wall_seconds: float | None = None,
+        cpu_seconds: float | None = None,
+        n_suggestions: int = 3,
+        random_state: int = 0
+    ):
+        """
+        Budgeted search: sample many RandomForest configurations, score them on
+        small stratified subsamples of the training split via model_agent.evaluate,
+        and only promote the best 1/eta to larger subsamples (up to max_fraction;
+        the returned winners are meant to be fully trained by ModelAgent.run).
+
+        method: "halving" (one bracket of n_configs) or "hyperband" (several brackets
+        trading configurations against subsample size; the most exploratory one samples
+        n_configs and the others are scaled from it).
+        wall_seconds / cpu_seconds: optional budget; the search stops early when spent.
+        Returns the top configurations as suggestions for full training.
+        """
+        try:
+            session = self.session_service.get_session(session_id)
+            if session is None:
+                raise ValueError(f"Session '{session_id}' not found")
+
+            best_score = session.get("best_score", None)
+            budget = SearchBudget(wall_seconds=wall_seconds, cpu_seconds=cpu_seconds)
+            history = []
+
+            log_event(self.logger, "PlannerAgent",
+                      f"Starting {method} search (eta={eta}, min_fraction={min_fraction:.3f})")
+
+            def evaluate(config, fraction):
+                return model_agent.evaluate(session_id, config, fraction)
+
+            if method == "halving":
+                configs = sample_configurations(n_configs, random_state)
+                results = successive_halving(configs, evaluate, min_fraction, max_fraction,
+                                             eta, budget, history)
+            elif method == "hyperband":
+                seeds = iter(range(random_state, random_state + 1000))
+                results = hyperband(lambda n: sample_configurations(n, next(seeds)),
+                                    evaluate, min_fraction, max_fraction, eta, budget, history,
+                                    n_configs=n_configs)
+            else:
+                raise ValueError(f"Unknown search method '{method}'")
+
+            suggestions, seen = [], set()
+            for score, fraction, config in results:
+                key = config_key(config)
+                if key in seen:
+                    continue
+                seen.add(key)
+                suggestions.append({
+                    "description": f"{method} pick: {config} "
+                                   f"(score={score:.4f} on {fraction:.0%} of training rows)",
+                    "model_params": config
+                })
+            suggestions = suggestions[:n_suggestions]
+
+            self.session_service.update_session(session_id, "search_history", history)
+
+            elapsed = budget.elapsed()
+            n_tried = len({config_key(h["params"]) for h in history})
+            log_event(self.logger, "PlannerAgent",
+                      f"Search evaluated {len(history)} fits of {n_tried} configurations "
+                      f"in {elapsed['wall_seconds']:.1f}s")
+
+            return {
+                "status": "success",
+                "best_score": best_score,
+                "suggestions": suggestions,
+                "n_evaluations": len(history),
+                "elapsed": elapsed
+            }
+
+        except Exception as e:
+            log_error(self.logger, "PlannerAgent", str(e))
+            return {"status": "error", "message": str(e)}
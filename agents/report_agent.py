@@ -1,7 +1,47 @@
 # report_agent.py
 
+import time
+
 from tools.logging_tools import setup_logger, log_event, log_error
 from core.session_service import SessionService
+from core.serialization import to_jsonable
+
+
+# Params shown per model family (random forests keep the original three)
+KEY_PARAMS = {
+    "hist_gbm": ("max_iter", "learning_rate", "max_leaf_nodes", "l2_regularization"),
+    "linear": ("C", "alpha", "max_iter"),
+}
+
+
+def render_experiment(number: int, exp: dict) -> list:
+    """Markdown lines of one experiment record."""
+    lines = [f"### Experiment {number}", f"- Model: `{exp.get('model_name')}`"]
+    if exp.get("score_std") is not None:
+        cv = exp.get("cv", {})
+        folds = len(exp.get("fold_scores", []))
+        lines.append(f"- Score: `{exp['score']:.4f} ± {exp['score_std']:.4f}` "
+                     f"({folds} of {cv.get('n_splits', 0) * cv.get('n_repeats', 1)} CV folds"
+                     f"{', pruned' if exp.get('pruned') else ''})")
+    else:
+        lines.append(f"- Score: `{exp.get('score')}`")
+    if exp.get("projected_score") is not None:
+        curve = ", ".join(f"{score:.4f} @ {rows} rows" for rows, score
+                          in zip(exp["subsample_rows"], exp["subsample_scores"]))
+        lines.append(f"- Learning curve: {curve}; projected `{exp['projected_score']:.4f}`"
+                     f"{' (full fit skipped)' if exp.get('pruned') else ''}")
+    family = exp["params"].get("model", "random_forest")
+    if family == "random_forest":
+        lines.append(f"- Key Params: `n_estimators={exp['params'].get('n_estimators')}`, "
+                     f"max_depth={exp['params'].get('max_depth', None)}, "
+                     f"max_features={exp['params'].get('max_features', None)}")
+    else:
+        key_params = ", ".join(f"{key}={exp['params'][key]}"
+                               for key in KEY_PARAMS.get(family, ()) if key in exp["params"])
+        lines.append(f"- Key Params: `model={family}`, {key_params}")
+    if exp["params"].get("drop_columns"):
+        lines.append(f"- Dropped feature columns: {len(exp['params']['drop_columns'])}")
+    return lines
 
 
 class ReportAgent:
@@ -9,13 +49,33 @@ class ReportAgent:
     Report Agent:
     - Reads session info, EDA summary, and experiments
     - Produces a markdown-style text report
+    - Ranks input columns by permutation importance when ImportanceAgent ran
+    - Lists every experiment of small sessions and only the best
+      `max_listed` of large search runs; each experiment is rendered once
+    - Builds a structured (JSON-friendly) version of the report for dashboards
     """
 
     def __init__(self, session_service: SessionService):
         self.logger = setup_logger("ReportAgent")
         self.session_service = session_service
-
-    def run(self, session_id: str):
+        # session_id -> (experiment table, rendered blocks); experiments are append-only,
+        # so repeated reports only render the records added since the last one
+        self._rendered = {}
+
+    def _experiment_blocks(self, session_id: str, experiments) -> list:
+        table, blocks = self._rendered.get(session_id, (None, []))
+        if table is not experiments:
+            blocks = []
+        for number in range(len(blocks) + 1, len(experiments) + 1):
+            blocks.append(render_experiment(number, experiments[number - 1]))
+        self._rendered[session_id] = (experiments, blocks)
+        return blocks
+
+    def forget(self, session_id: str):
+        """Drop the rendered blocks cached for a session (called when its report is final)."""
+        self._rendered.pop(session_id, None)
+
+    def run(self, session_id: str, max_listed: int = 50):
         try:
             session = self.session_service.get_session(session_id)
             if session is None:
@@ -59,24 +119,55 @@ class ReportAgent:
             if not experiments:
                 lines.append("No experiments were run.")
             else:
-                for i, exp in enumerate(experiments, start=1):
-                    lines.append(f"### Experiment {i}")
-                    lines.append(f"- Model: `{exp.get('model_name')}`")
-                    lines.append(f"- Score: `{exp.get('score')}`")
-                    lines.append(f"- Key Params: `n_estimators={exp['params'].get('n_estimators')}`, "
-                                 f"max_depth={exp['params'].get('max_depth', None)}, "
-                                 f"max_features={exp['params'].get('max_features', None)}")
+                blocks = self._experiment_blocks(session_id, experiments)
+                rows = range(len(experiments))
+                if len(experiments) > max_listed:
+                    lines.append(f"{len(experiments)} experiments run; the best {max_listed} are listed.\n")
+                    rows = sorted(experiments.top_rows(max_listed))
+                for row in rows:
+                    lines.extend(blocks[row])
 
             lines.append("\n## 3. Best Result")
             lines.append(f"**Best Score:** {best_score}")
 
             if best_score is None or best_score < 0.7:
                 lines.append("\nOverall performance is modest. Consider more feature engineering, "
-                             "trying different models (e.g. XGBoost), or tuning hyperparameters further.")
+                             "trying different models (e.g. histogram gradient boosting, model='hist_gbm'), "
+                             "or tuning hyperparameters further.")
             else:
                 lines.append("\nThe model achieves a reasonably strong baseline. "
                              "Next steps could include more advanced tuning and cross-validation.")
 
+            importance = session.get("feature_importance")
+            if importance:
+                lines.append("\n## 4. Feature Importance")
+                lines.append(f"Permutation importance of `{importance['model_name']}` on "
+                             f"{importance['rows']} validation rows ({importance['n_repeats']} shuffles per column, "
+                             f"baseline score {importance['baseline_score']:.4f}); one-hot columns are "
+                             f"grouped under their source column.\n")
+                lines.append("| Column | Score drop | Std |")
+                lines.append("|---|---|---|")
+                for item in importance["features"]:
+                    lines.append(f"| `{item['feature']}` | {item['importance']:.4f} | {item['std']:.4f} |")
+
+            perf = session.get("perf", [])
+            if perf:
+                lines.append("\n## 5. Performance")
+                lines.append("| Stage | Wall (s) | CPU (s) | RSS at end (MB) | RSS change (MB) | Rows/s | Model size (MB) |")
+                lines.append("|---|---|---|---|---|---|---|")
+                for rec in perf:
+                    rows_per_sec = rec.get("rows_per_sec")
+                    rss = rec.get("rss_mb")
+                    rss_delta = rec.get("rss_delta_mb")
+                    model_bytes = rec.get("model_bytes")
+                    lines.append(
+                        f"| {rec['stage']} | {rec['wall_seconds']:.3f} | {rec['cpu_seconds']:.3f} | "
+                        f"{f'{rss:.1f}' if rss is not None else '-'} | "
+                        f"{f'{rss_delta:+.1f}' if rss_delta is not None else '-'} | "
+                        f"{f'{rows_per_sec:,.0f}' if rows_per_sec else '-'} | "
+                        f"{f'{model_bytes / 1024 ** 2:.2f}' if model_bytes else '-'} |"
+                    )
+
             report_text = "\n".join(lines)
 
             log_event(self.logger, "ReportAgent", "Report generation completed")
@@ -86,3 +177,35 @@ class ReportAgent:
         except Exception as e:
             log_error(self.logger, "ReportAgent", str(e))
             return {"status": "error", "message": str(e)}
+
+    def structured(self, session_id: str) -> dict:
+        """
+        The report as plain JSON types: session info, EDA summary, every experiment
+        record, the best experiment, feature importance and stage performance.
+        """
+        try:
+            session = self.session_service.get_session(session_id)
+            if session is None:
+                raise ValueError(f"Session '{session_id}' not found")
+
+            experiments = session.get("experiments", [])
+            eda_summary = session.get("eda_summary", {})
+            report = {
+                "session_id": session_id,
+                "generated_at": time.time(),
+                "dataset_path": session.get("dataset_path"),
+                "target": session.get("target"),
+                "task_type": session.get("task_type"),
+                "eda": {key: eda_summary[key] for key in ("shape", "dtypes", "missing_values",
+                                                          "target_distribution") if key in eda_summary},
+                "best_score": session.get("best_score"),
+                "best_experiment": None if experiments.best_row is None else experiments.best_row + 1,
+                "experiments": [{"number": number, **exp} for number, exp in enumerate(experiments, start=1)],
+                "feature_importance": session.get("feature_importance"),
+                "perf": session.get("perf", []),
+            }
+            return {"status": "success", "report": to_jsonable(report)}
+
+        except Exception as e:
+            log_error(self.logger, "ReportAgent", str(e))
+            return {"status": "error", "message": str(e)}
@@ -0,0 +1,71 @@
+# generate_data.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+SOURCE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "Bank_Customer_Churn.csv")
+
+# Dataset shapes used by the benchmark suite
+SHAPES = {
+    "narrow": {"extra_numeric": 0, "high_cardinality": 0},
+    "wide": {"extra_numeric": 100, "high_cardinality": 0},
+    "highcard": {"extra_numeric": 0, "high_cardinality": 2},
+}
+
+
+def _synthesize_chunk(source: pd.DataFrame, n_rows: int, extra_numeric: int,
+                      high_cardinality: int, rng: np.random.Generator, start_id: int) -> pd.DataFrame:
+    """Resample source rows, jitter numeric columns and add extra columns."""
+    chunk = source.sample(n=n_rows, replace=True, random_state=rng.integers(2 ** 31)).reset_index(drop=True)
+    chunk["customer_id"] = np.arange(start_id, start_id + n_rows)
+
+    for col in ("credit_score", "age", "balance", "estimated_salary"):
+        noise = rng.normal(0, chunk[col].std() * 0.05, n_rows)
+        chunk[col] = (chunk[col] + noise).round(2).clip(lower=0)
+
+    extra = {}
+    base = chunk["balance"].to_numpy()
+    for i in range(extra_numeric):
+        extra[f"num_{i}"] = (base * rng.uniform(-1, 1) + rng.normal(0, 1000, n_rows)).round(3)
+    for i in range(high_cardinality):
+        # ~1 distinct value per 10 rows, e.g. branch or surname-like codes
+        cardinality = max(10, n_rows // 10)
+        extra[f"code_{i}"] = np.char.add("c", rng.integers(0, cardinality, n_rows).astype(str))
+    if extra:
+        chunk = pd.concat([chunk, pd.DataFrame(extra)], axis=1)
+
+    # Keep the target as the last column, like the source file
+    target = chunk.pop("churn")
+    chunk["churn"] = target
+    return chunk
+
+
+def generate_dataset(out_path: str, n_rows: int, shape: str = "narrow", seed: int = 0,
+                     chunk_rows: int = 500_000, source_csv: str = SOURCE_CSV) -> str:
+    """
+    Write a synthetic churn-style CSV with `n_rows` rows derived from the source dataset.
+    Rows are generated and appended in chunks, so 10M-row files never sit in memory.
+    Existing files are reused.
+    """
+    if os.path.exists(out_path):
+        return out_path
+
+    params = SHAPES[shape]
+    source = pd.read_csv(source_csv)
+    rng = np.random.default_rng(seed)
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    written = 0
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        while written < n_rows:
+            n = min(chunk_rows, n_rows - written)
+            chunk = _synthesize_chunk(source, n, params["extra_numeric"],
+                                      params["high_cardinality"], rng, 10_000_000 + written)
+            chunk.to_csv(f, header=(written == 0), index=False)
+            written += n
+    os.replace(tmp_path, out_path)
+    return out_path
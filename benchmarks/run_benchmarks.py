@@ -0,0 +1,159 @@
+# run_benchmarks.py - end-to-end pipeline benchmarks at scaled dataset sizes
+# Run from the project root: python -m benchmarks.run_benchmarks
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from benchmarks.generate_data import SHAPES, generate_dataset
+from core.orchestrator import run_pipeline
+from core.session_service import SessionService
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, "data")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+
+
+def run_case(n_rows: int, shape: str, n_planned_runs: int, n_workers: int) -> dict:
+    """
+    Generate (or reuse) one dataset, run the pipeline on it and summarize stage timings.
+    A failed pipeline is recorded with its status, stage and message instead of timings.
+    """
+    dataset_path = generate_dataset(os.path.join(DATA_DIR, f"churn_{shape}_{n_rows}.csv"), n_rows, shape)
+    session_id = f"bench_{shape}_{n_rows}"
+    session_service = SessionService()
+
+    wall_start = time.perf_counter()
+    result = run_pipeline(dataset_path, "churn", session_id=session_id, n_planned_runs=n_planned_runs,
+                          session_service=session_service, n_workers=n_workers,
+                          output_path=os.path.join(RESULTS_DIR, f"{session_id}_report.md"))
+    total = time.perf_counter() - wall_start
+    if result["status"] != "success":
+        return {"rows": n_rows, "shape": shape, "status": result["status"],
+                "stage": result.get("stage"), "message": result.get("message")}
+
+    session = session_service.get_session(session_id)
+    stages = {}
+    for record in session.get("perf", []):
+        stage = stages.setdefault(record["stage"], {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0})
+        stage["wall_seconds"] += record["wall_seconds"]
+        stage["cpu_seconds"] += record["cpu_seconds"]
+        stage["calls"] += 1
+        # Largest RSS at the end of a call, and largest growth during one
+        for key in ("rss_mb", "rss_delta_mb"):
+            if record.get(key) is not None:
+                stage[key] = max(stage.get(key, record[key]), record[key])
+
+    return {
+        "rows": n_rows,
+        "shape": shape,
+        "status": result["status"],
+        "total_wall_seconds": total,
+        "best_score": session.get("best_score"),
+        "stages": stages,
+    }
+
+
+def comparable(results: dict, baseline: dict) -> bool:
+    """
+    Whether timings can be compared with the baseline. A different machine is only
+    warned about; runs with worker processes are not compared when either side had
+    a different worker count or CPU count, or the baseline ran on a single core,
+    since their parallel speedup says nothing about this machine.
+    """
+    machine, base_machine = results["machine"], baseline.get("machine", {})
+    workers = results.get("settings", {}).get("workers", 1)
+    base_workers = baseline.get("settings", {}).get("workers", 1)
+    if machine != base_machine:
+        print(f"WARNING: baseline recorded on {base_machine}, this run on {machine}")
+    if max(workers, base_workers) > 1 and (workers != base_workers
+                                          or machine.get("cpu_count") != base_machine.get("cpu_count")
+                                          or base_machine.get("cpu_count") == 1):
+        print(f"Skipping the comparison: {workers} worker(s) on {machine.get('cpu_count')} CPUs vs "
+              f"{base_workers} worker(s) on {base_machine.get('cpu_count')} CPUs in the baseline. "
+              f"Re-record it with --save-baseline on this machine.")
+        return False
+    return True
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_seconds: float = 0.05) -> list:
+    """
+    Return regressions: stages whose wall time grew by more than `tolerance` vs the
+    baseline. Slowdowns smaller than `min_seconds` are timer noise and are ignored.
+    Failed cases (on either side) are not compared.
+    """
+    regressions = []
+    for case, current in results["cases"].items():
+        base = baseline["cases"].get(case)
+        if base is None or current.get("status") != "success" or base.get("status", "success") != "success":
+            continue
+        for stage, stats in current["stages"].items():
+            base_stats = base["stages"].get(stage)
+            if not base_stats or base_stats["wall_seconds"] <= 0:
+                continue
+            ratio = stats["wall_seconds"] / base_stats["wall_seconds"]
+            slower = stats["wall_seconds"] - base_stats["wall_seconds"] > min_seconds
+            flag = "REGRESSION" if ratio > 1 + tolerance and slower else ""
+            print(f"{case:28s} {stage:22s} {base_stats['wall_seconds']:9.3f}s -> "
+                  f"{stats['wall_seconds']:9.3f}s  x{ratio:5.2f} {flag}")
+            if flag:
+                regressions.append((case, stage, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AutoML pipeline at scaled dataset sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="row counts, e.g. 10000 100000 1000000 10000000")
+    parser.add_argument("--shapes", nargs="+", default=list(SHAPES), choices=list(SHAPES))
+    parser.add_argument("--runs", type=int, default=1, help="planned experiments per pipeline")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="ignore absolute slowdowns below this many seconds")
+    args = parser.parse_args(argv)
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "cpu_count": os.cpu_count()},
+        "settings": {"runs": args.runs, "workers": args.workers},
+        "cases": {},
+    }
+    for shape in args.shapes:
+        for n_rows in args.sizes:
+            case = f"{shape}_{n_rows}"
+            print(f"--- {case}")
+            results["cases"][case] = run_case(n_rows, shape, args.runs, args.workers)
+            if results["cases"][case]["status"] != "success":
+                print(f"{case} failed at {results['cases'][case]['stage']}: {results['cases'][case]['message']}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = args.baseline if args.save_baseline else args.output
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {out_path}")
+
+    failed = [case for case, stats in results["cases"].items() if stats["status"] != "success"]
+    if failed:
+        print(f"{len(failed)} case(s) failed: {', '.join(failed)}")
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_seconds) \
+            if comparable(results, baseline) else []
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}")
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
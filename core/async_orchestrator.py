@@ -0,0 +1,163 @@
+# async_orchestrator.py
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from core.session_service import SessionService
+from tools.logging_tools import setup_logger, log_event
+from tools.profiling_tools import track_stage
+
+
+class StageFailed(Exception):
+    """Raised inside the task graph when an agent returns status 'error'."""
+
+    def __init__(self, stage: str, result: dict):
+        super().__init__(f"{stage} failed: {result.get('message')}")
+        self.stage = stage
+        self.result = result
+
+
+async def run_pipeline_async(
+    dataset_path: str,
+    target_col: str,
+    session_id: str = "run1",
+    n_planned_runs: int = 1,
+    session_service: SessionService | None = None,
+    n_workers: int = 1,
+    search: str | None = None,
+    search_budget_seconds: float | None = None,
+    cv_folds: int | None = None,
+    progressive: bool = False,
+    importance: bool = True,
+    output_path: str | None = None,
+    artifact_dir: str | None = None,
+    max_threads: int = 4
+):
+    """
+    Same pipeline as core.orchestrator.run_pipeline, run as a dependency graph:
+
+        Intake -> EDA -----------------------------------------------------> Report
+               -> Features -> Baseline -> Importance -> Planner -> Planned -> Report
+
+    EDA and the feature/baseline branch only depend on intake, so they run
+    concurrently on a thread pool (`max_threads`) while the event loop waits.
+    A provisional report is rewritten as soon as EDA or the baseline finishes,
+    and the final report once every branch is done.
+    artifact_dir: as in run_pipeline (default: .artifacts in the project root).
+    Returns the same result dict as run_pipeline.
+    """
+    # Agents pull in pandas and sklearn: imported on first run, not with this module
+    from agents.intake_agent import IntakeAgent
+    from agents.eda_agent import EDAAgent
+    from agents.feature_agent import FeatureAgent
+    from agents.model_agent import ModelAgent
+    from agents.importance_agent import ImportanceAgent
+    from agents.planner_agent import PlannerAgent
+    from agents.report_agent import ReportAgent
+    from core.report_writer import ReportWriter
+
+    logger = setup_logger("AsyncOrchestrator")
+    log_event(logger, "AsyncOrchestrator", "Starting pipeline")
+
+    if session_service is None:
+        session_service = SessionService()
+    session_service.create_session(session_id)
+
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), "..", "report.md")
+    output_path = os.path.abspath(output_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    if artifact_dir is None:
+        artifact_dir = os.path.join(os.path.dirname(__file__), "..", ".artifacts")
+    artifact_dir = os.path.abspath(artifact_dir)
+    intake = IntakeAgent(session_service, artifact_dir=artifact_dir)
+    eda = EDAAgent(session_service)
+    feature_agent = FeatureAgent(session_service)
+    model_agent = ModelAgent(session_service, artifact_dir=artifact_dir)
+    importance_agent = ImportanceAgent(session_service, artifact_dir=artifact_dir)
+    planner = PlannerAgent(session_service)
+    report_agent = ReportAgent(session_service)
+    report_writer = ReportWriter(session_service, session_id, output_path, report_agent)
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="pipeline")
+    report_lock = asyncio.Lock()
+
+    def call(stage: str, fn, *args, **kwargs):
+        """Run a blocking agent call in the executor, timed as `stage`."""
+        def timed():
+            with track_stage(session_service, session_id, stage):
+                return fn(*args, **kwargs)
+        return loop.run_in_executor(executor, timed)
+
+    def check(stage: str, result: dict) -> dict:
+        if result["status"] != "success":
+            raise StageFailed(stage, result)
+        return result
+
+    async def publish_report():
+        # Serialize writers: both branches publish as their results arrive
+        async with report_lock:
+            return await loop.run_in_executor(executor, report_writer.write)
+
+    async def eda_branch():
+        check("eda", await call("eda", eda.run, session_id))
+        await publish_report()
+
+    async def model_branch():
+        check("features", await call("features", feature_agent.run, session_id))
+        check("baseline_model", await call("baseline_model", model_agent.run, session_id,
+                                           cv=cv_folds, n_workers=n_workers))
+        await publish_report()
+
+        if importance:
+            importance_result = await call("importance", importance_agent.run, session_id, n_workers=n_workers)
+            if importance_result["status"] != "success":
+                log_event(logger, "AsyncOrchestrator",
+                          f"Feature importance skipped: {importance_result.get('message')}", "WARNING")
+
+        if search:
+            plan_result = await call("planner", planner.search, session_id, model_agent, method=search,
+                                     wall_seconds=search_budget_seconds, n_suggestions=n_planned_runs)
+        else:
+            plan_result = await call("planner", planner.run, session_id, n_planned_runs)
+        if plan_result["status"] == "success":
+            planned = plan_result["suggestions"][:n_planned_runs]
+            log_event(logger, "AsyncOrchestrator", f"Running {len(planned)} planned experiments")
+            await call("planned_experiments", model_agent.run_many, session_id,
+                       [suggestion["model_params"] for suggestion in planned], n_workers=n_workers,
+                       cv=cv_folds, progressive=progressive)
+
+    try:
+        check("intake", await call("intake", intake.run, session_id, dataset_path, target_col))
+
+        # Let both branches finish (threads cannot be cancelled), then surface the first failure
+        outcomes = await asyncio.gather(eda_branch(), model_branch(), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+        report_result = check("report", await publish_report())
+    except StageFailed as e:
+        log_event(logger, "AsyncOrchestrator", str(e), "ERROR")
+        return {"status": "error", "session_id": session_id, "stage": e.stage,
+                "message": e.result.get("message")}
+    finally:
+        executor.shutdown(wait=True)
+        report_writer.close()
+
+    log_event(logger, "AsyncOrchestrator", f"Pipeline completed. Report saved to {output_path}")
+    return {
+        "status": report_result["status"],
+        "session_id": session_id,
+        "best_score": session_service.get_session(session_id)["best_score"],
+        "report_path": output_path,
+        "json_report_path": report_result.get("json_path")
+    }
+
+
+def run_pipeline_concurrent(dataset_path: str, target_col: str, **kwargs):
+    """Synchronous wrapper around run_pipeline_async for scripts and notebooks."""
+    return asyncio.run(run_pipeline_async(dataset_path, target_col, **kwargs))
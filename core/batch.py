@@ -0,0 +1,341 @@
+# batch.py - run many (dataset, target) pipelines from a manifest
+
+import _thread
+import csv
+import json
+import multiprocessing as mp
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.logging_tools import setup_logger, log_event, log_error
+from tools.profiling_tools import current_rss_mb
+
+try:
+    import resource
+except ImportError:  # limits are not enforced on Windows
+    resource = None
+
+# Group workers are spawned, not forked: run_batch starts them from pool threads,
+# and a fork of a multithreaded process can inherit locks (logging, BLAS) held
+# by another thread and deadlock
+_MP_CONTEXT = mp.get_context("spawn")
+
+# Keys a manifest job may set besides dataset/target; passed through to run_pipeline
+JOB_OPTIONS = {"session_id", "n_planned_runs", "n_workers", "search", "search_budget_seconds", "cv_folds",
+               "progressive", "importance"}
+
+
+def load_manifest(path: str) -> list:
+    """
+    Read a job manifest: a JSON list (or {"jobs": [...]}) of objects, or a CSV with
+    header. Each job needs `dataset` and `target`; optional keys are JOB_OPTIONS.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            jobs = [{k: v for k, v in row.items() if v not in (None, "")} for row in csv.DictReader(f)]
+        for job in jobs:
+            for key in ("n_planned_runs", "n_workers", "cv_folds"):
+                if key in job:
+                    job[key] = int(job[key])
+            if "search_budget_seconds" in job:
+                job["search_budget_seconds"] = float(job["search_budget_seconds"])
+            for key in ("progressive", "importance"):
+                if key in job:
+                    job[key] = job[key].strip().lower() in ("1", "true", "yes")
+    else:
+        with open(path, encoding="utf-8") as f:
+            jobs = json.load(f)
+        if isinstance(jobs, dict):
+            jobs = jobs.get("jobs", [])
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    for job in jobs:
+        # Relative dataset paths are relative to the manifest file
+        if "dataset" in job and not os.path.isabs(job["dataset"]):
+            job["dataset"] = os.path.join(base_dir, job["dataset"])
+    validate_manifest(jobs)
+    return jobs
+
+
+def dataset_columns(path: str) -> list:
+    """Column names of a CSV (header row only) or of a Feather/Parquet file (schema only)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".feather", ".arrow"):
+        import pyarrow as pa
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).schema.names
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+def validate_manifest(jobs: list):
+    """
+    Raise ValueError listing every problem found in the manifest jobs: missing
+    keys, datasets that do not exist, targets that are not a column of their
+    dataset (only headers are read), unknown keys and duplicate session ids.
+    """
+    problems = []
+    seen_sessions = set()
+    columns = {}
+    for i, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            problems.append(f"job {i}: expected an object, got {type(job).__name__}")
+            continue
+        for key in ("dataset", "target"):
+            if not job.get(key):
+                problems.append(f"job {i}: missing '{key}'")
+        dataset = job.get("dataset")
+        if dataset and not os.path.exists(dataset):
+            problems.append(f"job {i}: dataset not found: {dataset}")
+        elif dataset and job.get("target"):
+            if dataset not in columns:
+                try:
+                    columns[dataset] = dataset_columns(dataset)
+                except Exception as e:
+                    columns[dataset] = None
+                    problems.append(f"job {i}: cannot read the columns of {dataset}: {e}")
+            if columns[dataset] is not None and job["target"] not in columns[dataset]:
+                problems.append(f"job {i}: target '{job['target']}' is not a column of {dataset}")
+        unknown = set(job) - JOB_OPTIONS - {"dataset", "target"}
+        if unknown:
+            problems.append(f"job {i}: unknown keys {sorted(unknown)}")
+        session_id = job.get("session_id")
+        if session_id:
+            if session_id in seen_sessions:
+                problems.append(f"job {i}: duplicate session_id '{session_id}'")
+            seen_sessions.add(session_id)
+    if problems:
+        raise ValueError("Invalid manifest:\n" + "\n".join(problems))
+
+
+def _assign_session_ids(jobs: list) -> list:
+    used = {job["session_id"] for job in jobs if job.get("session_id")}
+    assigned = []
+    for i, job in enumerate(jobs):
+        job = dict(job)
+        if not job.get("session_id"):
+            stem = os.path.splitext(os.path.basename(job["dataset"]))[0]
+            session_id = f"{stem}_{job['target']}_{i}"
+            while session_id in used:
+                session_id += "_"
+            used.add(session_id)
+            job["session_id"] = session_id
+        assigned.append(job)
+    return assigned
+
+
+class JobLimitExceeded(BaseException):
+    """
+    Raised in a group worker when a job goes over its CPU or memory limit.
+    Derives from BaseException, like KeyboardInterrupt, so the agents'
+    `except Exception` handlers cannot swallow it and carry on with the job.
+    """
+
+
+class _JobLimits:
+    """
+    Per-job limits of a group worker.
+
+    CPU: a soft RLIMIT_CPU budget. The kernel then sends SIGXCPU every second; the
+    first one records the breach, ignores the following ones and raises
+    JobLimitExceeded in the main thread.
+    Memory: a watchdog thread polls the process' current RSS. An RLIMIT_AS cap is
+    not used: BLAS/OpenMP thread arenas reserve far more address space than they
+    touch, so it fails jobs whose resident memory is well under the limit. The
+    poll is a soft limit: the breach is raised in the main thread at its next
+    Python bytecode, so native code (a long fit) can overshoot until it returns.
+    `exceeded` keeps the reason, so the worker can also fail a job whose
+    pipeline returned normally after a breach.
+    """
+
+    def __init__(self, memory_limit_mb: int | None, cpu_limit_seconds: float | None,
+                 poll_seconds: float = 0.5):
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit_seconds = cpu_limit_seconds if resource is not None else None
+        self.poll_seconds = poll_seconds
+        self.exceeded = None
+        self._stop = threading.Event()
+        self._watchdog = None
+
+    def _breach(self, reason: str):
+        if self.exceeded is None:
+            self.exceeded = reason
+            raise JobLimitExceeded(reason)
+
+    def _on_cpu_limit(self, signum, frame):
+        signal.signal(signal.SIGXCPU, signal.SIG_IGN)
+        self._breach("CPU time limit exceeded")
+
+    def _on_memory_limit(self, signum, frame):
+        self._breach(f"memory limit of {self.memory_limit_mb} MB exceeded")
+
+    def _watch_memory(self):
+        while not self._stop.wait(self.poll_seconds):
+            rss = current_rss_mb()
+            if rss is not None and rss > self.memory_limit_mb:
+                _thread.interrupt_main(signal.SIGUSR1)
+                return
+
+    def __enter__(self):
+        if self.cpu_limit_seconds and hasattr(signal, "SIGXCPU"):
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            signal.signal(signal.SIGXCPU, self._on_cpu_limit)
+            # Only the soft limit is set: an unprivileged process cannot raise a hard
+            # limit back, and the next job in the group needs a fresh CPU budget
+            resource.setrlimit(resource.RLIMIT_CPU,
+                               (int(usage.ru_utime + usage.ru_stime + self.cpu_limit_seconds) + 1, hard))
+        if self.memory_limit_mb and hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self._on_memory_limit)
+            self._watchdog = threading.Thread(target=self._watch_memory, name="memory-watchdog", daemon=True)
+            self._watchdog.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+        if self.cpu_limit_seconds and hasattr(signal, "SIGXCPU"):
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+            signal.signal(signal.SIGXCPU, signal.SIG_DFL)
+        return False
+
+
+def _group_worker(conn, jobs: list, output_dir: str, memory_limit_mb, cpu_limit_seconds,
+                  pipeline_kwargs: dict):
+    """
+    Subprocess entry point: run all jobs that share a dataset with one
+    SessionService, so the dataset is parsed once for the whole group.
+    Sends one result dict per job through `conn`.
+    """
+    from core.orchestrator import run_pipeline
+    from core.session_service import SessionService
+    from core.sqlite_session_service import SQLiteSessionService
+
+    db_path = pipeline_kwargs.get("db_path")
+    session_service = SQLiteSessionService(db_path) if db_path else SessionService()
+    kwargs = {k: v for k, v in pipeline_kwargs.items() if k != "db_path"}
+
+    for job in jobs:
+        start = time.perf_counter()
+        limits = _JobLimits(memory_limit_mb, cpu_limit_seconds)
+        try:
+            with limits:
+                options = {k: v for k, v in job.items() if k in JOB_OPTIONS}
+                result = run_pipeline(
+                    job["dataset"], job["target"],
+                    session_service=session_service,
+                    output_path=os.path.join(output_dir, f"{job['session_id']}.md"),
+                    **{**kwargs, **options}
+                )
+        except (Exception, JobLimitExceeded) as e:
+            result = {"status": "error", "session_id": job["session_id"], "message": f"{type(e).__name__}: {e}"}
+        if limits.exceeded and result["status"] == "success":
+            # The breach was caught inside the pipeline: the job still failed its limit
+            result = {"status": "error", "session_id": job["session_id"],
+                      "message": f"JobLimitExceeded: {limits.exceeded}"}
+        result = {**result, "dataset": job["dataset"], "target": job["target"],
+                  "wall_seconds": time.perf_counter() - start}
+        conn.send(result)
+    conn.close()
+
+
+def _run_group(jobs: list, output_dir: str, memory_limit_mb, cpu_limit_seconds, pipeline_kwargs: dict) -> list:
+    """Run a job group in its own process; a crash only fails the jobs of this group."""
+    parent_conn, child_conn = _MP_CONTEXT.Pipe(duplex=False)
+    process = _MP_CONTEXT.Process(target=_group_worker,
+                                  args=(child_conn, jobs, output_dir, memory_limit_mb,
+                                        cpu_limit_seconds, pipeline_kwargs))
+    process.start()
+    child_conn.close()
+
+    results = []
+    while len(results) < len(jobs):
+        try:
+            results.append(parent_conn.recv())
+        except EOFError:
+            break
+    process.join()
+
+    for job in jobs[len(results):]:
+        results.append({
+            "status": "error", "session_id": job["session_id"],
+            "dataset": job["dataset"], "target": job["target"],
+            "message": f"worker process exited with code {process.exitcode}",
+            "wall_seconds": None
+        })
+    return results
+
+
+def run_batch(
+    jobs: list | str,
+    output_dir: str = "batch_reports",
+    max_workers: int = 2,
+    memory_limit_mb: int | None = None,
+    cpu_limit_seconds: float | None = None,
+    artifact_dir: str | None = None,
+    **pipeline_kwargs
+) -> list:
+    """
+    Run every (dataset, target) job of a manifest.
+
+    jobs: list of job dicts or a manifest path (see load_manifest).
+    Jobs on the same dataset are grouped and run in one worker process so they
+    share its dataset cache; groups run concurrently on up to `max_workers`
+    processes. Each job gets its own session and report at
+    <output_dir>/<session_id>.md, and per-job limits on memory (MB of resident memory,
+    polled) and CPU seconds (see _JobLimits).
+    A failing or crashing job is recorded and the rest of the batch continues.
+    artifact_dir: shared directory for dataset copies, models and checkpoints
+    (default: run_pipeline's .artifacts in the project root).
+    Extra keyword arguments (e.g. db_path, n_planned_runs) go to run_pipeline.
+    Returns one result dict per job, also written to <output_dir>/batch_summary.json.
+    """
+    logger = setup_logger("Batch")
+    if isinstance(jobs, str):
+        jobs = load_manifest(jobs)
+    else:
+        validate_manifest(jobs)
+    jobs = _assign_session_ids(jobs)
+
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    if artifact_dir is not None:
+        pipeline_kwargs["artifact_dir"] = os.path.abspath(artifact_dir)
+
+    groups = {}
+    for job in jobs:
+        groups.setdefault(os.path.abspath(job["dataset"]), []).append(job)
+
+    log_event(logger, "Batch", f"Running {len(jobs)} jobs in {len(groups)} dataset groups "
+                               f"on {max_workers} workers")
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_run_group, group, output_dir, memory_limit_mb,
+                               cpu_limit_seconds, pipeline_kwargs)
+                   for group in groups.values()]
+        for future in futures:
+            for result in future.result():
+                if result["status"] == "success":
+                    log_event(logger, "Batch", f"{result['session_id']}: best_score={result['best_score']}")
+                else:
+                    log_error(logger, "Batch", f"{result['session_id']}: {result.get('message')}")
+                results.append(result)
+
+    summary_path = os.path.join(output_dir, "batch_summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, default=str)
+
+    n_failed = sum(result["status"] != "success" for result in results)
+    log_event(logger, "Batch", f"Batch finished: {len(results) - n_failed} succeeded, "
+                               f"{n_failed} failed. Summary: {summary_path}")
+    return results
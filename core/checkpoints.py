@@ -0,0 +1,64 @@
+# checkpoints.py
+
+import os
+import time
+
+# EDA summary fields rendered by ReportAgent; materialized before the EDA
+# checkpoint so a resumed run can still report them (the description stays lazy)
+EDA_REPORT_FIELDS = ("shape", "dtypes", "missing_values", "target_distribution")
+
+
+def dataset_identity(dataset_path: str, target_col: str) -> dict:
+    """What an intake checkpoint is valid for: the same file, unchanged, and target."""
+    stat = os.stat(dataset_path)
+    return {"dataset_path": os.path.abspath(dataset_path), "target": target_col,
+            "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+class PipelineCheckpoints:
+    """
+    Per-stage checkpoints of a pipeline run.
+
+    Stage markers live in the session's "checkpoints" field (durable when the
+    session store is SQLiteSessionService); outputs that are not JSON, like the
+    encoded feature matrices, are written under <checkpoint_dir>/<session_id>/.
+    """
+
+    def __init__(self, session_service, session_id: str, checkpoint_dir: str):
+        self.session_service = session_service
+        self.session_id = session_id
+        self.directory = os.path.join(checkpoint_dir, session_id)
+
+    def _all(self) -> dict:
+        session = self.session_service.get_session(self.session_id) or {}
+        return session.get("checkpoints") or {}
+
+    def get(self, stage: str) -> dict | None:
+        """The checkpoint of a completed stage, or None."""
+        return self._all().get(stage)
+
+    def done(self, stage: str) -> bool:
+        return stage in self._all()
+
+    def mark(self, stage: str, **info):
+        """Record `stage` as completed, with optional JSON-friendly details."""
+        checkpoints = dict(self._all())
+        checkpoints[stage] = {"completed_at": time.time(), **info}
+        self.session_service.update_session(self.session_id, "checkpoints", checkpoints)
+
+    def save_features(self, features: dict) -> str:
+        """Write the encoded features (matrices, split, encoder) and return the file path."""
+        import joblib
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, "features.joblib")
+        tmp_path = path + ".tmp"
+        # Uncompressed so the arrays can be memory-mapped back on resume
+        joblib.dump(features, tmp_path, compress=0)
+        os.replace(tmp_path, path)
+        return path
+
+    def load_features(self, path: str) -> dict:
+        import joblib
+
+        return joblib.load(path, mmap_mode="r")
@@ -0,0 +1,145 @@
+# cli.py - command line entry point: python -m core.cli {run,batch,report} ...
+
+import argparse
+import json
+import os
+import sys
+
+# Only the standard library is imported here: pandas/sklearn load inside the
+# commands that train, so --help, manifest checks and report re-renders start fast.
+
+
+def _write_report(text: str, output_path: str) -> str:
+    output_path = os.path.abspath(output_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return output_path
+
+
+def cmd_run(args) -> int:
+    from core.orchestrator import run_pipeline
+
+    result = run_pipeline(
+        args.dataset,
+        args.target,
+        session_id=args.session,
+        n_planned_runs=args.runs,
+        n_workers=args.workers,
+        search=args.search,
+        search_budget_seconds=args.search_budget,
+        cv_folds=args.cv_folds,
+        db_path=args.db,
+        metrics_path=args.metrics,
+        trace_path=args.trace,
+        output_path=args.output,
+        resume=args.resume,
+        progressive=args.progressive,
+        importance=not args.no_importance,
+        artifact_dir=args.artifact_dir,
+    )
+    print(json.dumps(result, indent=2, default=str))
+    return 0 if result["status"] == "success" else 1
+
+
+def cmd_batch(args) -> int:
+    from core.batch import load_manifest, run_batch
+
+    # load_manifest validates every job: keys, dataset paths and target columns
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.check:
+        print(f"Manifest OK: {len(jobs)} jobs")
+        return 0
+
+    results = run_batch(jobs, output_dir=args.output_dir, max_workers=args.workers,
+                        memory_limit_mb=args.memory_limit_mb, cpu_limit_seconds=args.cpu_limit_seconds,
+                        artifact_dir=args.artifact_dir, db_path=args.db)
+    failed = [result for result in results if result["status"] != "success"]
+    print(f"{len(results) - len(failed)} of {len(results)} jobs succeeded")
+    return 1 if failed else 0
+
+
+def cmd_report(args) -> int:
+    # Re-render from the stored session only: no dataset reload, no training
+    from core.sqlite_session_service import SQLiteSessionService
+    from agents.report_agent import ReportAgent
+
+    if not os.path.exists(args.db):
+        print(f"No session database at {args.db}", file=sys.stderr)
+        return 2
+    session_service = SQLiteSessionService(args.db)
+    if session_service.get_session(args.session) is None:
+        print(f"Session '{args.session}' not found in {args.db}", file=sys.stderr)
+        return 2
+    report_agent = ReportAgent(session_service)
+    result = report_agent.structured(args.session) if args.json else report_agent.run(args.session)
+    if result["status"] != "success":
+        print(result["message"], file=sys.stderr)
+        return 1
+    text = json.dumps(result["report"], indent=2) if args.json else result["report"]
+    if args.output is None:
+        sys.stdout.write(text + "\n")
+    else:
+        print(f"Report saved to: {_write_report(text, args.output)}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m core.cli",
+                                     description="Multi-agent AutoML pipeline for tabular datasets.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the full pipeline on one dataset")
+    run.add_argument("dataset", help="CSV (or Feather/Parquet) file")
+    run.add_argument("target", help="target column")
+    run.add_argument("--session", default="run1", help="session id (default: run1)")
+    run.add_argument("--runs", type=int, default=1, help="planned experiments after the baseline")
+    run.add_argument("--output", default=None, help="markdown report path (default: report.md)")
+    run.add_argument("--db", default=None, help="SQLite session store (durable sessions, memoized runs)")
+    run.add_argument("--artifact-dir", default=None,
+                     help="dataset copies, models and checkpoints (default: .artifacts)")
+    run.add_argument("--workers", type=int, default=1, help="worker processes")
+    run.add_argument("--cv-folds", type=int, default=None, help="score by k-fold cross-validation")
+    run.add_argument("--search", choices=["halving", "hyperband"], default=None,
+                     help="budgeted search instead of the fixed planner suggestions")
+    run.add_argument("--search-budget", type=float, default=None, help="search wall-clock budget (seconds)")
+    run.add_argument("--progressive", action="store_true",
+                     help="screen planned experiments on subsamples before the full fit")
+    run.add_argument("--no-importance", action="store_true", help="skip the permutation importance stage")
+    run.add_argument("--resume", action="store_true", help="continue an interrupted session (needs --db)")
+    run.add_argument("--metrics", default=None, help="export stage metrics as JSON lines")
+    run.add_argument("--trace", default=None, help="export stage timings as a Chrome trace")
+    run.set_defaults(handler=cmd_run)
+
+    batch = commands.add_parser("batch", help="run the jobs of a manifest (JSON or CSV)")
+    batch.add_argument("manifest")
+    batch.add_argument("--check", action="store_true", help="only validate the manifest, dataset paths and target columns")
+    batch.add_argument("--output-dir", default="batch_reports")
+    batch.add_argument("--workers", type=int, default=2, help="dataset groups run concurrently")
+    batch.add_argument("--db", default=None, help="shared SQLite session store")
+    batch.add_argument("--artifact-dir", default=None,
+                       help="dataset copies, models and checkpoints (default: .artifacts)")
+    batch.add_argument("--memory-limit-mb", type=int, default=None)
+    batch.add_argument("--cpu-limit-seconds", type=float, default=None)
+    batch.set_defaults(handler=cmd_batch)
+
+    report = commands.add_parser("report", help="re-render the report of a stored session")
+    report.add_argument("session", help="session id")
+    report.add_argument("--db", required=True, help="SQLite session store the session was run with")
+    report.add_argument("--output", default=None, help="report path (default: print to stdout)")
+    report.add_argument("--json", action="store_true", help="structured JSON report instead of markdown")
+    report.set_defaults(handler=cmd_report)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# dataset_cache.py
+
+import os
+import threading
+from collections import OrderedDict
+
+
+class DatasetCache:
+    """
+    Shared, content-addressed cache of loaded datasets.
+    Entries are keyed by (absolute path, mtime, size), so an edited file
+    is re-read automatically. Memory usage is bounded by `max_bytes` and
+    the least recently used datasets are evicted first.
+
+    Cached frames are shared between agents and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = 2 * 1024 ** 3):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(path: str):
+        """Build the cache key for a file: (absolute path, mtime_ns, size)."""
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _sizeof(df) -> int:
+        return int(df.memory_usage(deep=True).sum())
+
+    def get(self, key):
+        """Return the cached frame for `key` (or None) and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, df):
+        """Insert a frame, evicting least recently used entries to respect the budget."""
+        size = self._sizeof(df)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+            # Frames larger than the whole budget are never cached
+            if size > self.max_bytes:
+                return df
+
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+            self._entries[key] = (df, size)
+            self.current_bytes += size
+        return df
+
+    def get_or_load(self, path: str, loader):
+        """Return the cached frame for `path`, calling `loader(path)` on a miss."""
+        key = self.make_key(path)
+        df = self.get(key)
+        if df is None:
+            df = self.put(key, loader(path))
+        return df
+
+    def clear(self):
+        """Drop every cached dataset."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and memory usage."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
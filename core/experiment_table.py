@@ -0,0 +1,260 @@
+# experiment_table.py
+
+import heapq
+import math
+import sys
+from array import array
+from collections.abc import Sequence
+
+DEFAULT_FAMILY = "random_forest"
+
+
+def _param_key(params: dict) -> tuple:
+    # Hashable identity of a params dict (values may be unhashable or floats like nan)
+    return tuple(sorted((key, repr(value)) for key, value in params.items()))
+
+
+def _group_key(group):
+    return _param_key(group) if isinstance(group, dict) else group
+
+
+# Best-record indexes every ExperimentTable keeps: name -> group(record), the
+# group a record competes in (None: the record is not indexed). best_by(name, group)
+# then answers "best record of this group" without scanning the table.
+BEST_INDEXES = {}
+
+
+def register_best_index(name: str, group):
+    """Add (or replace) a best-record index; `group` returns a hashable or dict group, or None."""
+    BEST_INDEXES[name] = group
+
+
+# Complete (not pruned) cross-validated experiments, per CV scheme
+register_best_index("cv", lambda record: None if record.get("pruned") else record.get("cv"))
+# Experiments with a stored fitted model
+register_best_index("stored_model", lambda record: True if record.get("artifact") else None)
+
+
+class ExperimentTable(Sequence):
+    """
+    Experiment records of one session, stored for long search runs.
+
+    Behaves like the list it replaces (append, len, indexing, slicing, iteration),
+    but keeps what the agents query indexed as records arrive:
+      - scores in a float array, the best record and a bounded top-k heap, so
+        `best` / `top(n)` for n <= top_k do not scan the table
+      - the best record per group of each registered best index (`best_by`)
+      - rows per model family, per exact params, per fingerprint, and pruned rows
+      - per-family postings of (param, value) -> configurations, used by `neighbors`
+
+    Identical params dicts are interned: every record with the same params shares
+    one dict (treat record params as read-only), and field names and string
+    values are interned, so thousands of trials of a few configurations stay small.
+    """
+
+    def __init__(self, records=(), top_k: int = 256):
+        self.top_k = top_k
+        self._records = []
+        self._scores = array("d")
+        self._best_row = None
+        self._top = []                 # min-heap of (score, -row), the top_k best rows
+        self._configs = []             # config id -> interned params
+        self._config_ids = {}          # params key -> config id
+        self._config_rows = []         # config id -> rows
+        self._family_rows = {}         # family -> rows
+        self._postings = {}            # (family, param, repr(value)) -> config ids
+        self._best_by = {}             # index name -> {group key: best row}
+        self._fingerprint_rows = {}    # fingerprint -> latest row
+        self._pruned_rows = array("i")
+        self.extend(records)
+
+    # --- list behaviour ---------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+    def __repr__(self) -> str:
+        return f"ExperimentTable({len(self)} experiments, best_score={self.best_score})"
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def append(self, experiment: dict) -> dict:
+        """Add an experiment record, update the indexes and return the stored record."""
+        row = len(self._records)
+        record = {sys.intern(key): sys.intern(value) if isinstance(value, str) else value
+                  for key, value in experiment.items()}
+        config = self._intern_params(record.get("params") or {})
+        if "params" in record:
+            record["params"] = self._configs[config]
+        self._records.append(record)
+        self._config_rows[config].append(row)
+        family = self._configs[config].get("model", DEFAULT_FAMILY)
+        self._family_rows.setdefault(family, array("i")).append(row)
+        if record.get("fingerprint"):
+            self._fingerprint_rows[record["fingerprint"]] = row
+        if record.get("pruned"):
+            self._pruned_rows.append(row)
+
+        score = record.get("score")
+        score = float(score) if score is not None else math.nan
+        self._scores.append(score)
+        if math.isnan(score):
+            return record
+        if self._best_row is None or score > self._scores[self._best_row]:
+            self._best_row = row
+        for name, best_rows in self._best_by.items():
+            self._index_best(BEST_INDEXES[name], best_rows, row)
+        if len(self._top) < self.top_k:
+            heapq.heappush(self._top, (score, -row))
+        elif (score, -row) > self._top[0]:
+            heapq.heapreplace(self._top, (score, -row))
+        return record
+
+    def _intern_params(self, params: dict) -> int:
+        key = _param_key(params)
+        config = self._config_ids.get(key)
+        if config is None:
+            config = len(self._configs)
+            self._config_ids[key] = config
+            self._configs.append({sys.intern(name): value for name, value in params.items()})
+            self._config_rows.append(array("i"))
+            family = params.get("model", DEFAULT_FAMILY)
+            for name, value in key:
+                self._postings.setdefault((family, name, value), array("i")).append(config)
+        return config
+
+    def _index_best(self, group, best_rows: dict, row: int):
+        key = group(self._records[row])
+        if key is None:
+            return
+        key = _group_key(key)
+        best = best_rows.get(key)
+        if best is None or self._scores[row] > self._scores[best]:
+            best_rows[key] = row
+
+    # --- queries ----------------------------------------------------------
+
+    @property
+    def best_score(self) -> float | None:
+        return self._scores[self._best_row] if self._best_row is not None else None
+
+    @property
+    def best_row(self) -> int | None:
+        """Position of the best record."""
+        return self._best_row
+
+    @property
+    def scores(self) -> array:
+        """Scores in insertion order (nan where a record has none)."""
+        return self._scores
+
+    def best(self, where=None) -> dict | None:
+        """
+        Best-scoring record (the first one on ties), optionally among records matching
+        `where`. An ad-hoc filter with no match among the top_k records costs a pass
+        over the table; recurring filters belong in a best index (see best_by).
+        """
+        if where is None:
+            return self._records[self._best_row] if self._best_row is not None else None
+        for record in self.top(self.top_k):
+            if where(record):
+                return record
+        # No match among the top_k: one pass keeping the running max, testing `where`
+        # only on rows that would improve it
+        best_row = None
+        for row, score in enumerate(self._scores):
+            if math.isnan(score) or (best_row is not None and score <= self._scores[best_row]):
+                continue
+            if where(self._records[row]):
+                best_row = row
+        return self._records[best_row] if best_row is not None else None
+
+    def best_by(self, name: str, group=True) -> dict | None:
+        """
+        Best-scoring record (the first one on ties) of `group` in the best index `name`
+        (see register_best_index). The index is built on first use, then kept up to
+        date as records are appended.
+        """
+        best_rows = self._best_by.get(name)
+        if best_rows is None:
+            best_rows = self._best_by[name] = {}
+            for row, score in enumerate(self._scores):
+                if not math.isnan(score):
+                    self._index_best(BEST_INDEXES[name], best_rows, row)
+        row = best_rows.get(_group_key(group))
+        return self._records[row] if row is not None else None
+
+    def top_rows(self, n: int = 10) -> list:
+        """Row positions of the n best records, best first; served from the heap when n <= top_k."""
+        if n <= len(self._top) or len(self._top) == len(self):
+            return [-neg_row for _, neg_row in heapq.nlargest(n, self._top)]
+        return heapq.nsmallest(n, (row for row in range(len(self)) if not math.isnan(self._scores[row])),
+                               key=lambda row: (-self._scores[row], row))
+
+    def top(self, n: int = 10) -> list:
+        """The n best records, best first."""
+        return [self._records[row] for row in self.top_rows(n)]
+
+    def last(self, where=None) -> dict | None:
+        """Most recent record, optionally the most recent matching `where`."""
+        for record in reversed(self._records):
+            if where is None or where(record):
+                return record
+        return None
+
+    def families(self) -> set:
+        """Model families with at least one record."""
+        return set(self._family_rows)
+
+    def by_family(self, family: str) -> list:
+        """Records of one model family, in insertion order."""
+        return [self._records[row] for row in self._family_rows.get(family, ())]
+
+    def find(self, params: dict) -> list:
+        """Records trained with exactly these params."""
+        config = self._config_ids.get(_param_key(params))
+        return [] if config is None else [self._records[row] for row in self._config_rows[config]]
+
+    def by_fingerprint(self, fingerprint: str) -> dict | None:
+        """Latest record with this experiment fingerprint."""
+        row = self._fingerprint_rows.get(fingerprint)
+        return self._records[row] if row is not None else None
+
+    def pruned(self) -> list:
+        """Records of experiments stopped early by cross-validation pruning."""
+        return [self._records[row] for row in self._pruned_rows]
+
+    def neighbors(self, experiment: dict | None = None, limit: int | None = None) -> list:
+        """
+        Records of the same family whose params differ from `experiment`'s (default:
+        the best record) in exactly one param, best first.
+
+        A neighbour shares all but one (param, value) pair, so it appears in at
+        least one of any two postings of the experiment; only the two shortest
+        postings are read instead of scanning the table.
+        """
+        experiment = experiment if experiment is not None else self.best()
+        if experiment is None:
+            return []
+        params = experiment.get("params") or {}
+        key = _param_key(params)
+        family = params.get("model", DEFAULT_FAMILY)
+        postings = sorted((self._postings.get((family, name, value), ()) for name, value in key), key=len)
+        candidates = set(postings[0]) | set(postings[1]) if len(postings) > 1 else set(range(len(self._configs)))
+
+        own = dict(key)
+        rows = []
+        for config in candidates:
+            other = self._configs[config]
+            if other.get("model", DEFAULT_FAMILY) != family or len(other) != len(own):
+                continue
+            other_key = dict(_param_key(other))
+            if other_key.keys() == own.keys() and sum(other_key[name] != own[name] for name in own) == 1:
+                rows.extend(self._config_rows[config])
+        rows.sort(key=lambda row: -self._scores[row] if not math.isnan(self._scores[row]) else math.inf)
+        return [self._records[row] for row in rows[:limit]]
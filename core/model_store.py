@@ -0,0 +1,96 @@
+# model_store.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import joblib
+
+
+class _HashingWriter:
+    """Binary file wrapper that hashes everything written through it."""
+
+    def __init__(self, f):
+        self._f = f
+        self.digest = hashlib.sha1()
+
+    def write(self, data) -> int:
+        self.digest.update(data)
+        return self._f.write(data)
+
+    def flush(self):
+        self._f.flush()
+
+
+class ModelStore:
+    """
+    Content-addressed store for fitted estimators.
+
+    Each model is saved once under <root>/<hash>.joblib, where the hash covers
+    the saved file's bytes, so identical models share one file. Models are
+    zlib-compressed joblib files; memory-mapping would not help here, since
+    sklearn trees copy their node arrays when unpickled. Recently loaded models
+    are kept in a small in-process LRU.
+    """
+
+    def __init__(self, root: str = os.path.join(".artifacts", "models"), compress: int = 3,
+                 max_loaded: int = 4):
+        self.root = root
+        self.compress = compress
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path_for(self, artifact_id: str) -> str:
+        return os.path.join(self.root, f"{artifact_id}.joblib")
+
+    def save(self, model) -> dict:
+        """
+        Store `model` (if not already stored) and return its pointer:
+        {"artifact_id", "path", "bytes", "created_at"}.
+        The model is serialized once, into a temporary file in the store that is
+        hashed while it is written and then renamed to its content address.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = os.path.join(self.root, f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                writer = _HashingWriter(f)
+                joblib.dump(model, writer, compress=("zlib", self.compress))
+            artifact_id = writer.digest.hexdigest()
+            path = self.path_for(artifact_id)
+            if not os.path.exists(path):
+                # Atomic publish: concurrent writers of the same content race harmlessly
+                os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return {
+            "artifact_id": artifact_id,
+            "path": os.path.abspath(path),
+            "bytes": os.path.getsize(path),
+            "created_at": time.time(),
+        }
+
+    def load(self, pointer):
+        """Load a model from its pointer (or artifact id)."""
+        if isinstance(pointer, str):
+            pointer = {"artifact_id": pointer, "path": self.path_for(pointer)}
+        artifact_id = pointer["artifact_id"]
+        with self._lock:
+            if artifact_id in self._loaded:
+                self._loaded.move_to_end(artifact_id)
+                return self._loaded[artifact_id]
+
+        path = pointer.get("path") or self.path_for(artifact_id)
+        if not os.path.exists(path):
+            path = self.path_for(artifact_id)
+        model = joblib.load(path)
+
+        with self._lock:
+            self._loaded[artifact_id] = model
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+        return model
@@ -1,101 +1,269 @@
-# orchestrator.py
+# orchestrator.py - run from the project root with `python -m core.cli run ...`
 
 import os
-import sys
-
-# Allow imports when running this file directly
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from core.session_service import SessionService
+from core.sqlite_session_service import SQLiteSessionService
+from core.checkpoints import PipelineCheckpoints, EDA_REPORT_FIELDS, dataset_identity
 from tools.logging_tools import setup_logger, log_event
-from agents.intake_agent import IntakeAgent
-from agents.eda_agent import EDAAgent
-from agents.model_agent import ModelAgent
-from agents.planner_agent import PlannerAgent
-from agents.report_agent import ReportAgent
+from tools.profiling_tools import track_stage, export_jsonl, export_chrome_trace
 
 
 def run_pipeline(
     dataset_path: str,
     target_col: str,
     session_id: str = "run1",
-    n_planned_runs: int = 1
+    n_planned_runs: int = 1,
+    session_service: SessionService | None = None,
+    n_workers: int = 1,
+    search: str | None = None,
+    search_budget_seconds: float | None = None,
+    cv_folds: int | None = None,
+    db_path: str | None = None,
+    metrics_path: str | None = None,
+    trace_path: str | None = None,
+    output_path: str | None = None,
+    resume: bool = False,
+    progressive: bool = False,
+    importance: bool = True,
+    artifact_dir: str | None = None
 ):
     """
     Full pipeline:
-    Intake -> EDA -> Baseline Model -> Planner -> Extra Models -> Report
+    Intake -> EDA -> Features -> Baseline Model -> Importance -> Planner -> Extra Models -> Report
+
+    session_service: optional existing store; passing one in lets several
+    pipelines share its dataset cache.
+    n_workers: number of processes used to run planned experiments concurrently
+    (1 keeps the sequential loop).
+    search: "halving" or "hyperband" to replace the fixed planner suggestions with a
+    budgeted search; its top n_planned_runs configurations are then fully trained.
+    search_budget_seconds: optional wall-clock budget for the search.
+    cv_folds: score the baseline and planned experiments by k-fold cross-validation
+    (mean±std) instead of the single validation split; n_workers then trains folds in
+    parallel and planned experiments that are clearly worse than the best are pruned.
+    db_path: SQLite file for a durable session store; repeated experiments on the
+    same dataset/target/params then reuse their stored score.
+    metrics_path / trace_path: optional exports of the per-stage timing and memory
+    records as JSON lines / Chrome trace.
+    output_path: where to write the markdown report (default: report.md in the project root).
+    Next to it, <name>.experiments.md/.jsonl are appended as each experiment lands, and
+    <name>.json (plus <name>.experiments.parquet with pyarrow) hold the structured report.
+    progressive: train each planned experiment on subsamples first and only fit it
+    on the full training split when its projected score could beat the best so far
+    (ignored with cv_folds, which prunes folds instead).
+    importance: compute permutation importance of the baseline's best stored model
+    (reported, and used by the planner to suggest dropping useless columns).
+    artifact_dir: directory for the Feather copy of the dataset, stored models and
+    checkpoints (default: .artifacts in the project root).
+    resume: continue an interrupted run of session_id from its last completed stage.
+    Each stage is checkpointed when it finishes (stage markers in the session, plus
+    the encoded features on disk when the store is durable), so completed stages and
+    already-recorded planned experiments are skipped; the report is always rebuilt.
+    Resuming in a new process needs a durable session store (db_path). If the dataset
+    file or target changed since the checkpoint, the run starts fresh.
+
+    Returns a dict with status, session_id, best_score and report_path
+    (or the failing stage and message when a stage fails).
     """
 
+    # Agents pull in pandas and sklearn: imported on first run, not with this module
+    from agents.intake_agent import IntakeAgent
+    from agents.eda_agent import EDAAgent
+    from agents.feature_agent import FeatureAgent
+    from agents.model_agent import ModelAgent
+    from agents.importance_agent import ImportanceAgent
+    from agents.planner_agent import PlannerAgent
+    from agents.report_agent import ReportAgent
+    from core.report_writer import ReportWriter
+    from tools.eda_tools import LazySummary
+
     logger = setup_logger("Orchestrator")
     log_event(logger, "Orchestrator", "Starting pipeline")
 
-    # 1. Create session + agents
-    session_service = SessionService()
-    session_service.create_session(session_id)
+    # 1. Create (or reopen) session + agents
+    if session_service is None:
+        session_service = SQLiteSessionService(db_path) if db_path else SessionService()
+    if artifact_dir is None:
+        artifact_dir = os.path.join(os.path.dirname(__file__), "..", ".artifacts")
+    artifact_dir = os.path.abspath(artifact_dir)
+    checkpoints = PipelineCheckpoints(session_service, session_id, os.path.join(artifact_dir, "checkpoints"))
 
-    intake = IntakeAgent(session_service)
+    identity = dataset_identity(dataset_path, target_col)
+    intake_checkpoint = checkpoints.get("intake") if resume else None
+    resuming = intake_checkpoint is not None and all(
+        intake_checkpoint.get(key) == value for key, value in identity.items()
+    )
+    if resuming:
+        log_event(logger, "Orchestrator", f"Resuming session '{session_id}' from its checkpoints")
+    else:
+        if resume:
+            log_event(logger, "Orchestrator",
+                      f"No valid checkpoints for session '{session_id}', starting fresh", "WARNING")
+        session_service.create_session(session_id)
+
+    intake = IntakeAgent(session_service, artifact_dir=artifact_dir)
     eda = EDAAgent(session_service)
-    model_agent = ModelAgent(session_service)
+    feature_agent = FeatureAgent(session_service)
+    model_agent = ModelAgent(session_service, artifact_dir=artifact_dir)
+    importance_agent = ImportanceAgent(session_service, artifact_dir=artifact_dir)
     planner = PlannerAgent(session_service)
     report_agent = ReportAgent(session_service)
 
-    # 2. Intake
-    intake_result = intake.run(session_id, dataset_path, target_col)
-    if intake_result["status"] != "success":
-        log_event(logger, "Orchestrator", f"Intake failed: {intake_result}", "ERROR")
-        return
-
-    # 3. EDA
-    eda_result = eda.run(session_id)
-    if eda_result["status"] != "success":
-        log_event(logger, "Orchestrator", f"EDA failed: {eda_result}", "ERROR")
-        return
-
-    # 4. Baseline model
-    baseline_result = model_agent.run(session_id)
-    if baseline_result["status"] != "success":
-        log_event(logger, "Orchestrator", f"Model training failed: {baseline_result}", "ERROR")
-        return
-
-    # 5. Planner – suggest next experiments
-    plan_result = planner.run(session_id)
-    if plan_result["status"] == "success":
-        suggestions = plan_result["suggestions"]
-        log_event(
-            logger,
-            "Orchestrator",
-            f"Planner suggested {len(suggestions)} experiments"
-        )
-
-        # Run a few extra experiments (loop agent behavior)
-        for i, suggestion in enumerate(suggestions[:n_planned_runs], start=1):
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), "..", "report.md")
+    output_path = os.path.abspath(output_path)
+    report_writer = ReportWriter(session_service, session_id, output_path, report_agent)
+
+    try:
+        # 2. Intake
+        if not checkpoints.done("intake"):
+            with track_stage(session_service, session_id, "intake") as record:
+                intake_result = intake.run(session_id, dataset_path, target_col)
+                record["rows"] = intake_result.get("rows")
+            if intake_result["status"] != "success":
+                log_event(logger, "Orchestrator", f"Intake failed: {intake_result}", "ERROR")
+                return {"status": "error", "session_id": session_id, "stage": "intake",
+                        "message": intake_result.get("message")}
+            checkpoints.mark("intake", **identity)
+
+        # 3. EDA
+        if not checkpoints.done("eda"):
+            with track_stage(session_service, session_id, "eda") as record:
+                eda_result = eda.run(session_id)
+                if eda_result["status"] == "success":
+                    record["rows"] = eda_result["summary"]["shape"][0]
+            if eda_result["status"] != "success":
+                log_event(logger, "Orchestrator", f"EDA failed: {eda_result}", "ERROR")
+                return {"status": "error", "session_id": session_id, "stage": "eda",
+                        "message": eda_result.get("message")}
+            # Compute the fields the report needs so they are stored with the checkpoint
+            if isinstance(eda_result["summary"], LazySummary):
+                eda_result["summary"].materialize(EDA_REPORT_FIELDS)
+            checkpoints.mark("eda")
+
+        # 4. Feature preparation (encoded once, reused by every experiment)
+        features_checkpoint = checkpoints.get("features")
+        if features_checkpoint is not None and session_service.get_session(session_id).get("features") is None:
+            if features_checkpoint.get("path"):
+                with track_stage(session_service, session_id, "features.restore"):
+                    features = checkpoints.load_features(features_checkpoint["path"])
+                session_service.update_session(session_id, "features", features)
+            else:
+                features_checkpoint = None  # not written to disk: encode again
+        if features_checkpoint is None:
+            with track_stage(session_service, session_id, "features"):
+                feature_result = feature_agent.run(session_id)
+            if feature_result["status"] != "success":
+                log_event(logger, "Orchestrator", f"Feature preparation failed: {feature_result}", "ERROR")
+                return {"status": "error", "session_id": session_id, "stage": "features",
+                        "message": feature_result.get("message")}
+            # Only a durable store can resume in another process, so only then is the
+            # encoded matrix worth writing to disk
+            if session_service.persistent:
+                with track_stage(session_service, session_id, "features.checkpoint"):
+                    features_path = checkpoints.save_features(session_service.get_session(session_id)["features"])
+                checkpoints.mark("features", path=features_path)
+            else:
+                checkpoints.mark("features")
+
+        # 5. Baseline model
+        if not checkpoints.done("baseline_model"):
+            with track_stage(session_service, session_id, "baseline_model"):
+                baseline_result = model_agent.run(session_id, cv=cv_folds, n_workers=n_workers)
+            if baseline_result["status"] != "success":
+                log_event(logger, "Orchestrator", f"Model training failed: {baseline_result}", "ERROR")
+                return {"status": "error", "session_id": session_id, "stage": "baseline_model",
+                        "message": baseline_result.get("message")}
+            checkpoints.mark("baseline_model")
+
+        # 6. Feature importance of the best model (not fatal: CV-only sessions store no model)
+        if importance and not checkpoints.done("importance"):
+            with track_stage(session_service, session_id, "importance"):
+                importance_result = importance_agent.run(session_id, n_workers=n_workers)
+            if importance_result["status"] != "success":
+                log_event(logger, "Orchestrator",
+                          f"Feature importance skipped: {importance_result.get('message')}", "WARNING")
+            checkpoints.mark("importance")
+
+        # 7. Planner – suggest next experiments (kept in the checkpoint, so a
+        # resumed run finishes the same plan instead of re-planning)
+        planner_checkpoint = checkpoints.get("planner")
+        if planner_checkpoint is not None:
+            plan_result = {"status": "success", "suggestions": planner_checkpoint["suggestions"]}
+        else:
+            with track_stage(session_service, session_id, "planner"):
+                if search:
+                    plan_result = planner.search(session_id, model_agent, method=search,
+                                                 wall_seconds=search_budget_seconds,
+                                                 n_suggestions=n_planned_runs)
+                else:
+                    plan_result = planner.run(session_id, n_suggestions=n_planned_runs)
+            if plan_result["status"] == "success":
+                checkpoints.mark("planner", suggestions=plan_result["suggestions"])
+        if plan_result["status"] == "success" and not checkpoints.done("planned_experiments"):
+            suggestions = plan_result["suggestions"]
             log_event(
                 logger,
                 "Orchestrator",
-                f"Running planned experiment {i}: {suggestion['description']}"
+                f"Planner suggested {len(suggestions)} experiments"
             )
-            model_agent.run(session_id, model_params=suggestion["model_params"])
-
-    # 6. Final report
-    report_result = report_agent.run(session_id)
-    if report_result["status"] != "success":
-        log_event(logger, "Orchestrator", f"Report failed: {report_result}", "ERROR")
-        return
 
-    report_text = report_result["report"]
+            # Run a few extra experiments (loop agent behavior); after an interruption
+            # only the ones without a recorded result are left
+            planned = suggestions[:n_planned_runs]
+            if resuming:
+                planned = [suggestion for suggestion in planned
+                           if not model_agent.experiment_done(session_id, suggestion["model_params"], cv=cv_folds)]
+                log_event(logger, "Orchestrator", f"{len(planned)} planned experiments left to run")
+            with track_stage(session_service, session_id, "planned_experiments"):
+                if n_workers > 1 or cv_folds:
+                    for suggestion in planned:
+                        log_event(logger, "Orchestrator",
+                                  f"Queueing planned experiment: {suggestion['description']}")
+                    model_agent.run_many(
+                        session_id,
+                        [suggestion["model_params"] for suggestion in planned],
+                        n_workers=n_workers,
+                        cv=cv_folds,
+                        progressive=progressive
+                    )
+                else:
+                    for i, suggestion in enumerate(planned, start=1):
+                        log_event(
+                            logger,
+                            "Orchestrator",
+                            f"Running planned experiment {i}: {suggestion['description']}"
+                        )
+                        model_agent.run(session_id, model_params=suggestion["model_params"],
+                                        progressive=progressive)
+            checkpoints.mark("planned_experiments")
 
-    # Save report to file
-    output_path = os.path.join(os.path.dirname(__file__), "..", "report.md")
-    output_path = os.path.abspath(output_path)
+        # 8. Final report (the experiment log next to it was appended as experiments landed)
+        report_result = report_writer.write()
+        if report_result["status"] != "success":
+            log_event(logger, "Orchestrator", f"Report failed: {report_result}", "ERROR")
+            return {"status": "error", "session_id": session_id, "stage": "report",
+                    "message": report_result.get("message")}
+    finally:
+        report_writer.close()
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(report_text)
+    perf_records = session_service.get_session(session_id).get("perf", [])
+    if metrics_path:
+        export_jsonl(perf_records, metrics_path)
+    if trace_path:
+        export_chrome_trace(perf_records, trace_path)
 
+    log_event(logger, "Orchestrator", f"Dataset cache: {session_service.dataset_cache.stats()}")
     log_event(logger, "Orchestrator", f"Pipeline completed. Report saved to {output_path}")
     print("\n=== PIPELINE COMPLETED ===")
     print(f"Report saved to: {output_path}")
 
+    return {
+        "status": "success",
+        "session_id": session_id,
+        "best_score": session_service.get_session(session_id)["best_score"],
+        "report_path": output_path,
+        "json_report_path": report_result["json_path"]
+    }
 
-if __name__ == "__main__":
-    # Default demo run using Bank_customer_churn.csv
-    run_pipeline(dataset_path="Bank_Customer_Churn.csv", target_col="churn", session_id="bank_run",n_planned_runs=2)
@@ -0,0 +1,109 @@
+# report_writer.py
+
+import json
+import os
+import threading
+
+from core.session_service import SessionService
+from core.serialization import to_jsonable
+from agents.report_agent import ReportAgent, render_experiment
+
+
+def _replace_text(path: str, text: str):
+    # Readers (dashboards, editors) never see a half-written file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class ReportWriter:
+    """
+    Writes a session's report files while the pipeline runs.
+
+    Next to the markdown report <name>.md:
+      - <name>.experiments.md / <name>.experiments.jsonl: append-only experiment
+        log, one block / JSON line written as each experiment is added
+      - <name>.json: structured report (see ReportAgent.structured)
+      - <name>.experiments.parquet: one row per experiment, when pyarrow is installed
+    `write` refreshes the markdown and structured reports; `close` stops listening
+    and drops the report agent's rendered blocks for the session.
+    """
+
+    def __init__(self, session_service: SessionService, session_id: str, output_path: str,
+                 report_agent: ReportAgent | None = None):
+        self.session_service = session_service
+        self.session_id = session_id
+        self.report_agent = report_agent or ReportAgent(session_service)
+        self.output_path = os.path.abspath(output_path)
+        stem = os.path.splitext(self.output_path)[0]
+        self.log_path = stem + ".experiments.md"
+        self.jsonl_path = stem + ".experiments.jsonl"
+        self.json_path = stem + ".json"
+        self.parquet_path = stem + ".experiments.parquet"
+        self._lock = threading.Lock()
+        self._logged = 0
+
+        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+        # Start the log over from the session's current experiments (a resumed run has some)
+        session = session_service.get_session(session_id) or {}
+        with open(self.log_path, "w", encoding="utf-8") as f:
+            f.write(f"# Experiments of session `{session_id}`\n")
+        open(self.jsonl_path, "w", encoding="utf-8").close()
+        for record in list(session.get("experiments", [])):
+            self._append(record)
+        session_service.add_experiment_listener(self._on_experiment)
+
+    def _on_experiment(self, session_id: str, record: dict):
+        if session_id == self.session_id:
+            self._append(record)
+
+    def _append(self, record: dict):
+        with self._lock:
+            self._logged += 1
+            block = "\n".join(render_experiment(self._logged, record))
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(f"\n{block}\n")
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(to_jsonable({"number": self._logged, **record})) + "\n")
+
+    def write(self) -> dict:
+        """Render the markdown and structured reports; returns ReportAgent's result for the markdown."""
+        result = self.report_agent.run(self.session_id)
+        if result["status"] != "success":
+            return result
+        _replace_text(self.output_path, result["report"])
+
+        structured = self.report_agent.structured(self.session_id)
+        if structured["status"] == "success":
+            _replace_text(self.json_path, json.dumps(structured["report"], indent=2))
+            self._write_parquet(structured["report"]["experiments"])
+        return {**result, "report_path": self.output_path, "json_path": self.json_path}
+
+    def _write_parquet(self, experiments: list) -> str | None:
+        """One row per experiment with the main fields and params as a JSON string; None without pyarrow."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            return None
+
+        columns = {
+            "number": [exp["number"] for exp in experiments],
+            "model_name": [exp.get("model_name") for exp in experiments],
+            "family": [exp["params"].get("model", "random_forest") for exp in experiments],
+            "score": [exp.get("score") for exp in experiments],
+            "score_std": [exp.get("score_std") for exp in experiments],
+            "pruned": [bool(exp.get("pruned", False)) for exp in experiments],
+            "memoized": [bool(exp.get("memoized", False)) for exp in experiments],
+            "fingerprint": [exp.get("fingerprint") for exp in experiments],
+            "params": [json.dumps(exp["params"], sort_keys=True) for exp in experiments],
+        }
+        tmp_path = self.parquet_path + ".tmp"
+        pq.write_table(pa.table(columns), tmp_path)
+        os.replace(tmp_path, self.parquet_path)
+        return self.parquet_path
+
+    def close(self):
+        self.session_service.remove_experiment_listener(self._on_experiment)
+        self.report_agent.forget(self.session_id)
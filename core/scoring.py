@@ -0,0 +1,305 @@
+# scoring.py - batch and online prediction with a session's best model
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from core.model_store import ModelStore
+from core.session_service import SessionService
+from agents.model_agent import ModelAgent
+from tools.logging_tools import setup_logger, log_event, log_error
+from tools.model_registry import as_model_input
+
+# Scorer loaded once per worker process
+_WORKER_SCORER = {}
+
+
+class Scorer:
+    """
+    Best model of a session plus the feature encoder it was trained with.
+    `predict` encodes raw rows exactly as in training and returns a frame with a
+    `prediction` column (and `probability` of the predicted class for classifiers).
+    """
+
+    def __init__(self, model, encoder, task_type: str, target: str | None = None,
+                 experiment: dict | None = None, store_root: str | None = None):
+        self.model = model
+        self.encoder = encoder
+        self.task_type = task_type
+        self.target = target
+        self.experiment = experiment or {}
+        self.store_root = store_root
+
+    @classmethod
+    def from_session(cls, session_service: SessionService, session_id: str, artifact_dir: str = ".artifacts"):
+        model_agent = ModelAgent(session_service, artifact_dir=artifact_dir)
+        model, experiment = model_agent.load_best_model(session_id)
+        if not experiment.get("encoder_artifact"):
+            raise ValueError(f"Best experiment of session '{session_id}' has no stored feature encoder")
+        encoder = model_agent.model_store.load(experiment["encoder_artifact"])
+        session = session_service.get_session(session_id)
+        return cls(model, encoder, session["task_type"], session.get("target"), experiment,
+                   model_agent.model_store.root)
+
+    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+        X = as_model_input(self.model, self.encoder.transform(df))
+        out = pd.DataFrame({"prediction": self.model.predict(X)}, index=df.index)
+        if self.task_type == "classification" and hasattr(self.model, "predict_proba"):
+            out["probability"] = self.model.predict_proba(X).max(axis=1)
+        return out
+
+
+def _score_chunk(scorer: Scorer, chunk: pd.DataFrame, id_columns: list) -> pd.DataFrame:
+    predictions = scorer.predict(chunk)
+    if id_columns:
+        predictions = pd.concat([chunk[id_columns], predictions], axis=1)
+    return predictions
+
+
+def _init_scoring_worker(store_root: str, model_pointer: dict, encoder_pointer: dict,
+                         task_type: str, target: str | None):
+    """Process-pool initializer: load the model and encoder from the artifact store once."""
+    store = ModelStore(store_root)
+    _WORKER_SCORER["scorer"] = Scorer(store.load(model_pointer), store.load(encoder_pointer),
+                                      task_type, target)
+
+
+def _score_chunk_in_worker(chunk: pd.DataFrame, id_columns: list) -> pd.DataFrame:
+    return _score_chunk(_WORKER_SCORER["scorer"], chunk, id_columns)
+
+
+def score_csv(
+    session_service: SessionService,
+    session_id: str,
+    input_path: str,
+    output_path: str,
+    chunksize: int = 100_000,
+    n_workers: int = 1,
+    id_columns: list | None = None,
+    artifact_dir: str = ".artifacts"
+) -> dict:
+    """
+    Score a (large) CSV with the session's best model and write a predictions CSV.
+
+    The input is streamed in chunks of `chunksize` rows, so memory stays bounded
+    by a few chunks. With n_workers > 1 chunks are predicted in a process pool
+    (each worker loads the model from the artifact store once) with at most two
+    chunks per worker in flight; results are appended in input order.
+    id_columns: input columns copied next to the predictions (e.g. customer_id).
+    The output is written to a temporary file and moved into place at the end.
+    Returns a dict with status, rows, seconds and rows_per_minute.
+    """
+    logger = setup_logger("Scoring")
+    try:
+        scorer = Scorer.from_session(session_service, session_id, artifact_dir=artifact_dir)
+        session = session_service.get_session(session_id)
+        id_columns = list(id_columns or [])
+
+        # Category columns from intake parse straight into categoricals; numeric
+        # columns are left to inference so a stray missing value cannot fail a chunk
+        dtypes = {col: dtype for col, dtype in (session.get("dtypes") or {}).items()
+                  if dtype == "category" and col != scorer.target}
+        reader = pd.read_csv(input_path, chunksize=chunksize, dtype=dtypes)
+
+        log_event(logger, "Scoring", f"Scoring {input_path} with experiment "
+                                     f"{scorer.experiment.get('fingerprint', '?')[:12]} "
+                                     f"(score={scorer.experiment.get('score')}) on {n_workers} workers")
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        tmp_path = output_path + ".tmp"
+        rows = 0
+        start = time.perf_counter()
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            def write(predictions: pd.DataFrame):
+                nonlocal rows
+                predictions.to_csv(f, header=(rows == 0), index=False)
+                rows += len(predictions)
+
+            if n_workers <= 1:
+                for chunk in reader:
+                    write(_score_chunk(scorer, chunk, id_columns))
+            else:
+                initargs = (scorer.store_root, scorer.experiment["artifact"],
+                            scorer.experiment["encoder_artifact"], scorer.task_type, scorer.target)
+                with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_scoring_worker,
+                                         initargs=initargs) as pool:
+                    pending = deque()
+                    for chunk in reader:
+                        pending.append(pool.submit(_score_chunk_in_worker, chunk, id_columns))
+                        if len(pending) >= 2 * n_workers:
+                            write(pending.popleft().result())
+                    while pending:
+                        write(pending.popleft().result())
+        os.replace(tmp_path, output_path)
+
+        seconds = time.perf_counter() - start
+        rows_per_minute = rows / seconds * 60 if seconds > 0 else None
+        log_event(logger, "Scoring", f"Scored {rows} rows in {seconds:.2f}s "
+                                     f"({rows_per_minute or 0:,.0f} rows/min) -> {output_path}")
+        return {"status": "success", "rows": rows, "seconds": seconds,
+                "rows_per_minute": rows_per_minute, "output_path": output_path}
+
+    except Exception as e:
+        log_error(logger, "Scoring", str(e))
+        return {"status": "error", "message": str(e)}
+
+
+class MicroBatcher:
+    """
+    Collects concurrent prediction requests into one vectorized predict call.
+    A batch is flushed when it reaches `max_batch_rows` rows or `max_wait_ms`
+    after its first request arrived. When a batch fails, its requests are
+    retried one by one, so only the malformed ones get the error.
+    """
+
+    def __init__(self, scorer: Scorer, max_batch_rows: int = 1024, max_wait_ms: float = 5.0):
+        self.scorer = scorer
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, records: list) -> list:
+        """Predict a list of row dicts; blocks until its batch has been scored."""
+        item = {"records": records, "done": threading.Event(), "result": None, "error": None}
+        self._queue.put(item)
+        item["done"].wait()
+        if item["error"] is not None:
+            raise item["error"]
+        return item["result"]
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch, n_rows = [item], len(item["records"])
+            deadline = time.monotonic() + self.max_wait
+            while n_rows < self.max_batch_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                n_rows += len(item["records"])
+            self._predict(batch)
+
+    def _predict(self, batch: list):
+        try:
+            self._predict_items(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0]["error"] = e
+            else:
+                # One malformed request must not fail its batch-mates: score each on its own
+                for item in batch:
+                    try:
+                        self._predict_items([item])
+                    except Exception as item_error:
+                        item["error"] = item_error
+        finally:
+            for item in batch:
+                item["done"].set()
+
+    def _predict_items(self, items: list):
+        frame = pd.DataFrame([record for item in items for record in item["records"]])
+        predictions = self.scorer.predict(frame).to_dict("records")
+        position = 0
+        for item in items:
+            item["result"] = predictions[position:position + len(item["records"])]
+            position += len(item["records"])
+
+
+class _PredictionServer(ThreadingHTTPServer):
+    # Bursts of concurrent clients are the point of micro-batching; the default backlog is 5
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def _json_default(value):
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def make_server(scorer: Scorer, host: str = "127.0.0.1", port: int = 8000,
+                max_batch_rows: int = 1024, max_wait_ms: float = 5.0) -> ThreadingHTTPServer:
+    """
+    Local HTTP prediction server (a stand-in for a real model service).
+
+    POST /predict with a JSON row object, a list of rows or {"rows": [...]};
+    the response is {"status": "success", "predictions": [...]}. Requests
+    handled concurrently are micro-batched into shared predict calls.
+    GET /health returns the served experiment.
+    """
+    batcher = MicroBatcher(scorer, max_batch_rows=max_batch_rows, max_wait_ms=max_wait_ms)
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: dict):
+            body = json.dumps(payload, default=_json_default).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._send(404, {"status": "error", "message": "not found"})
+                return
+            self._send(200, {"status": "ok", "model_name": scorer.experiment.get("model_name"),
+                             "score": scorer.experiment.get("score")})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send(404, {"status": "error", "message": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"[]")
+                records = payload.get("rows", [payload]) if isinstance(payload, dict) else payload
+                predictions = batcher.submit(records)
+            except Exception as e:
+                self._send(400, {"status": "error", "message": str(e)})
+                return
+            self._send(200, {"status": "success", "predictions": predictions})
+
+        def log_message(self, format, *args):
+            pass  # request logs would dominate the output under load
+
+    server = _PredictionServer((host, port), PredictionHandler)
+    server.batcher = batcher
+    return server
+
+
+def serve(session_service: SessionService, session_id: str, host: str = "127.0.0.1", port: int = 8000,
+          artifact_dir: str = ".artifacts", max_batch_rows: int = 1024, max_wait_ms: float = 5.0):
+    """Serve the session's best model over HTTP until interrupted."""
+    logger = setup_logger("Scoring")
+    scorer = Scorer.from_session(session_service, session_id, artifact_dir=artifact_dir)
+    server = make_server(scorer, host, port, max_batch_rows=max_batch_rows, max_wait_ms=max_wait_ms)
+    log_event(logger, "Scoring", f"Serving session '{session_id}' on http://{host}:{server.server_port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.batcher.close()
+        server.server_close()
@@ -0,0 +1,25 @@
+# serialization.py - session values to plain JSON types (stores, reports)
+
+
+def to_jsonable(value):
+    """
+    Convert session values (numpy scalars, tuples, non-string dict keys) into
+    plain JSON types. Raises TypeError for objects that cannot be stored.
+    A LazySummary contributes only the fields computed so far; the session row
+    is rewritten on every update_session, so later reads are picked up by later saves.
+    """
+    if hasattr(value, "materialized"):  # tools.eda_tools.LazySummary (not imported: it needs pandas)
+        value = value.materialized()
+    if isinstance(value, dict):
+        return {k if isinstance(k, str) else str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if value is None or type(value) in (str, int, float, bool):
+        return value
+    # numpy is only needed once a non-builtin value shows up (then it is already loaded)
+    import numpy as np
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot persist value of type {type(value).__name__}")
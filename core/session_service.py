@@ -1,21 +1,44 @@
 
+import threading
+
+from core.dataset_cache import DatasetCache
+from core.experiment_table import ExperimentTable
+from tools.logging_tools import setup_logger, log_error
+
+
 class SessionService:
     """
     Simple in-memory session store.
     Demonstrates 'Sessions & Memory' required for Kaggle Agents submission.
+
+    Also owns a DatasetCache shared by every session, so a dataset is
+    parsed once per pipeline instead of once per agent.
     """
 
-    def __init__(self):
+    # Sessions do not outlive the process (see SQLiteSessionService)
+    persistent = False
+
+    def __init__(self, dataset_cache: DatasetCache | None = None,
+                 cache_max_bytes: int = 2 * 1024 ** 3):
         self.sessions = {}
+        # fingerprint -> experiment, for memoizing repeated experiments
+        self.results = {}
+        # Guards writes so concurrent agents/experiments can update safely
+        self._lock = threading.RLock()
+        self.dataset_cache = dataset_cache or DatasetCache(max_bytes=cache_max_bytes)
+        # Called as callback(session_id, record) after each add_experiment (e.g. live reports)
+        self._experiment_listeners = []
 
     def create_session(self, session_id: str):
         """Create a new session with default fields."""
         self.sessions[session_id] = {
             "dataset_path": None,
+            "data_path": None,
             "target": None,
             "task_type": None,
-            "experiments": [],
-            "best_score": None
+            "experiments": ExperimentTable(),
+            "best_score": None,
+            "perf": []
         }
         return self.sessions[session_id]
 
@@ -25,17 +48,65 @@ class SessionService:
 
     def update_session(self, session_id: str, key: str, value):
         """Update any field in the session."""
-        if session_id in self.sessions:
-            self.sessions[session_id][key] = value
+        with self._lock:
+            if session_id in self.sessions:
+                self.sessions[session_id][key] = value
 
     def add_experiment(self, session_id: str, experiment: dict):
-        """Add model experiment details."""
-        if session_id in self.sessions:
-            self.sessions[session_id]["experiments"].append(experiment)
+        """Add model experiment details, then notify the experiment listeners."""
+        with self._lock:
+            record = self._append_experiment(session_id, experiment)
+        if record is not None:
+            self._notify_experiment(session_id, record)
+
+    def _append_experiment(self, session_id: str, experiment: dict) -> dict | None:
+        # Caller holds the lock; returns the stored record (None: unknown session)
+        if session_id not in self.sessions:
+            return None
+        experiments = self.sessions[session_id]["experiments"]
+        record = experiments.append(experiment)
+
+        # best score is tracked by the experiment table as records arrive
+        self.sessions[session_id]["best_score"] = experiments.best_score
+
+        if record.get("fingerprint"):
+            self.results[record["fingerprint"]] = record
+        return record
+
+    def _notify_experiment(self, session_id: str, record: dict):
+        # Outside the lock, once the record is stored: a failing listener is logged,
+        # it never fails the experiment or keeps the others from running
+        with self._lock:
+            listeners = list(self._experiment_listeners)
+        for listener in listeners:
+            try:
+                listener(session_id, record)
+            except Exception as e:
+                log_error(setup_logger("SessionService"), "SessionService",
+                          f"Experiment listener {listener!r} failed: {type(e).__name__}: {e}")
+
+    def add_experiment_listener(self, callback):
+        """Call `callback(session_id, record)` for every experiment added from now on."""
+        with self._lock:
+            self._experiment_listeners.append(callback)
+
+    def remove_experiment_listener(self, callback):
+        with self._lock:
+            if callback in self._experiment_listeners:
+                self._experiment_listeners.remove(callback)
+
+    def add_perf_record(self, session_id: str, record: dict):
+        """Append a stage timing/memory record (see tools.profiling_tools.track_stage)."""
+        with self._lock:
+            if session_id in self.sessions:
+                self.sessions[session_id].setdefault("perf", []).append(record)
 
-            # update best score automatically
-            score = experiment.get("score")
-            best = self.sessions[session_id]["best_score"]
+    def lookup_result(self, fingerprint: str):
+        """Return a previously recorded experiment with this fingerprint, or None."""
+        return self.results.get(fingerprint)
 
-            if best is None or score > best:
-                self.sessions[session_id]["best_score"] = score
+    def best_score_for_dataset(self, dataset_hash: str):
+        """Best recorded score across sessions for a dataset content hash."""
+        scores = [exp["score"] for exp in self.results.values()
+                  if exp.get("dataset_hash") == dataset_hash]
+        return max(scores) if scores else None
@@ -0,0 +1,177 @@
+# sqlite_session_service.py
+
+import json
+import os
+import sqlite3
+import time
+
+from core.dataset_cache import DatasetCache
+from core.session_service import SessionService
+from core.experiment_table import ExperimentTable
+from core.serialization import to_jsonable
+
+# Session fields that only make sense inside the running process
+RUNTIME_FIELDS = {"features", "last_model"}
+
+# Append-only session lists stored one row per item in their own tables
+# (never part of the sessions row, which is rewritten on every update)
+LIST_FIELDS = {"experiments", "perf"}
+
+
+class SQLiteSessionService(SessionService):
+    """
+    Durable session store backed by SQLite (WAL mode).
+    Same API as SessionService; sessions and experiments survive the process.
+
+    Every experiment row carries its fingerprint and dataset hash, so
+    `lookup_result` can return stored scores for repeated experiments and
+    `best_score_for_dataset` is an indexed lookup.
+
+    Experiments and perf records are inserted as single rows into their own
+    tables; only update_session rewrites the (small) row of scalar session fields.
+    """
+
+    persistent = True
+
+    def __init__(self, db_path: str = "sessions.db", dataset_cache: DatasetCache | None = None,
+                 cache_max_bytes: int = 2 * 1024 ** 3):
+        super().__init__(dataset_cache=dataset_cache, cache_max_bytes=cache_max_bytes)
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None,
+                                    timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                fields TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS experiments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT,
+                fingerprint TEXT,
+                dataset_hash TEXT,
+                model_name TEXT,
+                score REAL,
+                record TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_experiments_fingerprint
+                ON experiments (fingerprint);
+            CREATE INDEX IF NOT EXISTS idx_experiments_dataset_score
+                ON experiments (dataset_hash, score DESC);
+            CREATE INDEX IF NOT EXISTS idx_experiments_session
+                ON experiments (session_id, id);
+            CREATE TABLE IF NOT EXISTS perf_records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                record TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_perf_records_session
+                ON perf_records (session_id, id);
+        """)
+
+    def _save_fields(self, session_id: str):
+        session = self.sessions[session_id]
+        fields = {}
+        for key, value in session.items():
+            if key in LIST_FIELDS or key in RUNTIME_FIELDS:
+                continue
+            try:
+                fields[key] = to_jsonable(value)
+            except TypeError:
+                continue  # in-process only (e.g. fitted objects)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, fields, updated_at) VALUES (?, ?, ?)",
+            (session_id, json.dumps(fields), time.time())
+        )
+
+    def create_session(self, session_id: str):
+        """Create a new session; experiments of an older session with this id are kept as history only."""
+        with self._lock:
+            session = super().create_session(session_id)
+            self.conn.execute("UPDATE experiments SET session_id = NULL WHERE session_id = ?", (session_id,))
+            self.conn.execute("DELETE FROM perf_records WHERE session_id = ?", (session_id,))
+            self._save_fields(session_id)
+            return session
+
+    def get_session(self, session_id: str):
+        """Retrieve a session, loading it from the database if this process has not seen it."""
+        with self._lock:
+            if session_id not in self.sessions:
+                row = self.conn.execute(
+                    "SELECT fields FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                session = json.loads(row[0])
+                session["experiments"] = ExperimentTable(
+                    json.loads(record) for (record,) in self.conn.execute(
+                        "SELECT record FROM experiments WHERE session_id = ? ORDER BY id", (session_id,)
+                    )
+                )
+                session["best_score"] = session["experiments"].best_score
+                session["perf"] = [json.loads(record) for (record,) in self.conn.execute(
+                    "SELECT record FROM perf_records WHERE session_id = ? ORDER BY id", (session_id,)
+                )]
+                self.sessions[session_id] = session
+            return self.sessions[session_id]
+
+    def update_session(self, session_id: str, key: str, value):
+        """Update a field and persist it (runtime-only values stay in memory)."""
+        with self._lock:
+            super().update_session(session_id, key, value)
+            if session_id in self.sessions and key not in RUNTIME_FIELDS:
+                self._save_fields(session_id)
+
+    def add_experiment(self, session_id: str, experiment: dict):
+        """Add model experiment details, store them durably, then notify the listeners."""
+        with self._lock:
+            if self.get_session(session_id) is None:
+                return
+            record = self._append_experiment(session_id, experiment)
+            self.conn.execute(
+                "INSERT INTO experiments (session_id, fingerprint, dataset_hash, model_name, score, "
+                "record, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session_id, experiment.get("fingerprint"), experiment.get("dataset_hash"),
+                 experiment.get("model_name"), experiment.get("score"),
+                 json.dumps(to_jsonable(experiment)), time.time())
+            )
+            # best_score is not written: it is recomputed from the experiments on load
+        # The row is committed (autocommit) and the lock released before listeners run
+        self._notify_experiment(session_id, record)
+
+    def _insert_perf(self, session_id: str, record: dict):
+        self.conn.execute("INSERT INTO perf_records (session_id, record) VALUES (?, ?)",
+                          (session_id, json.dumps(to_jsonable(record))))
+
+    def add_perf_record(self, session_id: str, record: dict):
+        """Append a stage performance record and persist it."""
+        with self._lock:
+            if session_id in self.sessions:
+                super().add_perf_record(session_id, record)
+                self._insert_perf(session_id, record)
+
+    def lookup_result(self, fingerprint: str):
+        """Return the most recent stored experiment with this fingerprint, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT record FROM experiments WHERE fingerprint = ? ORDER BY id DESC LIMIT 1",
+                (fingerprint,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def best_score_for_dataset(self, dataset_hash: str):
+        """Best stored score for a dataset content hash (served by the (dataset_hash, score) index)."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT score FROM experiments WHERE dataset_hash = ? ORDER BY score DESC LIMIT 1",
+                (dataset_hash,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        self.conn.close()
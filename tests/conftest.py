@@ -0,0 +1,30 @@
+# conftest.py - shared fixtures: a small churn dataset and session setup
+
+import os
+
+import pandas as pd
+import pytest
+
+from core.session_service import SessionService
+from agents.intake_agent import IntakeAgent
+
+SOURCE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "Bank_Customer_Churn.csv")
+
+
+@pytest.fixture
+def churn_csv(tmp_path) -> str:
+    """First 1,000 rows of the bundled churn dataset, copied so tests can modify it."""
+    path = tmp_path / "churn.csv"
+    pd.read_csv(SOURCE_CSV, nrows=1000).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def intake_session(tmp_path, churn_csv):
+    """(session_service, session_id) after intake of `churn_csv`, artifacts under tmp_path."""
+    session_service = SessionService()
+    session_service.create_session("s1")
+    result = IntakeAgent(session_service, artifact_dir=str(tmp_path / "artifacts")).run("s1", churn_csv, "churn")
+    assert result["status"] == "success"
+    return session_service, "s1"
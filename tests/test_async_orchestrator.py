@@ -0,0 +1,31 @@
+# test_async_orchestrator.py
+
+import json
+
+from core.async_orchestrator import run_pipeline_concurrent
+from core.session_service import SessionService
+
+
+def test_concurrent_pipeline_runs_every_stage(churn_csv, tmp_path):
+    session_service = SessionService()
+    result = run_pipeline_concurrent(churn_csv, "churn", session_id="async_test", session_service=session_service,
+                                     output_path=str(tmp_path / "report.md"), artifact_dir=str(tmp_path / "artifacts"),
+                                     n_planned_runs=1)
+
+    assert result["status"] == "success"
+    session = session_service.get_session("async_test")
+    stages = {record["stage"] for record in session["perf"]}
+    assert {"intake", "eda", "features", "baseline_model", "importance", "planner",
+            "planned_experiments"} <= stages
+    assert len(session["experiments"]) == 2
+    assert result["best_score"] == max(exp["score"] for exp in session["experiments"])
+    report = (tmp_path / "report.md").read_text()
+    assert "churn" in report
+    assert json.loads(open(result["json_report_path"]).read())["session_id"] == "async_test"
+
+
+def test_a_failed_stage_is_reported_with_its_name(churn_csv, tmp_path):
+    result = run_pipeline_concurrent(churn_csv, "not_a_column", session_id="async_fail",
+                                     output_path=str(tmp_path / "report.md"), artifact_dir=str(tmp_path / "artifacts"))
+    assert result["status"] == "error"
+    assert result["stage"] == "intake"
@@ -0,0 +1,95 @@
+# test_batch.py
+
+import json
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from core.batch import JobLimitExceeded, _JobLimits, load_manifest, run_batch, validate_manifest
+from core.cli import main
+
+
+def _write_manifest(tmp_path, jobs: list) -> str:
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(jobs))
+    return str(path)
+
+
+def test_manifest_paths_are_relative_to_the_manifest(tmp_path, churn_csv):
+    path = _write_manifest(tmp_path, [{"dataset": os.path.basename(churn_csv), "target": "churn"}])
+    assert load_manifest(path)[0]["dataset"] == churn_csv
+
+
+def test_validation_reports_every_problem(tmp_path, churn_csv):
+    feather_path = str(tmp_path / "churn.feather")
+    pd.read_csv(churn_csv).to_feather(feather_path)
+    jobs = [
+        {"dataset": churn_csv, "target": "churn", "session_id": "a"},
+        {"dataset": churn_csv, "target": "not_a_column"},
+        {"dataset": str(tmp_path / "missing.csv"), "target": "churn"},
+        {"dataset": feather_path, "target": "exited", "session_id": "a"},
+        {"target": "churn", "n_trees": 3},
+    ]
+    with pytest.raises(ValueError) as error:
+        validate_manifest(jobs)
+    message = str(error.value)
+
+    assert "job 0" not in message
+    assert "job 1: target 'not_a_column' is not a column" in message
+    assert "job 2: dataset not found" in message
+    assert "job 3: target 'exited' is not a column" in message
+    assert "job 3: duplicate session_id 'a'" in message
+    assert "job 4: missing 'dataset'" in message and "unknown keys ['n_trees']" in message
+
+
+def test_cli_check(tmp_path, churn_csv, capsys):
+    good = _write_manifest(tmp_path, [{"dataset": churn_csv, "target": "churn"}])
+    assert main(["batch", good, "--check"]) == 0
+    assert "Manifest OK: 1 jobs" in capsys.readouterr().out
+
+    bad = _write_manifest(tmp_path, [{"dataset": churn_csv, "target": "Exited"}])
+    assert main(["batch", bad, "--check"]) == 2
+    assert "target 'Exited' is not a column" in capsys.readouterr().err
+
+
+def test_run_batch_in_spawned_workers(tmp_path, churn_csv):
+    jobs = [{"dataset": churn_csv, "target": "churn", "n_planned_runs": 0, "importance": False},
+            {"dataset": churn_csv, "target": "churn", "n_planned_runs": 0, "importance": False}]
+    results = run_batch(jobs, output_dir=str(tmp_path / "reports"), artifact_dir=str(tmp_path / "artifacts"),
+                        max_workers=1)
+
+    assert [result["status"] for result in results] == ["success", "success"]
+    assert results[0]["session_id"] != results[1]["session_id"]
+    for result in results:
+        assert os.path.exists(tmp_path / "reports" / f"{result['session_id']}.md")
+    assert json.loads((tmp_path / "reports" / "batch_summary.json").read_text())[0]["status"] == "success"
+    assert list((tmp_path / "artifacts").glob("*.feather"))
+
+
+def _swallowing_loop(seconds: float, busy: bool):
+    # Like an agent's broad `except Exception`: must not hide a limit breach
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            if not busy:
+                time.sleep(0.01)
+        except Exception:
+            pass
+
+
+def test_a_cpu_limit_breach_cannot_be_swallowed():
+    limits = _JobLimits(memory_limit_mb=None, cpu_limit_seconds=1)
+    with pytest.raises(JobLimitExceeded):
+        with limits:
+            _swallowing_loop(10, busy=True)
+    assert limits.exceeded == "CPU time limit exceeded"
+
+
+def test_memory_is_enforced_on_the_polled_rss():
+    limits = _JobLimits(memory_limit_mb=1, cpu_limit_seconds=None, poll_seconds=0.05)
+    with pytest.raises(JobLimitExceeded):
+        with limits:
+            _swallowing_loop(10, busy=False)
+    assert limits.exceeded.startswith("memory limit of 1 MB")
@@ -0,0 +1,44 @@
+# test_cli.py
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from core.cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_entry_points_do_not_import_numpy_pandas_or_sklearn():
+    code = ("import sys, core.cli, core.orchestrator, core.async_orchestrator, core.batch; "
+            "print(sorted(m for m in ('numpy', 'pandas', 'sklearn') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_help_exits_cleanly(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--help"])
+    assert exit_info.value.code == 0
+    assert "run" in capsys.readouterr().out
+
+
+def test_run_then_re_render_the_report_from_the_store(churn_csv, tmp_path, capsys):
+    db_path = str(tmp_path / "sessions.db")
+    assert main(["run", churn_csv, "churn", "--session", "cli_test", "--runs", "0", "--no-importance",
+                 "--db", db_path, "--output", str(tmp_path / "report.md"),
+                 "--artifact-dir", str(tmp_path / "artifacts")]) == 0
+    assert '"status": "success"' in capsys.readouterr().out
+    assert list((tmp_path / "artifacts").glob("*.feather"))
+
+    assert main(["report", "cli_test", "--db", db_path, "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["session_id"] == "cli_test" and len(report["experiments"]) == 1
+
+    assert main(["report", "cli_test", "--db", db_path, "--output", str(tmp_path / "again.md")]) == 0
+    assert (tmp_path / "again.md").read_text().startswith("#")
+    assert main(["report", "missing", "--db", db_path]) == 2
+    assert main(["report", "cli_test", "--db", str(tmp_path / "none.db")]) == 2
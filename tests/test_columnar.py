@@ -0,0 +1,34 @@
+# test_columnar.py
+
+import os
+
+import pandas as pd
+import pandas.testing as pdt
+
+from tools.data_tools import columnar_artifact_path, load_dataset, load_session_dataset, write_columnar
+
+
+def test_feather_round_trip(tmp_path, churn_csv):
+    df = pd.read_csv(churn_csv)
+    path = write_columnar(df, str(tmp_path / "out" / "churn.feather"))
+    pdt.assert_frame_equal(load_dataset(path), df)
+
+
+def test_artifact_path_changes_with_the_csv(tmp_path, churn_csv):
+    before = columnar_artifact_path(churn_csv, str(tmp_path))
+    assert before == columnar_artifact_path(churn_csv, str(tmp_path))
+    os.utime(churn_csv, ns=(1, 1))
+    assert columnar_artifact_path(churn_csv, str(tmp_path)) != before
+
+
+def test_first_full_load_converts_the_csv(intake_session):
+    session_service, session_id = intake_session
+    session = session_service.get_session(session_id)
+    assert session["data_path"] == session["dataset_path"]
+
+    df = load_session_dataset(session_service, session_id)
+
+    assert session["data_path"] == session["artifact_path"]
+    assert os.path.exists(session["artifact_path"])
+    reloaded = load_dataset(session["artifact_path"])
+    assert list(reloaded.columns) == list(df.columns) and len(reloaded) == len(df)
@@ -0,0 +1,44 @@
+# test_cv.py
+
+import numpy as np
+
+from agents.model_agent import ModelAgent
+from tools.cv_tools import clearly_worse, fold_assignments, normalize_cv
+
+
+def test_fold_assignments_are_stratified_and_repeatable():
+    y = np.array([1] * 100 + [0] * 400)
+    assignments = fold_assignments(y, "classification", n_splits=5, n_repeats=2, random_state=0)
+
+    assert assignments.shape == (2, 500)
+    for repeat in range(2):
+        for fold in range(5):
+            in_fold = assignments[repeat] == fold
+            assert in_fold.sum() == 100 and y[in_fold].sum() == 20
+    assert (assignments[0] != assignments[1]).any()
+    np.testing.assert_array_equal(assignments, fold_assignments(y, "classification", 5, 2, random_state=0))
+
+
+def test_clearly_worse_needs_min_folds_and_a_margin():
+    assert normalize_cv(3) == {"n_splits": 3, "n_repeats": 1}
+    assert not clearly_worse([0.5], 0.9, min_folds=2)
+    assert clearly_worse([0.5, 0.51], 0.9, min_folds=2)
+    assert not clearly_worse([0.5, 0.9], 0.8, min_folds=2)
+    assert not clearly_worse([0.5, 0.5], None)
+
+
+def test_weak_configuration_is_pruned_after_the_first_folds(intake_session, tmp_path):
+    session_service, session_id = intake_session
+    agent = ModelAgent(session_service, artifact_dir=str(tmp_path / "artifacts"))
+
+    strong = agent.run(session_id, model_params={"n_estimators": 50}, cv=5)
+    folds = session_service.get_session(session_id)["features"]["cv_folds"][(5, 1)]
+    weak = agent.run(session_id, model_params={"n_estimators": 1, "max_depth": 1}, cv=5)
+
+    assert not strong["pruned"] and weak["pruned"] and weak["score"] < strong["score"]
+    first, second = session_service.get_session(session_id)["experiments"]
+    assert len(first["fold_scores"]) == 5 and second["folds_fitted"] == 2
+    assert first["score_std"] > 0
+    # Every experiment of the session scores on the same fold indices
+    assert session_service.get_session(session_id)["features"]["cv_folds"][(5, 1)] is folds
+    assert session_service.get_session(session_id)["best_score"] == strong["score"]
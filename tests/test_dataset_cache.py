@@ -0,0 +1,69 @@
+# test_dataset_cache.py
+
+import os
+
+import pandas as pd
+
+from core.dataset_cache import DatasetCache
+from core.session_service import SessionService
+from tools.data_tools import load_dataset
+
+
+def _frame(n_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"a": range(n_rows), "b": [float(i) for i in range(n_rows)]})
+
+
+def test_get_or_load_parses_once(tmp_path):
+    path = tmp_path / "data.csv"
+    _frame(50).to_csv(path, index=False)
+    cache = DatasetCache()
+    calls = []
+
+    def loader(p):
+        calls.append(p)
+        return pd.read_csv(p)
+
+    first = cache.get_or_load(str(path), loader)
+    second = cache.get_or_load(str(path), loader)
+
+    assert first is second
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_modified_file_is_reloaded(tmp_path):
+    path = tmp_path / "data.csv"
+    _frame(10).to_csv(path, index=False)
+    cache = DatasetCache()
+    assert len(load_dataset(str(path), cache=cache)) == 10
+
+    _frame(20).to_csv(path, index=False)
+    os.utime(path, ns=(1, 1))
+    assert len(load_dataset(str(path), cache=cache)) == 20
+
+
+def test_lru_eviction_respects_budget():
+    size = DatasetCache._sizeof(_frame(100))
+    cache = DatasetCache(max_bytes=2 * size)
+    cache.put("a", _frame(100))
+    cache.put("b", _frame(100))
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", _frame(100))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_frames_larger_than_budget_are_not_cached():
+    cache = DatasetCache(max_bytes=10)
+    df = _frame(100)
+    assert cache.put("big", df) is df
+    assert cache.get("big") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_session_service_shares_one_cache():
+    cache = DatasetCache()
+    first, second = SessionService(dataset_cache=cache), SessionService(dataset_cache=cache)
+    assert first.dataset_cache is second.dataset_cache
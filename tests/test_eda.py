@@ -0,0 +1,52 @@
+# test_eda.py
+
+import gc
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from agents.eda_agent import EDAAgent
+from tools.eda_tools import LazySummary, sampled_description
+
+
+def test_fields_are_computed_only_when_read():
+    loads = []
+    frame = pd.DataFrame({"x": [1, 2, 3]})
+
+    def loader():
+        loads.append(1)
+        return frame
+
+    summary = LazySummary({"shape": lambda df: df.shape, "rows": lambda df: len(df)}, loader)
+    assert "'shape': <not computed>" in repr(summary)
+    assert summary["shape"] == (3, 1) and summary["shape"] == (3, 1)
+    assert len(loads) == 1 and summary.materialized() == {"shape": (3, 1)}
+    assert summary.to_dict() == {"shape": (3, 1), "rows": 3}
+    assert summary._loader is None and summary._factories == {}
+    assert repr(summary) == "LazySummary({'shape': (3, 1), 'rows': 3})"
+
+
+def test_pending_summary_does_not_keep_the_frame_alive(intake_session):
+    session_service, session_id = intake_session
+    summary = EDAAgent(session_service).run(session_id, mode="full")["summary"]
+    frame = weakref.ref(session_service.dataset_cache.get(next(iter(session_service.dataset_cache._entries))))
+
+    session_service.dataset_cache.clear()
+    gc.collect()
+    assert frame() is None
+    # The frame is re-fetched through the cache on the next read
+    assert summary["shape"][0] == 1000
+    assert set(summary) == {"shape", "dtypes", "missing_values", "target_distribution", "description"}
+
+
+def test_sampled_description_bounds_cover_the_full_mean():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"x": rng.normal(10, 2, 50_000), "y": rng.integers(0, 2, 50_000)})
+    stats = sampled_description(df, "y", sample_rows=5_000)["x"]
+
+    low, high = stats["mean_ci95"]
+    assert stats["sample_rows"] <= 5_001 and stats["count"] == 50_000
+    assert low <= df["x"].mean() <= high
+    full = sampled_description(df, "y", sample_rows=100_000)["x"]
+    assert full["mean_ci95"][0] == full["mean_ci95"][1] == full["mean"]
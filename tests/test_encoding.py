@@ -0,0 +1,67 @@
+# test_encoding.py
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from tools.encoding_tools import FeatureEncoder
+
+
+def _frame(n_rows: int = 4000) -> tuple:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({
+        "amount": rng.normal(size=n_rows),
+        "country": rng.choice(["FR", "DE", "ES"], n_rows),
+        "branch": rng.choice([f"b{i}" for i in range(100)], n_rows),
+        "city": rng.choice([f"c{i}" for i in range(1500)], n_rows),
+        "customer_id": [f"id{i}" for i in range(n_rows)],
+    })
+    y = rng.integers(0, 2, n_rows)
+    return X, y
+
+
+def test_strategy_follows_cardinality():
+    X, y = _frame()
+    encoder = FeatureEncoder()
+    matrix, names = encoder.fit_transform(X, y)
+
+    assert encoder.summary() == {"country": "onehot", "branch": "ordinal", "city": "target",
+                                 "customer_id": "hashing"}
+    assert sparse.issparse(matrix) and matrix.dtype == np.float32
+    # numeric + ordinal + target, 2 one-hot columns (drop_first), 64 hash buckets
+    assert matrix.shape == (4000, 3 + 2 + 64) and len(names) == matrix.shape[1]
+
+
+def test_small_cardinality_stays_dense_like_get_dummies():
+    X = pd.DataFrame({"amount": [1.0, 2.0, 3.0], "country": ["FR", "DE", "FR"]})
+    matrix, names = FeatureEncoder().fit_transform(X)
+    expected = pd.get_dummies(X, drop_first=True, dtype=np.float32)
+
+    assert isinstance(matrix, np.ndarray) and matrix.flags["C_CONTIGUOUS"]
+    assert names == list(expected.columns)
+    np.testing.assert_array_equal(matrix, expected.to_numpy())
+
+
+def test_unseen_values_do_not_fail_and_use_the_fallbacks():
+    X, y = _frame()
+    encoder = FeatureEncoder()
+    encoder.fit_transform(X, y)
+    new = pd.DataFrame({"amount": [0.0], "country": ["IT"], "branch": ["unknown"], "city": ["nowhere"],
+                        "customer_id": ["new"]})
+    row = encoder.transform(new).toarray()[0]
+
+    groups = encoder.column_groups()
+    assert row[groups["country"]].sum() == 0
+    assert row[groups["branch"]][0] == -1
+    assert row[groups["city"]][0] == np.float32(y.mean())
+    assert row[groups["customer_id"]].sum() == 1
+
+
+def test_training_rows_get_out_of_fold_target_means():
+    # Every city is unique to one row: an in-fold mean would leak the label exactly
+    X = pd.DataFrame({"city": [f"c{i}" for i in range(2000)]})
+    y = np.random.default_rng(1).integers(0, 2, 2000)
+    matrix, _ = FeatureEncoder(strategies={"city": "target"}).fit_transform(X, y)
+    encoded = np.asarray(matrix)[:, 0]
+
+    assert np.allclose(encoded, y.mean(), atol=0.05)
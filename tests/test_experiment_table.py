@@ -0,0 +1,83 @@
+# test_experiment_table.py
+
+import math
+import random
+
+from core.experiment_table import ExperimentTable
+
+
+def _record(score, n_estimators: int = 100, **extra) -> dict:
+    return {"model_name": "RandomForestClassifier", "score": score,
+            "params": {"model": "random_forest", "n_estimators": n_estimators}, **extra}
+
+
+def test_behaves_like_a_list_and_interns_params():
+    table = ExperimentTable([_record(0.8), _record(0.9), _record(None, n_estimators=200)])
+
+    assert len(table) == 3 and table[-1]["score"] is None and [r["score"] for r in table[:2]] == [0.8, 0.9]
+    assert table[0]["params"] is table[1]["params"]
+    assert len(table.find({"model": "random_forest", "n_estimators": 100})) == 2
+    assert math.isnan(table.scores[2]) and table.best_score == 0.9 and table.best_row == 1
+    assert table.families() == {"random_forest"}
+    assert len(table.by_family("random_forest")) == 3 and table.by_family("linear") == []
+
+
+def test_best_and_top_match_a_full_sort():
+    rng = random.Random(0)
+    scores = [round(rng.random(), 2) for _ in range(2000)]
+    table = ExperimentTable([_record(score, n_estimators=i % 7) for i, score in enumerate(scores)], top_k=16)
+    ranked = sorted(range(len(scores)), key=lambda row: (-scores[row], row))
+
+    assert table.best() is table[ranked[0]]
+    assert table.top_rows(10) == ranked[:10]
+    assert table.top_rows(100) == ranked[:100]
+    # A filter matching nothing in the top_k heap falls back to a linear scan
+    rare = lambda record: record["params"]["n_estimators"] == 6 and record["score"] < 0.5
+    expected = next(row for row in ranked if scores[row] < 0.5 and row % 7 == 6)
+    assert table.best(where=rare) is table[expected]
+    assert table.best(where=lambda record: False) is None
+
+
+def test_fingerprint_and_pruned_indexes():
+    table = ExperimentTable()
+    table.append(_record(0.8, fingerprint="a"))
+    table.append(_record(0.7, n_estimators=50, fingerprint="b", pruned=True))
+    table.append(_record(0.85, fingerprint="a"))
+
+    assert table.by_fingerprint("a")["score"] == 0.85 and table.by_fingerprint("missing") is None
+    assert [record["score"] for record in table.pruned()] == [0.7]
+    assert table.last(where=lambda record: not record.get("pruned"))["score"] == 0.85
+
+
+def test_best_by_keeps_the_best_per_group_as_records_arrive():
+    cv5, cv3 = {"n_splits": 5, "n_repeats": 1}, {"n_splits": 3, "n_repeats": 1}
+    table = ExperimentTable([_record(0.9), _record(0.8, cv=cv5), _record(0.95, cv=cv5, pruned=True)])
+
+    assert table.best_by("cv", cv5)["score"] == 0.8
+    assert table.best_by("cv", cv3) is None and table.best_by("stored_model") is None
+    table.append(_record(0.85, cv=dict(cv5)))
+    table.append(_record(0.7, cv=cv3))
+    table.append(_record(0.6, artifact={"hash": "a"}))
+    table.append(_record(0.6, n_estimators=50, artifact={"hash": "b"}))
+
+    assert table.best_by("cv", cv5)["score"] == 0.85 and table.best_by("cv", cv3)["score"] == 0.7
+    assert table.best_by("stored_model")["artifact"] == {"hash": "a"}
+
+
+def test_neighbors_differ_in_exactly_one_param():
+    def params(**overrides):
+        return {"model": "random_forest", "n_estimators": 100, "max_depth": 8, **overrides}
+
+    table = ExperimentTable([
+        {"score": 0.9, "params": params()},
+        {"score": 0.7, "params": params(n_estimators=200)},
+        {"score": 0.8, "params": params(max_depth=4)},
+        {"score": 0.85, "params": params(n_estimators=200, max_depth=4)},
+        {"score": 0.6, "params": {"model": "hist_gbm", "n_estimators": 100, "max_depth": 8}},
+        {"score": 0.5, "params": params(max_features="sqrt")},
+    ])
+
+    assert [record["score"] for record in table.neighbors()] == [0.8, 0.7]
+    assert [record["score"] for record in table.neighbors(table[3], limit=1)] == [0.8]
+    assert table.neighbors(table[4]) == []
+    assert ExperimentTable().neighbors() == []
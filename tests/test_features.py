@@ -0,0 +1,29 @@
+# test_features.py
+
+import numpy as np
+
+from agents.feature_agent import FeatureAgent
+from tools.data_tools import stratified_order
+
+
+def test_features_are_encoded_once_per_session(intake_session):
+    session_service, session_id = intake_session
+    agent = FeatureAgent(session_service)
+
+    first = agent.run(session_id)
+    features = session_service.get_session(session_id)["features"]
+    second = agent.run(session_id)
+
+    assert first["cached"] is False and second["cached"] is True
+    assert session_service.get_session(session_id)["features"] is features
+    assert features["X_train"].dtype == np.float32
+    assert len(features["train_idx"]) + len(features["val_idx"]) == 1000
+    assert not set(features["train_idx"]) & set(features["val_idx"])
+
+
+def test_stratified_order_prefixes_keep_class_ratio():
+    y = np.array([1] * 200 + [0] * 800)
+    order = stratified_order(y, random_state=0)
+    assert sorted(order) == list(range(len(y)))
+    for k in (50, 100, 500):
+        assert abs(y[order[:k]].mean() - 0.2) <= 0.03
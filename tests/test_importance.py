@@ -0,0 +1,61 @@
+# test_importance.py
+
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+
+from agents.importance_agent import ImportanceAgent
+from agents.model_agent import ModelAgent
+from agents.report_agent import ReportAgent
+from tools.importance_tools import group_importance
+
+
+def _signal_and_noise():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 3)).astype(np.float32)
+    y = (X[:, 0] > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+    return model, X, y
+
+
+def test_batched_shuffles_match_one_predict_per_repeat():
+    model, X, y = _signal_and_noise()
+    baseline = accuracy_score(y, model.predict(X))
+    result = group_importance(model, accuracy_score, X, y, [0], baseline, n_repeats=4, max_batch_rows=800)
+
+    rng = np.random.default_rng(42)
+    expected = []
+    for _ in range(4):
+        shuffled = X.copy()
+        shuffled[:, 0] = X[rng.permutation(len(X)), 0]
+        expected.append(accuracy_score(y, model.predict(shuffled)))
+    assert result["scores"] == pytest.approx(expected)
+    assert result["importance"] > 0.3
+    assert group_importance(model, accuracy_score, X, y, [2], baseline)["importance"] < 0.05
+
+    on_sparse = group_importance(model, accuracy_score, sparse.csr_matrix(X), y, [0], baseline,
+                                 n_repeats=4, max_batch_rows=800)
+    assert on_sparse["scores"] == pytest.approx(expected)
+
+
+def test_importance_is_ranked_per_input_column(intake_session, tmp_path):
+    session_service, session_id = intake_session
+    artifact_dir = str(tmp_path / "artifacts")
+    assert ModelAgent(session_service, artifact_dir=artifact_dir).run(
+        session_id, model_params={"n_estimators": 20})["status"] == "success"
+
+    agent = ImportanceAgent(session_service, artifact_dir=artifact_dir)
+    sequential = agent.run(session_id, n_repeats=2)["feature_importance"]
+    pooled = agent.run(session_id, n_repeats=2, n_workers=2)["feature_importance"]
+
+    features = [item["feature"] for item in sequential["features"]]
+    assert "country" in features and not any(name.startswith("country_") for name in features)
+    assert "churn" not in features
+    assert [item["importance"] for item in pooled["features"]] == pytest.approx(
+        [item["importance"] for item in sequential["features"]])
+    assert session_service.get_session(session_id)["feature_importance"] == pooled
+
+    report = ReportAgent(session_service).run(session_id)["report"]
+    assert "`country`" in report
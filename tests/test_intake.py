@@ -0,0 +1,65 @@
+# test_intake.py
+
+import hashlib
+import os
+
+import pandas as pd
+
+from tools.data_tools import (
+    columnar_artifact_path, infer_dtypes, load_session_dataset, prune_columnar_artifacts, scan_file, write_columnar
+)
+
+
+def test_scan_file_counts_rows_and_hashes_the_content(tmp_path, churn_csv):
+    assert scan_file(churn_csv)["rows"] == 1000
+    assert scan_file(churn_csv)["hash"] == hashlib.blake2b(open(churn_csv, "rb").read(), digest_size=16).hexdigest()
+
+    no_trailing_newline = tmp_path / "short.csv"
+    no_trailing_newline.write_text("a,b\n1,2\n3,4")
+    assert scan_file(str(no_trailing_newline))["rows"] == 2
+
+    feather_path = str(tmp_path / "churn.feather")
+    pd.read_csv(churn_csv).to_feather(feather_path)
+    assert scan_file(feather_path)["rows"] == 1000
+
+
+def test_infer_dtypes_from_a_prefix():
+    prefix = pd.DataFrame({"id": ["a", "b", "c", "d"], "country": ["FR", "FR", "DE", "FR"],
+                           "age": [30, 40, 50, 60], "balance": [1.5, 0.0, 2.5, 3.0]})
+    assert infer_dtypes(prefix) == {"country": "category", "age": "int64", "balance": "float64"}
+
+
+def test_intake_records_the_schema_without_a_full_load(intake_session):
+    session_service, session_id = intake_session
+    session = session_service.get_session(session_id)
+    assert session["task_type"] == "classification"
+    assert session["dtypes"]["country"] == "category"
+    assert session_service.dataset_cache.stats()["entries"] == 0
+
+
+def test_full_load_is_cached_once(intake_session):
+    session_service, session_id = intake_session
+    df = load_session_dataset(session_service, session_id)
+
+    assert session_service.dataset_cache.stats()["entries"] == 1
+    assert session_service.dataset_cache.stats()["bytes"] == df.memory_usage(deep=True).sum()
+    assert load_session_dataset(session_service, session_id) is df
+    assert df["country"].dtype == "category"
+
+
+def test_a_modified_csv_replaces_its_old_columnar_artifact(tmp_path, churn_csv):
+    artifact_dir = str(tmp_path / "artifacts")
+    old_path = columnar_artifact_path(churn_csv, artifact_dir)
+    write_columnar(pd.read_csv(churn_csv, nrows=10), old_path)
+    other_csv = tmp_path / "other.csv"
+    other_csv.write_text("a,b\n1,2\n")
+    other_path = columnar_artifact_path(str(other_csv), artifact_dir)
+    write_columnar(pd.read_csv(other_csv), other_path)
+
+    os.utime(churn_csv, ns=(0, 0))
+    new_path = columnar_artifact_path(churn_csv, artifact_dir)
+    write_columnar(pd.read_csv(churn_csv), new_path)
+
+    assert new_path != old_path
+    assert prune_columnar_artifacts(new_path) == [old_path]
+    assert os.path.exists(new_path) and os.path.exists(other_path)
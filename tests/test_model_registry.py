@@ -0,0 +1,66 @@
+# test_model_registry.py
+
+import os
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from threadpoolctl import threadpool_info
+
+from agents.model_agent import ModelAgent, fit_and_score
+from agents.planner_agent import PlannerAgent
+from tools.model_registry import (
+    MODEL_REGISTRY, build_model, final_estimator, fit_model, model_params, register_model
+)
+
+
+class _ThreadProbe(LogisticRegression):
+    def fit(self, X, y):
+        self.openmp_threads_ = {info["num_threads"] for info in threadpool_info() if info["user_api"] == "openmp"}
+        return super().fit(X, y)
+
+
+def test_n_threads_overrides_the_thread_param():
+    model = build_model("classification", {"n_jobs": 64, "n_estimators": 10}, n_threads=1)
+    assert model.get_params()["n_jobs"] == 1
+    assert build_model("classification", {"n_jobs": 4}).get_params()["n_jobs"] == 4
+    assert "n_jobs" not in model_params(model)
+    assert model_params(model)["n_estimators"] == 10
+
+
+def test_recorded_and_planned_params_carry_no_thread_count(intake_session, tmp_path, monkeypatch):
+    session_service, session_id = intake_session
+    monkeypatch.setattr(os, "cpu_count", lambda: 64)
+    agent = ModelAgent(session_service, artifact_dir=str(tmp_path / "artifacts"))
+    assert agent.run(session_id, model_params={"n_estimators": 20})["status"] == "success"
+
+    (experiment,) = session_service.get_session(session_id)["experiments"]
+    assert "n_jobs" not in experiment["params"]
+    suggestions = PlannerAgent(session_service).run(session_id)["suggestions"]
+    assert suggestions and all("n_jobs" not in s["model_params"] for s in suggestions)
+
+    # A pool job built from a suggestion runs on the thread count it is given
+    pool_model = build_model("classification", suggestions[0]["model_params"], n_threads=1)
+    assert final_estimator(pool_model).n_jobs == 1
+
+
+def test_hist_gbm_early_stopping_never_sees_the_validation_split():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1200, 5))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=1200) > 0).astype(int)
+    X_train, y_train, X_val, y_val = X[:900], y[:900], X[900:], y[900:]
+
+    iterations = []
+    for val_labels in (y_val, 1 - y_val):
+        model = build_model("classification", {"model": "hist_gbm"}, n_threads=1)
+        fit_and_score(model, "classification", X_train, y_train, X_val, val_labels, n_threads=1)
+        iterations.append(model.n_iter_)
+    assert model.validation_fraction == 0.1 and iterations[0] == iterations[1] < model.max_iter
+
+
+def test_families_without_a_thread_param_are_capped_with_threadpoolctl(monkeypatch):
+    monkeypatch.setitem(MODEL_REGISTRY, "thread_probe", None)
+    register_model("thread_probe", _ThreadProbe, _ThreadProbe)
+    X, y = np.random.default_rng(0).normal(size=(50, 3)), np.arange(50) % 2
+
+    model = fit_model(build_model("classification", {"model": "thread_probe"}, n_threads=3), X, y, n_threads=3)
+    assert model.openmp_threads_ == {3}
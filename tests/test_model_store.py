@@ -0,0 +1,51 @@
+# test_model_store.py
+
+import os
+
+import joblib
+from sklearn.ensemble import RandomForestClassifier
+
+from agents.model_agent import ModelAgent
+from core.model_store import ModelStore
+
+
+def _model(n_estimators: int = 5) -> RandomForestClassifier:
+    return RandomForestClassifier(n_estimators=n_estimators, random_state=0).fit([[0], [1], [2]], [0, 1, 0])
+
+
+def test_identical_models_share_one_file(tmp_path, monkeypatch):
+    dumps = []
+    real_dump = joblib.dump
+    monkeypatch.setattr(joblib, "dump", lambda *args, **kwargs: dumps.append(1) or real_dump(*args, **kwargs))
+    store = ModelStore(str(tmp_path / "models"))
+
+    first = store.save(_model())
+    second = store.save(_model())
+    other = store.save(_model(n_estimators=6))
+
+    assert len(dumps) == 3
+    assert first["artifact_id"] == second["artifact_id"] != other["artifact_id"]
+    assert sorted(os.listdir(tmp_path / "models")) == sorted(
+        f"{pointer['artifact_id']}.joblib" for pointer in (first, other))
+    assert first["bytes"] == os.path.getsize(first["path"])
+
+
+def test_load_keeps_recent_models_in_memory(tmp_path):
+    store = ModelStore(str(tmp_path / "models"), max_loaded=1)
+    first, second = store.save(_model()), store.save(_model(n_estimators=6))
+
+    model = store.load(first)
+    assert store.load(first["artifact_id"]) is model
+    assert len(store.load(second).estimators_) == 6
+    assert store.load(first) is not model
+    assert store.load(first).predict([[1]])[0] == 1
+
+
+def test_save_stage_records_the_stored_size(intake_session, tmp_path):
+    session_service, session_id = intake_session
+    agent = ModelAgent(session_service, artifact_dir=str(tmp_path / "artifacts"))
+    assert agent.run(session_id, model_params={"n_estimators": 20})["status"] == "success"
+
+    session = session_service.get_session(session_id)
+    (save_record,) = [record for record in session["perf"] if record["stage"] == "model.save"]
+    assert save_record["model_bytes"] == session["experiments"][0]["artifact"]["bytes"]
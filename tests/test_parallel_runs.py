@@ -0,0 +1,72 @@
+# test_parallel_runs.py
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from agents.feature_agent import FeatureAgent
+from agents.intake_agent import IntakeAgent
+from agents.model_agent import ModelAgent
+from core.orchestrator import run_pipeline
+from core.session_service import SessionService
+from tools.shm_tools import attach_arrays, release_shared, share_arrays
+
+
+def test_shared_arrays_round_trip():
+    dense = np.arange(12, dtype=np.float32).reshape(3, 4)
+    csr = sparse.random(5, 4, density=0.5, format="csr", dtype=np.float32, random_state=0)
+    labels = np.array(["a", "b", None], dtype=object)
+    specs, blocks = share_arrays({"dense": dense, "csr": csr, "labels": labels})
+    try:
+        arrays, handles = attach_arrays(specs)
+        np.testing.assert_array_equal(arrays["dense"], dense)
+        assert (arrays["csr"] != csr).nnz == 0
+        assert list(arrays["labels"]) == list(labels)
+        # Zero-copy: a write through one view is visible through the other
+        second, second_handles = attach_arrays(specs)
+        arrays["dense"][0, 0] = -1
+        assert second["dense"][0, 0] == -1
+        del arrays, second
+        for handle in handles + second_handles:
+            handle.close()
+    finally:
+        release_shared(blocks)
+
+
+def test_pooled_runs_match_sequential_runs(intake_session, tmp_path):
+    session_service, session_id = intake_session
+    assert FeatureAgent(session_service).run(session_id)["status"] == "success"
+    params_list = [{"n_estimators": 20, "max_depth": 4}, {"n_estimators": 20, "max_depth": 6}]
+
+    pooled = ModelAgent(session_service, artifact_dir=str(tmp_path / "pooled"))
+    results = pooled.run_many(session_id, params_list, n_workers=2)
+    pooled_scores = sorted(result["score"] for result in results)
+
+    sequential = SessionService()
+    sequential.create_session("s2")
+    dataset_path = session_service.get_session(session_id)["dataset_path"]
+    IntakeAgent(sequential, artifact_dir=str(tmp_path / "artifacts")).run("s2", dataset_path, "churn")
+    agent = ModelAgent(sequential, artifact_dir=str(tmp_path / "sequential"))
+    sequential_scores = sorted(agent.run("s2", model_params=params)["score"] for params in params_list)
+
+    assert all(result["status"] == "success" for result in results)
+    assert pooled_scores == pytest.approx(sequential_scores)
+    assert len(session_service.get_session(session_id)["experiments"]) == 2
+
+
+def test_in_memory_runs_write_no_feature_checkpoint(churn_csv, tmp_path):
+    result = run_pipeline(churn_csv, "churn", session_id="memory_checkpoint_test",
+                          output_path=str(tmp_path / "report.md"), artifact_dir=str(tmp_path / "artifacts"),
+                          importance=False, n_planned_runs=0)
+    assert result["status"] == "success"
+    assert (tmp_path / "artifacts" / "models").is_dir()
+    assert not (tmp_path / "artifacts" / "checkpoints" / "memory_checkpoint_test").exists()
+
+
+def test_db_parent_directory_is_created(churn_csv, tmp_path):
+    db_path = tmp_path / "missing" / "dir" / "sessions.db"
+    result = run_pipeline(churn_csv, "churn", session_id="db_dir_test", db_path=str(db_path),
+                          output_path=str(tmp_path / "report.md"), artifact_dir=str(tmp_path / "artifacts"),
+                          importance=False, n_planned_runs=0)
+    assert result["status"] == "success"
+    assert db_path.exists()
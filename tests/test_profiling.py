@@ -0,0 +1,76 @@
+# test_profiling.py
+
+import json
+
+import numpy as np
+
+from core.session_service import SessionService
+from core.sqlite_session_service import SQLiteSessionService
+from tools.profiling_tools import export_chrome_trace, export_jsonl, track_stage
+
+
+def test_track_stage_records_timings_even_on_errors():
+    session_service = SessionService()
+    session_service.create_session("s1")
+    with track_stage(session_service, "s1", "load", rows=1000) as record:
+        record["model_bytes"] = 10
+    try:
+        with track_stage(session_service, "s1", "broken"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    load, broken = session_service.get_session("s1")["perf"]
+    assert (load["stage"], broken["stage"]) == ("load", "broken")
+    assert load["wall_seconds"] >= 0 and load["rows_per_sec"] > 0 and load["model_bytes"] == 10
+
+
+def test_stage_memory_is_the_current_rss_and_its_change():
+    session_service = SessionService()
+    session_service.create_session("s1")
+    with track_stage(session_service, "s1", "allocate"):
+        block = np.ones(64 * 1024 ** 2 // 8)
+    del block
+    with track_stage(session_service, "s1", "small"):
+        pass
+
+    allocate, small = session_service.get_session("s1")["perf"]
+    assert allocate["rss_delta_mb"] > 50
+    # Not the process-lifetime peak: a later stage reports its own usage
+    assert abs(small["rss_delta_mb"]) < 10 and small["rss_mb"] < allocate["rss_mb"]
+
+
+def test_exports(tmp_path):
+    session_service = SessionService()
+    session_service.create_session("s1")
+    with track_stage(session_service, "s1", "fit"):
+        pass
+    records = session_service.get_session("s1")["perf"]
+    export_jsonl(records, str(tmp_path / "perf.jsonl"))
+    export_chrome_trace(records, str(tmp_path / "trace.json"))
+
+    assert json.loads((tmp_path / "perf.jsonl").read_text())["stage"] == "fit"
+    assert json.loads((tmp_path / "trace.json").read_text())["traceEvents"][0]["name"] == "fit"
+
+
+def test_sqlite_appends_rows_instead_of_rewriting_the_session(tmp_path):
+    db_path = str(tmp_path / "sessions.db")
+    store = SQLiteSessionService(db_path)
+    store.create_session("s1")
+    for i in range(200):
+        store.update_session("s1", "training_status", "RUNNING")
+        with track_stage(store, "s1", "model.fit", rows=100):
+            pass
+        store.add_experiment("s1", {"model_name": "RF", "score": i / 1000, "fingerprint": str(i),
+                                    "params": {"n_estimators": i}})
+        store.update_session("s1", "training_status", "COMPLETED")
+
+    (fields,) = store.conn.execute("SELECT fields FROM sessions WHERE session_id = 's1'").fetchone()
+    assert "experiments" not in json.loads(fields) and "perf" not in json.loads(fields)
+    assert len(fields) < 1000
+    store.close()
+
+    session = SQLiteSessionService(db_path).get_session("s1")
+    assert len(session["experiments"]) == 200 and len(session["perf"]) == 200
+    assert session["best_score"] == 0.199
+    assert session["training_status"] == "COMPLETED"
@@ -0,0 +1,40 @@
+# test_progressive.py
+
+import pytest
+
+from agents.model_agent import ModelAgent
+from tools.cv_tools import project_score
+
+
+def test_project_score_extrapolates_a_rising_curve_only():
+    assert project_score([100, 1000], [0.7, 0.8], 10_000) == pytest.approx(0.9)
+    assert project_score([100, 1000], [0.8, 0.7], 10_000) == 0.8
+    assert project_score([100], [0.75], 10_000) == 0.75
+
+
+def test_hopeless_params_skip_the_full_fit(intake_session, tmp_path):
+    session_service, session_id = intake_session
+    agent = ModelAgent(session_service, artifact_dir=str(tmp_path / "artifacts"))
+    baseline = agent.run(session_id, model_params={"n_estimators": 50})
+
+    weak = agent.run(session_id, model_params={"n_estimators": 1, "max_depth": 1}, progressive=True)
+    assert weak["pruned"] and weak["training_status"] == "PRUNED"
+    assert weak["best_score"] == baseline["score"]
+
+    baseline_record, weak_record = session_service.get_session(session_id)["experiments"]
+    assert "artifact" in baseline_record and "artifact" not in weak_record
+    assert weak_record["subsample_rows"] == [80, 200]
+    fit_stages = [record for record in session_service.get_session(session_id)["perf"]
+                  if record["stage"] == "model.fit"]
+    assert len(fit_stages) == 1
+
+
+def test_promising_params_get_the_full_fit(intake_session, tmp_path):
+    session_service, session_id = intake_session
+    agent = ModelAgent(session_service, artifact_dir=str(tmp_path / "artifacts"))
+    agent.run(session_id, model_params={"n_estimators": 50})
+
+    result = agent.run(session_id, model_params={"n_estimators": 50, "max_depth": 8}, progressive=True,
+                       margin=1.0)
+    assert not result.get("pruned") and result["training_status"] == "COMPLETED"
+    assert "projected_score" in session_service.get_session(session_id)["experiments"][-1]
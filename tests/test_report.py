@@ -0,0 +1,68 @@
+# test_report.py
+
+import json
+
+from agents.report_agent import ReportAgent
+from core.report_writer import ReportWriter
+from core.session_service import SessionService
+
+
+def _session(n_experiments: int) -> SessionService:
+    session_service = SessionService()
+    session = session_service.create_session("s1")
+    session.update({"dataset_path": "data.csv", "target": "churn", "task_type": "classification"})
+    for i in range(n_experiments):
+        session_service.add_experiment("s1", {"model_name": "RandomForestClassifier", "score": i / 100,
+                                              "params": {"model": "random_forest", "n_estimators": 10 + i}})
+    return session_service
+
+
+def test_repeated_reports_render_only_new_experiments():
+    session_service = _session(3)
+    agent = ReportAgent(session_service)
+    agent.run("s1")
+    first_blocks = agent._rendered["s1"][1][:3]
+    session_service.add_experiment("s1", {"model_name": "RandomForestClassifier", "score": 0.5,
+                                          "params": {"model": "random_forest", "n_estimators": 99}})
+    report = agent.run("s1")["report"]
+
+    blocks = agent._rendered["s1"][1]
+    assert len(blocks) == 4 and all(block is first for block, first in zip(blocks, first_blocks))
+    assert "### Experiment 4" in report and "n_estimators=99" in report
+
+
+def test_large_sessions_list_only_the_best():
+    report = ReportAgent(_session(120)).run("s1", max_listed=5)["report"]
+    assert report.count("### Experiment") == 5
+    assert "### Experiment 120" in report
+
+
+def test_writer_logs_experiments_as_they_arrive_and_forgets_on_close(tmp_path):
+    session_service = _session(2)
+    agent = ReportAgent(session_service)
+    writer = ReportWriter(session_service, "s1", str(tmp_path / "report.md"), agent)
+    session_service.add_experiment("s1", {"model_name": "RandomForestClassifier", "score": 0.3,
+                                          "params": {"model": "random_forest", "n_estimators": 50}})
+    result = writer.write()
+
+    lines = (tmp_path / "report.experiments.jsonl").read_text().splitlines()
+    assert [json.loads(line)["number"] for line in lines] == [1, 2, 3]
+    assert json.loads((tmp_path / "report.json").read_text())["session_id"] == "s1"
+    assert result["report_path"] == str(tmp_path / "report.md")
+    assert "s1" in agent._rendered
+
+    writer.close()
+    assert "s1" not in agent._rendered
+    session_service.add_experiment("s1", {"model_name": "RandomForestClassifier", "score": 0.4,
+                                          "params": {"model": "random_forest", "n_estimators": 60}})
+    assert len((tmp_path / "report.experiments.jsonl").read_text().splitlines()) == 3
+
+
+def test_performance_table_shows_stage_rss_and_its_change():
+    session_service = _session(1)
+    session_service.add_perf_record("s1", {"stage": "features", "wall_seconds": 0.5, "cpu_seconds": 0.4,
+                                           "rss_mb": 210.0, "rss_delta_mb": -12.5, "rows_per_sec": None,
+                                           "model_bytes": None})
+    report = ReportAgent(session_service).run("s1")["report"]
+    assert "| RSS at end (MB) | RSS change (MB) |" in report
+    assert "| features | 0.500 | 0.400 | 210.0 | -12.5 | - | - |" in report
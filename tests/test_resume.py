@@ -0,0 +1,46 @@
+# test_resume.py
+
+import pytest
+
+from agents.model_agent import ModelAgent
+from core.orchestrator import run_pipeline
+from core.sqlite_session_service import SQLiteSessionService
+
+
+class Preempted(Exception):
+    pass
+
+
+def test_resume_after_a_crash_finishes_the_planned_runs(churn_csv, tmp_path, monkeypatch):
+    db_path = str(tmp_path / "sessions.db")
+    kwargs = dict(session_id="resume_test", n_planned_runs=3, importance=False,
+                  output_path=str(tmp_path / "report.md"), artifact_dir=str(tmp_path / "artifacts"))
+    real_run = ModelAgent.run
+    calls = []
+
+    def crash_on_second_planned_run(self, *args, **kwargs):
+        calls.append(kwargs.get("model_params"))
+        if len(calls) == 3:  # baseline, first planned run, then the process dies
+            raise Preempted()
+        return real_run(self, *args, **kwargs)
+
+    monkeypatch.setattr(ModelAgent, "run", crash_on_second_planned_run)
+    with pytest.raises(Preempted):
+        run_pipeline(churn_csv, "churn", db_path=db_path, **kwargs)
+    crashed = SQLiteSessionService(db_path)
+    assert len(crashed.get_session("resume_test")["experiments"]) == 2
+    crashed.close()
+
+    # A new process: fresh store on the same file, nothing kept in memory
+    calls.clear()
+    monkeypatch.setattr(ModelAgent, "run", lambda self, *a, **kw: calls.append(kw) or real_run(self, *a, **kw))
+    result = run_pipeline(churn_csv, "churn", db_path=db_path, resume=True, **kwargs)
+
+    assert result["status"] == "success"
+    assert len(calls) == 2  # neither the baseline nor the finished planned run is trained again
+    session = SQLiteSessionService(db_path).get_session("resume_test")
+    fingerprints = [exp["fingerprint"] for exp in session["experiments"]]
+    assert len(fingerprints) == 4 and len(set(fingerprints)) == 4
+    assert session["checkpoints"].keys() >= {"intake", "eda", "features", "baseline_model", "planner",
+                                             "planned_experiments"}
+    assert (tmp_path / "artifacts" / "checkpoints" / "resume_test" / "features.joblib").exists()
@@ -0,0 +1,62 @@
+# test_scoring.py
+
+import threading
+
+import pandas as pd
+import pytest
+
+from agents.model_agent import ModelAgent
+from core.scoring import MicroBatcher, Scorer, score_csv
+
+
+@pytest.fixture
+def trained_session(intake_session, tmp_path):
+    session_service, session_id = intake_session
+    agent = ModelAgent(session_service, artifact_dir=str(tmp_path / "artifacts"))
+    assert agent.run(session_id, model_params={"n_estimators": 20})["status"] == "success"
+    return session_service, session_id, str(tmp_path / "artifacts")
+
+
+def _rows(churn_csv: str, n_rows: int) -> list:
+    return pd.read_csv(churn_csv, nrows=n_rows).drop(columns=["churn"]).to_dict("records")
+
+
+def test_score_csv_matches_the_in_memory_scorer(trained_session, churn_csv, tmp_path):
+    session_service, session_id, artifact_dir = trained_session
+    output_path = str(tmp_path / "predictions.csv")
+    result = score_csv(session_service, session_id, churn_csv, output_path, chunksize=300,
+                       id_columns=["customer_id"], artifact_dir=artifact_dir)
+
+    assert result["status"] == "success" and result["rows"] == 1000
+    scored = pd.read_csv(output_path)
+    expected = Scorer.from_session(session_service, session_id, artifact_dir).predict(pd.read_csv(churn_csv))
+    assert list(scored.columns) == ["customer_id", "prediction", "probability"]
+    assert (scored["prediction"].to_numpy() == expected["prediction"].to_numpy()).all()
+
+
+def test_a_bad_request_does_not_fail_its_batch_mates(trained_session, churn_csv):
+    session_service, session_id, artifact_dir = trained_session
+    scorer = Scorer.from_session(session_service, session_id, artifact_dir)
+    good = _rows(churn_csv, 3)
+    bad = [dict(good[0], balance="not a number")]
+    expected = scorer.predict(pd.DataFrame(good)).to_dict("records")
+
+    # A long wait so that both requests land in the same batch
+    batcher = MicroBatcher(scorer, max_wait_ms=500)
+    outcomes = {}
+
+    def submit(name, records):
+        try:
+            outcomes[name] = batcher.submit(records)
+        except Exception as e:
+            outcomes[name] = e
+
+    threads = [threading.Thread(target=submit, args=args) for args in (("good", good), ("bad", bad))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert outcomes["good"] == expected
+    assert isinstance(outcomes["bad"], Exception)
@@ -0,0 +1,71 @@
+# test_search.py
+
+import itertools
+
+from agents.planner_agent import PlannerAgent
+from core.session_service import SessionService
+from tools.search_tools import SearchBudget, config_key, hyperband, sample_configurations, successive_halving
+
+
+def _score(config: dict, resource: float) -> float:
+    # Deeper trees and more data score higher: a known ranking to recover
+    return (config["max_depth"] or 30) / 30 + resource
+
+
+def test_successive_halving_promotes_the_best():
+    configs = sample_configurations(27, random_state=1)
+    history = []
+    rung = successive_halving(configs, _score, 1 / 9, 1.0, eta=3, history=history)
+
+    best = max(configs, key=lambda config: _score(config, 1.0))
+    assert rung[0][1] == 1.0
+    assert _score(rung[0][2], 1.0) == _score(best, 1.0)
+    assert len(history) == 27 + 9 + 3
+
+
+def test_hyperband_scales_brackets_from_n_configs():
+    seeds = itertools.count()
+    history = []
+    hyperband(lambda n: sample_configurations(n, next(seeds)), _score, 1 / 27, 1 / 3, eta=3,
+              history=history, n_configs=54)
+
+    first_rung = [h for h in history if abs(h["resource"] - 1 / 27) < 1e-9]
+    assert len(first_rung) == 54
+    assert len({config_key(h["params"]) for h in history}) >= 54
+
+
+def test_search_stops_when_the_budget_is_spent():
+    budget = SearchBudget(wall_seconds=0.0)
+    history = []
+    seeds = itertools.count()
+    hyperband(lambda n: sample_configurations(n, next(seeds)), _score, 1 / 27, 1 / 3,
+              budget=budget, history=history, n_configs=54)
+    assert history == []
+
+
+def _planner_session() -> tuple:
+    session_service = SessionService()
+    session = session_service.create_session("s1")
+    session["task_type"] = "classification"
+    session_service.add_experiment("s1", {"model_name": "RandomForestClassifier", "score": 0.86,
+                                          "params": {"model": "random_forest", "n_estimators": 100}})
+    return session_service, session
+
+
+def test_planner_keeps_every_ranked_suggestion_without_a_limit():
+    session_service, _ = _planner_session()
+    suggestions = PlannerAgent(session_service).run("s1", n_suggestions=None)["suggestions"]
+    descriptions = [suggestion["description"] for suggestion in suggestions]
+
+    assert suggestions[0]["cost"] == "incremental"
+    assert any("max_depth" in description for description in descriptions)
+    assert any("max_features" in description for description in descriptions)
+    assert {suggestion["model_params"].get("model") for suggestion in suggestions} >= {"hist_gbm", "linear"}
+
+
+def test_planner_trims_to_n_suggestions():
+    session_service, _ = _planner_session()
+    suggestions = PlannerAgent(session_service).run("s1", n_suggestions=2)["suggestions"]
+    assert len(suggestions) == 2
+    assert len(PlannerAgent(session_service).run("s1")["suggestions"]) == 3
+    assert suggestions[0]["model_params"]["n_estimators"] == 200
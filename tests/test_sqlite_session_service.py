@@ -0,0 +1,87 @@
+# test_sqlite_session_service.py
+
+import sqlite3
+import threading
+
+import numpy as np
+
+from agents.intake_agent import IntakeAgent
+from agents.model_agent import ModelAgent
+from core.sqlite_session_service import SQLiteSessionService
+
+
+def _experiment(score: float, fingerprint: str) -> dict:
+    return {"model_name": "RandomForestClassifier", "score": score, "fingerprint": fingerprint,
+            "dataset_hash": "d1", "params": {"model": "random_forest", "n_estimators": 100}}
+
+
+def test_sessions_and_experiments_survive_the_process(tmp_path):
+    db_path = str(tmp_path / "sessions.db")
+    store = SQLiteSessionService(db_path)
+    store.create_session("s1")
+    store.update_session("s1", "target", "churn")
+    store.update_session("s1", "n_rows", np.int64(10))
+    store.add_experiment("s1", _experiment(0.8, "a"))
+    store.add_experiment("s1", _experiment(0.9, "b"))
+    store.close()
+
+    reopened = SQLiteSessionService(db_path)
+    session = reopened.get_session("s1")
+    assert session["target"] == "churn" and session["n_rows"] == 10
+    assert [exp["score"] for exp in session["experiments"]] == [0.8, 0.9]
+    assert session["best_score"] == 0.9
+    assert reopened.lookup_result("b")["score"] == 0.9
+    assert reopened.best_score_for_dataset("d1") == 0.9
+    assert reopened.get_session("missing") is None
+
+
+def test_recreated_session_keeps_old_experiments_as_history_only(tmp_path):
+    store = SQLiteSessionService(str(tmp_path / "sessions.db"))
+    store.create_session("s1")
+    store.add_experiment("s1", _experiment(0.8, "a"))
+    store.create_session("s1")
+    store.close()
+
+    reopened = SQLiteSessionService(str(tmp_path / "sessions.db"))
+    assert len(reopened.get_session("s1")["experiments"]) == 0
+    assert reopened.lookup_result("a") is not None
+
+
+def test_repeated_experiment_is_memoized(churn_csv, tmp_path):
+    store = SQLiteSessionService(str(tmp_path / "sessions.db"))
+    for name in ("first", "second"):
+        store.create_session(name)
+        IntakeAgent(store, artifact_dir=str(tmp_path / "artifacts")).run(name, churn_csv, "churn")
+        ModelAgent(store, artifact_dir=str(tmp_path / "artifacts")).run(name, model_params={"n_estimators": 20})
+
+    first, second = (store.get_session(name)["experiments"][0] for name in ("first", "second"))
+    assert not first.get("memoized") and second["memoized"]
+    assert second["score"] == first["score"]
+
+
+def test_listeners_run_after_the_commit_and_their_errors_are_logged(tmp_path, caplog):
+    db_path = str(tmp_path / "sessions.db")
+    store = SQLiteSessionService(db_path)
+    store.create_session("s1")
+    seen = []
+
+    def check_committed(session_id, record):
+        # A second connection sees the row, and another thread can take the store lock
+        other = sqlite3.connect(db_path)
+        seen.append(other.execute("SELECT COUNT(*) FROM experiments").fetchone()[0])
+        other.close()
+        reader = threading.Thread(target=store.get_session, args=("s1",))
+        reader.start()
+        reader.join(timeout=5)
+        seen.append(reader.is_alive())
+
+    def broken(session_id, record):
+        raise RuntimeError("listener bug")
+
+    store.add_experiment_listener(broken)
+    store.add_experiment_listener(check_committed)
+    store.add_experiment("s1", _experiment(0.8, "a"))
+
+    assert seen == [1, False]
+    assert len(store.get_session("s1")["experiments"]) == 1
+    assert "listener bug" in caplog.text
@@ -0,0 +1,85 @@
+# test_stream_stats.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.stream_stats import HyperLogLog, QuantileSketch, RunningMoments, StreamingProfiler
+
+
+def _frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "amount": rng.normal(100, 15, n_rows),
+        "country": rng.choice(["France", "Spain", "Germany"], n_rows),
+        "customer": np.arange(n_rows),
+        "churn": rng.integers(0, 2, n_rows),
+    })
+
+
+def test_moments_merge_equals_single_pass():
+    values = np.random.default_rng(1).normal(size=10_000)
+    single = RunningMoments()
+    single.update(values)
+    left, right = RunningMoments(), RunningMoments()
+    left.update(values[:3_000])
+    right.update(values[3_000:])
+    left.merge(right)
+
+    assert left.count == single.count
+    assert left.mean == pytest.approx(values.mean())
+    assert left.std == pytest.approx(values.std(ddof=1))
+    assert (left.min, left.max) == (values.min(), values.max())
+
+
+def test_distinct_count_merge_equals_single_pass():
+    values = pd.Series(np.arange(50_000))
+    single = HyperLogLog()
+    single.update(values)
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(values[:20_000])
+    right.update(values[20_000:])
+    left.merge(right)
+
+    np.testing.assert_array_equal(left.registers, single.registers)
+    assert abs(single.count() - 50_000) / 50_000 < 0.05
+
+
+def test_quantile_sketch_is_bounded_and_close():
+    values = np.random.default_rng(2).exponential(size=100_000)
+    sketch = QuantileSketch(max_centroids=256)
+    for chunk in np.array_split(values, 20):
+        sketch.update(chunk)
+    assert len(sketch.means) <= 256
+    for q in (0.25, 0.5, 0.75):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.05)
+
+
+def test_profiler_merge_matches_single_pass():
+    df = _frame(9_000)
+    single = StreamingProfiler("churn")
+    for start in range(0, len(df), 1_000):
+        single.update(df.iloc[start:start + 1_000])
+    left, right = StreamingProfiler("churn"), StreamingProfiler("churn")
+    left.update(df.iloc[:4_000])
+    right.update(df.iloc[4_000:])
+    left.merge(right)
+
+    merged, expected = left.summary(), single.summary()
+    assert merged["shape"] == expected["shape"] == (9_000, 4)
+    assert merged["target_distribution"] == expected["target_distribution"]
+    assert merged["description"]["customer"]["unique"] == expected["description"]["customer"]["unique"]
+    assert merged["description"]["amount"]["mean"] == pytest.approx(df["amount"].mean())
+
+
+def test_dtype_change_between_chunks_does_not_inflate_distinct_counts():
+    # The same 1,000 ids read as int, then float (NaNs appeared), then strings
+    ids = np.arange(1_000)
+    profiler = StreamingProfiler("churn")
+    profiler.update(pd.DataFrame({"id": ids, "churn": 0}))
+    profiler.update(pd.DataFrame({"id": np.append(ids.astype(float), np.nan), "churn": 0}))
+    profiler.update(pd.DataFrame({"id": ids.astype(str).astype(object), "churn": 0}))
+
+    stats = profiler.summary()["description"]["id"]
+    assert abs(stats["unique"] - 1_000) <= 20
+    assert profiler.summary()["missing_values"]["id"] == 1
@@ -0,0 +1,26 @@
+# test_warm_start.py
+
+from sklearn.ensemble import RandomForestClassifier
+
+from agents.model_agent import ModelAgent, can_warm_start
+
+
+def test_can_warm_start_only_when_trees_are_added():
+    previous = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0).fit([[0], [1]], [0, 1])
+    assert can_warm_start(previous, RandomForestClassifier(n_estimators=20, max_depth=4, random_state=0))
+    assert not can_warm_start(previous, RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0))
+    assert not can_warm_start(previous, RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0))
+    assert not can_warm_start(None, RandomForestClassifier(n_estimators=20))
+
+
+def test_growing_the_forest_reuses_the_fitted_trees(intake_session, tmp_path):
+    session_service, session_id = intake_session
+    agent = ModelAgent(session_service, artifact_dir=str(tmp_path / "artifacts"))
+    assert agent.run(session_id, model_params={"n_estimators": 20})["status"] == "success"
+    assert agent.run(session_id, model_params={"n_estimators": 30})["status"] == "success"
+
+    first, second = session_service.get_session(session_id)["experiments"]
+    assert not first["warm_started"] and first["trees_fitted"] == 20
+    assert second["warm_started"] and second["trees_fitted"] == 10
+    model, best = agent.load_best_model(session_id)
+    assert len(model.estimators_) == best["params"]["n_estimators"]
@@ -0,0 +1,77 @@
+# cv_tools.py
+
+import math
+
+import numpy as np
+from sklearn.model_selection import KFold, StratifiedKFold
+
+
+def normalize_cv(cv) -> dict | None:
+    """Accept None, a fold count or {"n_splits", "n_repeats"} and return the dict form."""
+    if cv is None or cv is False:
+        return None
+    if isinstance(cv, int):
+        cv = {"n_splits": cv}
+    n_splits = int(cv.get("n_splits", 5))
+    if n_splits < 2:
+        raise ValueError("Cross-validation needs n_splits >= 2")
+    return {"n_splits": n_splits, "n_repeats": int(cv.get("n_repeats", 1))}
+
+
+def fold_assignments(y, task_type: str, n_splits: int = 5, n_repeats: int = 1,
+                     random_state: int = 42) -> np.ndarray:
+    """
+    Fold id of every row for each repeat, shape (n_repeats, n_rows), int8.
+    Classification folds are stratified (falling back to plain k-fold when a
+    class has fewer than n_splits rows); each repeat reshuffles.
+    """
+    y = np.asarray(y)
+    assignments = np.empty((n_repeats, len(y)), dtype=np.int8)
+    _, class_counts = np.unique(y, return_counts=True)
+    stratify = task_type == "classification" and class_counts.min() >= n_splits
+    for repeat in range(n_repeats):
+        splitter_class = StratifiedKFold if stratify else KFold
+        splitter = splitter_class(n_splits=n_splits, shuffle=True, random_state=random_state + repeat)
+        for fold, (_, val_rows) in enumerate(splitter.split(np.zeros(len(y)), y)):
+            assignments[repeat, val_rows] = fold
+    return assignments
+
+
+def fold_rows(assignments: np.ndarray, repeat: int, fold: int) -> tuple:
+    """(train rows, validation rows) of one fold."""
+    in_fold = assignments[repeat] == fold
+    return np.nonzero(~in_fold)[0], np.nonzero(in_fold)[0]
+
+
+def score_summary(scores: list) -> tuple:
+    """Mean and sample standard deviation of fold scores."""
+    scores = np.asarray(scores, dtype=np.float64)
+    std = float(scores.std(ddof=1)) if len(scores) > 1 else 0.0
+    return float(scores.mean()), std
+
+
+def clearly_worse(scores: list, best_mean: float | None, min_folds: int = 2, z: float = 2.0) -> bool:
+    """
+    True when the upper confidence bound of the mean fold score (mean + z standard
+    errors) after at least `min_folds` folds is still below the best mean so far.
+    """
+    if best_mean is None or len(scores) < min_folds:
+        return False
+    mean, std = score_summary(scores)
+    return mean + z * std / math.sqrt(len(scores)) < best_mean
+
+
+def project_score(sizes: list, scores: list, full_size: int) -> float:
+    """
+    Optimistic projection of the score at `full_size` training rows from scores
+    on nested subsamples of `sizes` rows: a least-squares line in log(size),
+    extrapolated from the largest subsample. A falling curve (noise) projects
+    the best observed score. Real learning curves flatten faster than log-linear
+    growth, so the projection errs on the side of training the full model.
+    """
+    log_sizes = np.log(np.asarray(sizes, dtype=np.float64))
+    scores = np.asarray(scores, dtype=np.float64)
+    slope = 0.0
+    if len(scores) > 1 and np.ptp(log_sizes) > 0:
+        slope = max(0.0, float(np.polyfit(log_sizes, scores, 1)[0]))
+    return float(scores.max() + slope * max(0.0, math.log(full_size) - log_sizes[-1]))
@@ -1,17 +1,249 @@
 
+import hashlib
+import os
+import threading
+from collections import defaultdict
+
+import numpy as np
 import pandas as pd
+from scipy import sparse
 from sklearn.model_selection import train_test_split
 
+from tools.encoding_tools import FeatureEncoder
+
+COLUMNAR_EXTENSIONS = (".feather", ".arrow", ".parquet")
+
+
+def _read_file(path: str, dtypes: dict | None = None) -> pd.DataFrame:
+    """
+    Read CSV, Feather/Arrow (memory-mapped) or Parquet based on the file extension.
+    dtypes: optional column -> dtype map for CSVs (see `infer_dtypes`), so pandas
+    skips type guessing. If the map does not fit the full file (e.g. an integer
+    column with missing values past the inferred prefix), the CSV is re-read
+    with inference.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".feather", ".arrow"):
+        import pyarrow.feather as feather
+        # Uncompressed Arrow IPC files are memory-mapped, so numeric columns
+        # are backed by the page cache instead of being copied into the heap
+        table = feather.read_table(path, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    if dtypes:
+        try:
+            return pd.read_csv(path, dtype=dtypes)
+        except (ValueError, TypeError):
+            pass
+    return pd.read_csv(path)
 
-def load_dataset(csv_path: str) -> pd.DataFrame:
+
+def load_dataset(path: str, cache=None, dtypes: dict | None = None) -> pd.DataFrame:
     """
-    Load a tabular dataset from a CSV file.
+    Load a tabular dataset from a CSV file or a columnar artifact
+    (Feather/Arrow or Parquet) written by `write_columnar`.
     This acts as a simple 'custom tool' used by agents.
+
+    cache: optional DatasetCache; when given, the file is parsed only once
+    and later calls return the same (read-only) DataFrame.
+    dtypes: optional CSV dtype map recorded at intake.
     """
-    df = pd.read_csv(csv_path)
+    if cache is not None:
+        return cache.get_or_load(path, lambda p: _read_file(p, dtypes))
+    df = _read_file(path, dtypes)
     return df
 
 
+# One lock per dataset so concurrent stages parse a CSV only once
+_LOAD_LOCKS = defaultdict(threading.Lock)
+_LOAD_LOCKS_GUARD = threading.Lock()
+
+
+def load_session_dataset(session_service, session_id: str) -> pd.DataFrame:
+    """
+    Full load of a session's dataset, shared by the agents that need every row.
+    Uses the columnar artifact when one exists. Otherwise the CSV is parsed once
+    with the dtype map recorded at intake, written to the session's
+    `artifact_path` for later runs (replacing the artifacts of older versions of the
+    CSV), and `data_path` is pointed at the artifact.
+    """
+    session = session_service.get_session(session_id)
+    cache = session_service.dataset_cache
+    dataset_path = session["dataset_path"]
+
+    with _LOAD_LOCKS_GUARD:
+        lock = _LOAD_LOCKS[os.path.abspath(dataset_path)]
+    with lock:
+        data_path = session.get("data_path") or dataset_path
+        if data_path.lower().endswith(COLUMNAR_EXTENSIONS):
+            return load_dataset(data_path, cache=cache)
+
+        # The optimized frame is cached once, under the artifact's key (or the CSV's
+        # when no artifact could be written), never under both
+        csv_key = cache.make_key(data_path)
+        df = cache.get(csv_key)
+        if df is not None:
+            return df
+        df = optimize_dtypes(load_dataset(data_path, dtypes=session.get("dtypes")))
+        artifact_path = session.get("artifact_path")
+        if artifact_path and write_columnar(df, artifact_path):
+            prune_columnar_artifacts(artifact_path)
+            cache.put(cache.make_key(artifact_path), df)
+            session_service.update_session(session_id, "data_path", artifact_path)
+        else:
+            cache.put(csv_key, df)
+        return df
+
+
+def read_prefix(path: str, n_rows: int = 10_000) -> pd.DataFrame:
+    """First `n_rows` rows of a CSV or columnar dataset, without reading the rest."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in COLUMNAR_EXTENSIONS:
+        return next(iter_dataset_chunks(path, chunksize=n_rows))
+    return pd.read_csv(path, nrows=n_rows)
+
+
+def infer_dtypes(prefix: pd.DataFrame, max_category_ratio: float = 0.5) -> dict:
+    """
+    Column -> dtype map for `pd.read_csv(dtype=...)`, inferred from a prefix.
+    Repeating string columns become `category` (as in `optimize_dtypes`);
+    other string columns are left to pandas.
+    """
+    n_rows = max(len(prefix), 1)
+    dtypes = {}
+    for col in prefix.columns:
+        series = prefix[col]
+        if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            if series.nunique(dropna=True) <= max_category_ratio * n_rows:
+                dtypes[col] = "category"
+        else:
+            dtypes[col] = str(series.dtype)
+    return dtypes
+
+
+def scan_file(path: str, block_size: int = 1 << 20) -> dict:
+    """
+    Single read pass over a file: BLAKE2b content hash and data row count.
+    CSV rows are counted by scanning for newlines (header excluded; quoted
+    fields containing newlines are over-counted). Columnar files take the row
+    count from their metadata.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    newlines = 0
+    last = b""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+            newlines += block.count(b"\n")
+            last = block
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".feather", ".arrow"):
+        import pyarrow as pa
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    elif ext == ".parquet":
+        import pyarrow.parquet as pq
+        rows = pq.ParquetFile(path).metadata.num_rows
+    else:
+        # A last line without a trailing newline is still a row
+        lines = newlines + (1 if last and not last.endswith(b"\n") else 0)
+        rows = max(lines - 1, 0)
+    return {"hash": digest.hexdigest(), "rows": rows}
+
+
+def iter_dataset_chunks(path: str, chunksize: int = 100_000):
+    """
+    Yield the dataset as DataFrame chunks of about `chunksize` rows, without
+    ever holding the whole file in memory (CSV, Feather/Arrow or Parquet).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".feather", ".arrow"):
+        import pyarrow as pa
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                for offset in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(offset, chunksize).to_pandas()
+    elif ext == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def optimize_dtypes(df: pd.DataFrame, max_category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Convert string columns to `category` when they repeat enough
+    (unique values <= max_category_ratio * rows). This removes most of the
+    memory held by object-dtype columns.
+    """
+    n_rows = max(len(df), 1)
+    converted = {}
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            if series.nunique(dropna=True) <= max_category_ratio * n_rows:
+                converted[col] = series.astype("category")
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def columnar_artifact_path(csv_path: str, artifact_dir: str) -> str:
+    """
+    Path of the columnar artifact for a CSV file: <stem>-<path hash>-<version hash>.feather.
+    The version hash covers (mtime, size) so a modified CSV gets a new artifact;
+    the path hash lets prune_columnar_artifacts find the older versions.
+    """
+    csv_path = os.path.abspath(csv_path)
+    stat = os.stat(csv_path)
+    path_digest = hashlib.sha1(csv_path.encode("utf-8")).hexdigest()[:12]
+    version_digest = hashlib.sha1(f"{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8")).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(artifact_dir, f"{stem}-{path_digest}-{version_digest}.feather")
+
+
+def prune_columnar_artifacts(artifact_path: str) -> list:
+    """
+    Delete the artifacts of older versions of the same CSV next to `artifact_path`
+    (same <stem>-<path hash>- prefix), so only the current one is kept on disk.
+    Returns the removed paths.
+    """
+    directory, name = os.path.split(artifact_path)
+    prefix = name.rsplit("-", 1)[0] + "-"
+    removed = []
+    for other in os.listdir(directory or "."):
+        if other != name and other.startswith(prefix) and other.endswith(".feather"):
+            try:
+                os.remove(os.path.join(directory, other))
+            except OSError:
+                continue
+            removed.append(os.path.join(directory, other))
+    return removed
+
+
+def write_columnar(df: pd.DataFrame, out_path: str) -> str | None:
+    """
+    Write a DataFrame as an uncompressed Feather (Arrow IPC) file so it can be
+    memory-mapped by later loads. Returns the path, or None if pyarrow is unavailable.
+    """
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
 def detect_task_type(df: pd.DataFrame, target_col: str) -> str:
     """
     Very simple heuristic to decide if task is classification or regression.
@@ -29,28 +261,80 @@ def basic_train_val_split(df: pd.DataFrame, target_col: str, test_size: float =
     """
     Split the dataset into train/validation sets.
     Uses stratify only when it's safe to do so.
+    Categorical columns are encoded after the split by a FeatureEncoder fitted
+    on the training rows (float32 or CSR matrices).
     Returns: X_train, X_val, y_train, y_val
     """
-    X = df.drop(columns=[target_col])
+    features = prepare_features(df, target_col, test_size=test_size, random_state=random_state)
+    return features["X_train"], features["X_val"], features["y_train"], features["y_val"]
+
+
+def prepare_features(df: pd.DataFrame, target_col: str, test_size: float = 0.2, random_state: int = 42,
+                     encoder: FeatureEncoder | None = None) -> dict:
+    """
+    Split the dataset and encode it once into train/validation blocks that every
+    experiment can reuse (same stratification rule as basic_train_val_split).
+    The encoder is fitted on the training rows only and applied to the
+    validation rows, so category levels and target statistics never leak.
+    Returns a dict with X_train, X_val, y_train, y_val, train_idx, val_idx,
+    feature_names and the fitted encoder.
+    """
     y = df[target_col]
-    # Encoding Categorical columns into Numbers
-    X = pd.get_dummies(X, drop_first=True)
+    X = df.drop(columns=[target_col])
 
     n_samples = len(df)
     n_classes = y.nunique()
 
-    # Decide whether stratify is safe
     stratify_target = None
     if n_classes > 1:
         test_count = int(n_samples * test_size)
         if test_count >= n_classes:
-            stratify_target = y  # safe to stratify
+            stratify_target = y
 
-    X_train, X_val, y_train, y_val = train_test_split(
-        X,
-        y,
+    train_idx, val_idx = train_test_split(
+        np.arange(n_samples),
         test_size=test_size,
         random_state=random_state,
         stratify=stratify_target
     )
-    return X_train, X_val, y_train, y_val
+    y_values = y.to_numpy()
+
+    encoder = encoder or FeatureEncoder(random_state=random_state)
+    X_train, feature_names = encoder.fit_transform(X.iloc[train_idx], y_values[train_idx])
+    X_val = encoder.transform(X.iloc[val_idx])
+
+    return {
+        "X_train": X_train,
+        "X_val": X_val,
+        "y_train": y_values[train_idx],
+        "y_val": y_values[val_idx],
+        "train_idx": train_idx,
+        "val_idx": val_idx,
+        "feature_names": feature_names,
+        "encoder": encoder,
+        "test_size": test_size,
+        "random_state": random_state,
+    }
+
+
+def stratified_order(y: np.ndarray, random_state: int = 42) -> np.ndarray:
+    """
+    Return a permutation of row positions such that every prefix is (close to)
+    stratified by `y`. Taking the first k rows gives a nested, stratified
+    subsample of size k, so growing subsamples reuse the smaller ones.
+    """
+    rng = np.random.default_rng(random_state)
+    y = np.asarray(y)
+    n = len(y)
+    # Regression targets (many distinct values) are just shuffled
+    if n == 0 or len(np.unique(y)) > max(2, n // 10):
+        return rng.permutation(n)
+
+    _, codes = np.unique(y, return_inverse=True)
+    position = np.empty(n, dtype=np.float64)
+    for cls in range(codes.max() + 1):
+        members = np.nonzero(codes == cls)[0]
+        rng.shuffle(members)
+        # Spread each class evenly over [0, 1): the i-th member goes to (i + u) / size
+        position[members] = (np.arange(len(members)) + rng.random()) / len(members)
+    return np.argsort(position, kind="stable")
@@ -0,0 +1,126 @@
+# eda_tools.py
+
+import math
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+Z_95 = 1.96
+
+
+class LazySummary(Mapping):
+    """
+    Read-only mapping whose values are computed on first access.
+    `factories` maps each key to a callable taking the frame; `loader` returns
+    the frame and is called per computation (e.g. through the DatasetCache), so
+    the summary never keeps the frame alive itself. Keys that are never read
+    (e.g. an expensive description nobody renders) are never computed, and the
+    loader and factories are dropped once every field is.
+    """
+
+    def __init__(self, factories: dict, loader):
+        self._keys = tuple(factories)
+        self._factories = dict(factories)
+        self._loader = loader
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            if key not in self._keys:
+                raise KeyError(key)
+            with self._lock:
+                if key not in self._values:
+                    self._values[key] = self._factories.pop(key)(self._loader())
+                    if not self._factories:
+                        self._loader = None
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def materialized(self) -> dict:
+        """Only the fields computed so far (used when persisting the session)."""
+        return dict(self._values)
+
+    def materialize(self, keys=None) -> dict:
+        """Compute `keys` (default: every field) now and return them as a plain dict."""
+        return {key: self[key] for key in (self if keys is None else keys)}
+
+    def to_dict(self) -> dict:
+        """Compute every field and return a plain dict."""
+        return self.materialize()
+
+    def __repr__(self):
+        fields = ", ".join(f"{key!r}: {self._values[key]!r}" if key in self._values else f"{key!r}: <not computed>"
+                           for key in self._keys)
+        return f"LazySummary({{{fields}}})"
+
+
+def stratified_sample(df: pd.DataFrame, target_col: str, n_rows: int, random_state: int = 42) -> pd.DataFrame:
+    """
+    Row sample of about `n_rows`, stratified by the target when it looks
+    categorical (proportional allocation). Returns `df` itself when it is small.
+    """
+    if len(df) <= n_rows:
+        return df
+    frac = n_rows / len(df)
+    target = df[target_col]
+    if target.nunique() <= 30:
+        return df.groupby(target, group_keys=False, observed=True).sample(frac=frac, random_state=random_state)
+    return df.sample(n=n_rows, random_state=random_state)
+
+
+def sampled_description(df: pd.DataFrame, target_col: str, sample_rows: int = 20_000,
+                        random_state: int = 42) -> dict:
+    """
+    describe()-style statistics from a stratified row sample, with 95% confidence
+    bounds for means (numeric columns) and for the top value's share (categorical
+    columns). Counts are scaled back to the full row count.
+    """
+    sample = stratified_sample(df, target_col, sample_rows, random_state)
+    n, total = len(sample), len(df)
+    # Finite population correction: the bounds shrink to zero for a full pass
+    fpc = math.sqrt(max(total - n, 0) / (total - 1)) if total > 1 else 0.0
+    scale = total / n if n else 0.0
+
+    description = {}
+    for col in sample.columns:
+        values = sample[col].dropna()
+        stats = {"sample_rows": n, "count": round(len(values) * scale)}
+        if len(values) == 0:
+            description[col] = stats
+            continue
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            arr = values.to_numpy(dtype=np.float64)
+            mean = float(arr.mean())
+            std = float(arr.std(ddof=1)) if len(arr) > 1 else 0.0
+            half_width = Z_95 * std / math.sqrt(len(arr)) * fpc
+            q25, q50, q75 = np.percentile(arr, [25, 50, 75])
+            stats.update({
+                "mean": mean,
+                "mean_ci95": (mean - half_width, mean + half_width),
+                "std": std,
+                "min": float(arr.min()),
+                "25%": float(q25),
+                "50%": float(q50),
+                "75%": float(q75),
+                "max": float(arr.max()),
+            })
+        else:
+            counts = values.value_counts()
+            share = float(counts.iloc[0] / len(values))
+            half_width = Z_95 * math.sqrt(share * (1 - share) / len(values)) * fpc
+            stats.update({
+                "unique_in_sample": int(len(counts)),
+                "top": counts.index[0],
+                "top_share": share,
+                "top_share_ci95": (max(0.0, share - half_width), min(1.0, share + half_width)),
+            })
+        description[col] = stats
+    return description
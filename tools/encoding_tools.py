@@ -0,0 +1,230 @@
+# encoding_tools.py
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def _is_categorical_column(series: pd.Series) -> bool:
+    return (isinstance(series.dtype, pd.CategoricalDtype)
+            or series.dtype == object
+            or pd.api.types.is_string_dtype(series.dtype))
+
+
+def _as_category(series: pd.Series, categories) -> np.ndarray:
+    """Integer codes of `series` against a fixed category list (-1 for unseen or missing)."""
+    return pd.Categorical(series, categories=categories).codes.astype(np.int64)
+
+
+def _hash_buckets(series: pd.Series, n_buckets: int) -> np.ndarray:
+    # pandas' hash is seeded with a fixed key, so buckets are stable across processes
+    values = np.asarray(series.astype(str), dtype=object)
+    return (pd.util.hash_array(values) % np.uint64(n_buckets)).astype(np.int64)
+
+
+class FeatureEncoder:
+    """
+    Per-column categorical encoder fitted on the training fold only.
+
+    Each categorical column gets a strategy from its training cardinality:
+    - "onehot": up to `max_onehot` levels; drop_first layout like pd.get_dummies
+    - "ordinal": up to `max_ordinal` levels; one column of category codes
+    - "target": more levels, binary or regression target; smoothed target mean,
+      computed out-of-fold for the training rows so they never see their own label
+    - "frequency": more levels otherwise; share of training rows with the value
+    - "hashing": ID-like columns (distinct ratio >= `id_ratio`); `hash_buckets`
+      sparse indicator columns, bounded width whatever the cardinality
+    Numeric columns pass through. Unseen values map to the all-zeros level, the
+    prior or a zero frequency, so validation and scoring data never fail.
+
+    transform returns a C-contiguous float32 array, or a CSR matrix when the
+    indicator columns (one-hot and hashing) are wider than `sparse_min_columns`.
+    """
+
+    def __init__(self, max_onehot: int = 32, max_ordinal: int = 1024, id_ratio: float = 0.5,
+                 hash_buckets: int = 64, smoothing: float = 20.0, n_folds: int = 5,
+                 sparse_min_columns: int = 256, strategies: dict | None = None, random_state: int = 42):
+        self.max_onehot = max_onehot
+        self.max_ordinal = max_ordinal
+        self.id_ratio = id_ratio
+        self.hash_buckets = hash_buckets
+        self.smoothing = smoothing
+        self.n_folds = n_folds
+        self.sparse_min_columns = sparse_min_columns
+        self.strategies = dict(strategies or {})
+        self.random_state = random_state
+        self.columns = []
+        self.numeric_cols = []
+        self.encodings = {}
+        self.feature_names = []
+
+    def _choose(self, col, series: pd.Series, y_kind: str | None) -> str:
+        if col in self.strategies:
+            return self.strategies[col]
+        n_unique = series.nunique(dropna=True)
+        if n_unique <= self.max_onehot:
+            return "onehot"
+        if n_unique <= self.max_ordinal:
+            return "ordinal"
+        if n_unique >= self.id_ratio * max(len(series), 1):
+            return "hashing"
+        return "target" if y_kind in ("binary", "regression") else "frequency"
+
+    @staticmethod
+    def _target_kind(y) -> tuple:
+        """Return (kind, numeric target) where kind is binary, regression or multiclass."""
+        if y is None:
+            return None, None
+        y = pd.Series(np.asarray(y))
+        if pd.api.types.is_numeric_dtype(y.dtype) and y.nunique() > 20:
+            return "regression", y.to_numpy(dtype=np.float64)
+        classes = np.unique(y.to_numpy())
+        if len(classes) == 2:
+            return "binary", (y.to_numpy() == classes[1]).astype(np.float64)
+        return "multiclass", None
+
+    def _smoothed_means(self, codes: np.ndarray, n_levels: int, target: np.ndarray, prior: float) -> np.ndarray:
+        mask = codes >= 0
+        sums = np.bincount(codes[mask], weights=target[mask], minlength=n_levels)
+        counts = np.bincount(codes[mask], minlength=n_levels)
+        return (sums + self.smoothing * prior) / (counts + self.smoothing)
+
+    def fit_transform(self, X: pd.DataFrame, y=None):
+        """Fit on the training fold and return (matrix, feature_names) for it."""
+        self.columns = list(X.columns)
+        self.numeric_cols = [c for c in X.columns if not _is_categorical_column(X[c])]
+        y_kind, target = self._target_kind(y)
+        prior = float(target.mean()) if target is not None and len(target) else 0.0
+
+        self.encodings = {}
+        train_target_codes = {}
+        for col in X.columns:
+            if col in self.numeric_cols:
+                continue
+            series = X[col]
+            strategy = self._choose(col, series, y_kind)
+            encoding = {"strategy": strategy}
+            if strategy in ("onehot", "ordinal", "target", "frequency"):
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    present = set(series.cat.remove_unused_categories().cat.categories)
+                    categories = [c for c in series.cat.categories if c in present]
+                else:
+                    categories = sorted(series.dropna().unique().tolist())
+                encoding["categories"] = pd.Index(categories)
+                codes = _as_category(series, encoding["categories"])
+                if strategy == "frequency":
+                    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+                    encoding["values"] = counts / max(len(series), 1)
+                elif strategy == "target":
+                    encoding["values"] = self._smoothed_means(codes, len(categories), target, prior)
+                    encoding["prior"] = prior
+                    train_target_codes[col] = codes
+            self.encodings[col] = encoding
+
+        self._layout()
+
+        # Training rows get out-of-fold target means so they never see their own label
+        overrides = {}
+        if train_target_codes:
+            rng = np.random.default_rng(self.random_state)
+            folds = rng.integers(0, self.n_folds, len(X))
+            for col, codes in train_target_codes.items():
+                n_levels = len(self.encodings[col]["categories"])
+                oof = np.empty(len(X), dtype=np.float32)
+                for fold in range(self.n_folds):
+                    held = folds == fold
+                    means = self._smoothed_means(codes[~held], n_levels, target[~held], prior)
+                    held_codes = codes[held]
+                    oof[held] = np.where(held_codes >= 0, means[np.maximum(held_codes, 0)], prior)
+                overrides[col] = oof
+        return self._encode(X, overrides), list(self.feature_names)
+
+    def _layout(self):
+        """Assign output column positions: numeric, then single-column encodings, then indicators."""
+        names = [str(c) for c in self.numeric_cols]
+        for col, encoding in self.encodings.items():
+            if encoding["strategy"] in ("ordinal", "target", "frequency"):
+                encoding["offset"] = len(names)
+                names.append(f"{col}__{encoding['strategy']}")
+        self.n_dense = len(names)
+        width = 0
+        for col, encoding in self.encodings.items():
+            if encoding["strategy"] == "onehot":
+                encoding["offset"] = width
+                # drop_first: category 0 becomes the all-zeros reference level
+                names.extend(f"{col}_{value}" for value in encoding["categories"][1:])
+                width += max(len(encoding["categories"]) - 1, 0)
+            elif encoding["strategy"] == "hashing":
+                encoding["offset"] = width
+                names.extend(f"{col}__hash{i}" for i in range(self.hash_buckets))
+                width += self.hash_buckets
+        self.indicator_width = width
+        self.feature_names = names
+
+    def transform(self, X: pd.DataFrame):
+        """Encode new rows (validation fold, scoring data) with the fitted mappings."""
+        missing = [c for c in self.columns if c not in X.columns]
+        if missing:
+            raise ValueError(f"Missing columns for encoding: {missing}")
+        return self._encode(X)
+
+    def _encode(self, X: pd.DataFrame, overrides: dict | None = None):
+        overrides = overrides or {}
+        n_rows = len(X)
+        dense = np.zeros((n_rows, self.n_dense), dtype=np.float32, order="C")
+        if self.numeric_cols:
+            dense[:, :len(self.numeric_cols)] = X[self.numeric_cols].to_numpy(dtype=np.float32)
+
+        indicators = []  # (row positions, indicator columns)
+        for col, encoding in self.encodings.items():
+            strategy = encoding["strategy"]
+            if col in overrides:
+                dense[:, encoding["offset"]] = overrides[col]
+                continue
+            if strategy == "hashing":
+                buckets = _hash_buckets(X[col], self.hash_buckets)
+                indicators.append((np.arange(n_rows), buckets + encoding["offset"]))
+                continue
+            codes = _as_category(X[col], encoding["categories"])
+            if strategy == "onehot":
+                codes = codes - 1
+                mask = codes >= 0
+                indicators.append((np.nonzero(mask)[0], codes[mask] + encoding["offset"]))
+            elif strategy == "ordinal":
+                dense[:, encoding["offset"]] = codes
+            else:
+                fallback = encoding.get("prior", 0.0)
+                dense[:, encoding["offset"]] = np.where(codes >= 0, encoding["values"][np.maximum(codes, 0)],
+                                                        fallback)
+
+        rows = np.concatenate([r for r, _ in indicators]) if indicators else np.empty(0, np.int64)
+        cols = np.concatenate([c for _, c in indicators]) if indicators else np.empty(0, np.int64)
+
+        use_sparse = self.indicator_width > self.sparse_min_columns or any(
+            e["strategy"] == "hashing" for e in self.encodings.values())
+        if use_sparse:
+            onehot = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                                       shape=(n_rows, self.indicator_width))
+            return sparse.hstack([sparse.csr_matrix(dense), onehot], format="csr", dtype=np.float32)
+
+        matrix = np.zeros((n_rows, self.n_dense + self.indicator_width), dtype=np.float32, order="C")
+        matrix[:, :self.n_dense] = dense
+        matrix[rows, self.n_dense + cols] = 1.0
+        return matrix
+
+    def summary(self) -> dict:
+        """Strategy chosen for each categorical column."""
+        return {col: encoding["strategy"] for col, encoding in self.encodings.items()}
+
+    def column_groups(self) -> dict:
+        """Output matrix column positions produced by each input column (one-hot/hash blocks grouped)."""
+        groups = {col: [i] for i, col in enumerate(self.numeric_cols)}
+        for col, encoding in self.encodings.items():
+            strategy = encoding["strategy"]
+            if strategy in ("ordinal", "target", "frequency"):
+                groups[col] = [encoding["offset"]]
+            else:
+                width = self.hash_buckets if strategy == "hashing" else max(len(encoding["categories"]) - 1, 0)
+                start = self.n_dense + encoding["offset"]
+                groups[col] = list(range(start, start + width))
+        return {col: groups[col] for col in self.columns if col in groups}
@@ -0,0 +1,48 @@
+# importance_tools.py
+
+import numpy as np
+from scipy import sparse
+
+from tools.model_registry import predict_model
+
+
+def _permuted_copies(X, columns: list, permutations: list):
+    """
+    One matrix holding len(permutations) copies of X stacked vertically, with the
+    rows of `columns` shuffled by each permutation (the group moves as a block).
+    """
+    if sparse.issparse(X):
+        mask = np.zeros(X.shape[1], dtype=np.float32)
+        mask[columns] = 1.0
+        keep = X @ sparse.diags(1.0 - mask)
+        moved = X @ sparse.diags(mask)
+        return sparse.vstack([keep + moved[perm] for perm in permutations], format="csr")
+    stacked = np.tile(X, (len(permutations), 1))
+    n_rows = X.shape[0]
+    for i, perm in enumerate(permutations):
+        stacked[i * n_rows:(i + 1) * n_rows, columns] = X[perm][:, columns]
+    return stacked
+
+
+def group_importance(model, score, X, y, columns: list, baseline: float, n_repeats: int = 5,
+                     random_state: int = 42, max_batch_rows: int = 200_000) -> dict:
+    """
+    Permutation importance of one column group: the mean (and std) drop of the
+    validation score (`score(y_true, y_pred)`) over n_repeats shuffles. The
+    shuffled copies are predicted in batches of up to `max_batch_rows` rows
+    instead of one predict call per repeat.
+    """
+    rng = np.random.default_rng(random_state)
+    n_rows = X.shape[0]
+    permutations = [rng.permutation(n_rows) for _ in range(n_repeats)]
+    per_batch = max(1, max_batch_rows // max(n_rows, 1))
+    y = np.asarray(y)
+
+    scores = []
+    for start in range(0, n_repeats, per_batch):
+        batch = permutations[start:start + per_batch]
+        predictions = predict_model(model, _permuted_copies(X, columns, batch))
+        for i in range(len(batch)):
+            scores.append(score(y, predictions[i * n_rows:(i + 1) * n_rows]))
+    drops = baseline - np.asarray(scores)
+    return {"importance": float(drops.mean()), "std": float(drops.std()), "scores": scores}
@@ -0,0 +1,177 @@
+# model_registry.py
+
+import os
+from contextlib import nullcontext
+
+from scipy import sparse
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import (
+    RandomForestClassifier, RandomForestRegressor,
+    HistGradientBoostingClassifier, HistGradientBoostingRegressor
+)
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+
+DEFAULT_FAMILY = "random_forest"
+
+# Model family -> how to build, fit and size it.
+#   classifier / regressor: callables taking the family's params
+#   classes: final estimator classes, to recognise a built model's family
+#   defaults: params applied unless the experiment overrides them
+#   threads: constructor param controlling threads (None: OpenMP/BLAS, set with threadpoolctl)
+#   size_param: param that scales training cost (scaled down for subsample evaluation)
+#   dense_only: estimator does not accept sparse input
+MODEL_REGISTRY = {}
+
+
+def register_model(family: str, classifier, regressor, defaults: dict | None = None, threads: str | None = None,
+                   size_param: str | None = None, dense_only: bool = False,
+                   classes: tuple | None = None):
+    """
+    Add (or replace) a model family available to ModelAgent and the planner.
+    `classes` is only needed when classifier/regressor are factory functions.
+    """
+    MODEL_REGISTRY[family] = {
+        "classifier": classifier,
+        "regressor": regressor,
+        "classes": tuple(classes or (classifier, regressor)),
+        "defaults": dict(defaults or {}),
+        "threads": threads,
+        "size_param": size_param,
+        "dense_only": dense_only,
+    }
+
+
+def _scaled_linear(estimator_class):
+    # Scaling without centering keeps sparse one-hot blocks sparse
+    def build(**params):
+        return make_pipeline(StandardScaler(with_mean=False), estimator_class(**params))
+    return build
+
+
+register_model("random_forest", RandomForestClassifier, RandomForestRegressor,
+               defaults={"n_estimators": 100, "random_state": 42},
+               threads="n_jobs", size_param="n_estimators")
+register_model("hist_gbm", HistGradientBoostingClassifier, HistGradientBoostingRegressor,
+               # Early stopping monitors a holdout carved out of the training rows
+               # (validation_fraction), never the validation split that scores the model
+               defaults={"max_iter": 300, "learning_rate": 0.1, "early_stopping": True,
+                         "validation_fraction": 0.1, "n_iter_no_change": 10, "random_state": 42},
+               size_param="max_iter", dense_only=True)
+register_model("linear", _scaled_linear(LogisticRegression), _scaled_linear(Ridge),
+               defaults={"max_iter": 1000}, classes=(LogisticRegression, Ridge))
+
+
+def default_threads(n_workers: int = 1) -> int:
+    """Threads per model when `n_workers` models train at once: share the cores, at least one."""
+    return max(1, (os.cpu_count() or 1) // max(1, n_workers))
+
+
+def _column_dropper(columns: list) -> ColumnTransformer:
+    # Passes every other column through in order; sparse input stays sparse
+    return ColumnTransformer([("drop", "drop", list(columns))], remainder="passthrough",
+                             sparse_threshold=1.0)
+
+
+def build_model(task_type: str, model_params: dict, n_threads: int | None = None):
+    """
+    Create the estimator for a task type. `model_params["model"]` selects the
+    family (default random_forest); the other keys override the family defaults.
+    `model_params["drop_columns"]` (feature matrix positions) puts a column
+    dropper in front of the estimator.
+    n_threads, when given, sets the family's thread param over any value in the
+    params: the thread count depends on where the model trains, not on the experiment.
+    """
+    params = dict(model_params)
+    family = params.pop("model", DEFAULT_FAMILY)
+    drop_columns = params.pop("drop_columns", None)
+    if family not in MODEL_REGISTRY:
+        raise ValueError(f"Unknown model family '{family}' (known: {sorted(MODEL_REGISTRY)})")
+    spec = MODEL_REGISTRY[family]
+    combined_params = {**spec["defaults"], **params}
+    if spec["threads"] and n_threads:
+        combined_params[spec["threads"]] = n_threads
+    builder = spec["classifier"] if task_type == "classification" else spec["regressor"]
+    model = builder(**combined_params)
+    if drop_columns:
+        steps = model.steps if isinstance(model, Pipeline) else [("estimator", model)]
+        model = Pipeline([("drop_columns", _column_dropper(drop_columns))] + steps)
+    return model
+
+
+def dropped_columns(model) -> list:
+    """Feature matrix positions a model built with `drop_columns` ignores."""
+    if isinstance(model, Pipeline) and "drop_columns" in model.named_steps:
+        return list(model.named_steps["drop_columns"].transformers[0][2])
+    return []
+
+
+def final_estimator(model):
+    return model.steps[-1][1] if isinstance(model, Pipeline) else model
+
+
+def model_family(model) -> str:
+    """Registry family of a built estimator."""
+    estimator_class = type(final_estimator(model))
+    for family, spec in MODEL_REGISTRY.items():
+        if estimator_class in spec["classes"]:
+            return family
+    raise ValueError(f"{estimator_class.__name__} is not a registered model family")
+
+
+def model_params(model) -> dict:
+    """
+    Flat, JSON-friendly params of a built estimator, including its `model` family.
+    The family's thread param is left out, so recorded and planned params never
+    carry the thread count of the machine they were recorded on.
+    """
+    family = model_family(model)
+    params = {"model": family, **final_estimator(model).get_params(deep=False)}
+    params.pop(MODEL_REGISTRY[family]["threads"], None)
+    if dropped_columns(model):
+        params["drop_columns"] = dropped_columns(model)
+    return params
+
+
+def fitted_size(model):
+    """Trees (forests) or boosting iterations actually fitted, None for other families."""
+    estimator = final_estimator(model)
+    if hasattr(estimator, "estimators_"):
+        return len(estimator.estimators_)
+    if model_family(model) == "hist_gbm":
+        return int(estimator.n_iter_)
+    return None
+
+
+def as_model_input(model, X):
+    """Densify sparse input for families that do not accept it."""
+    if MODEL_REGISTRY[model_family(model)]["dense_only"] and sparse.issparse(X):
+        return X.toarray()
+    return X
+
+
+def _thread_cap(model, n_threads: int | None):
+    # Families without a thread param (OpenMP/BLAS) are capped through threadpoolctl
+    if n_threads and MODEL_REGISTRY[model_family(model)]["threads"] is None:
+        return threadpool_limits(n_threads)
+    return nullcontext()
+
+
+def fit_model(model, X_train, y_train, n_threads: int | None = None):
+    """
+    Fit with the family's conventions: dense input where sparse is unsupported,
+    and at most n_threads OpenMP/BLAS threads for families without a thread param
+    (build_model's n_threads only reaches families that have one).
+    """
+    X_train = as_model_input(model, X_train)
+    with _thread_cap(model, n_threads):
+        return model.fit(X_train, y_train)
+
+
+def predict_model(model, X, n_threads: int | None = None):
+    """Predict, densifying the input for families that need it (n_threads as in fit_model)."""
+    X = as_model_input(model, X)
+    with _thread_cap(model, n_threads):
+        return model.predict(X)
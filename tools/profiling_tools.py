@@ -0,0 +1,84 @@
+# profiling_tools.py
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def current_rss_mb() -> float | None:
+    """Current resident set size of this process, in MB (None if it cannot be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        return None
+
+
+@contextmanager
+def track_stage(session_service, session_id: str, stage: str, rows: int | None = None):
+    """
+    Record wall time, CPU time, memory and throughput of a pipeline stage.
+
+    Memory is the process' resident set size when the stage ends (`rss_mb`) and its
+    change since the stage started (`rss_delta_mb`); stages running concurrently in
+    threads share the process, so their deltas overlap.
+
+    Yields the record dict so the caller can fill in `rows` or `model_bytes`
+    once they are known; the record is appended to the session's "perf" list
+    when the block exits (also on errors).
+    """
+    record = {
+        "stage": stage,
+        "start": time.time(),
+        "rows": rows,
+        "model_bytes": None,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    rss_start = current_rss_mb()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield record
+    finally:
+        record["wall_seconds"] = time.perf_counter() - wall_start
+        record["cpu_seconds"] = time.process_time() - cpu_start
+        record["rss_mb"] = current_rss_mb()
+        record["rss_delta_mb"] = (record["rss_mb"] - rss_start
+                                  if record["rss_mb"] is not None and rss_start is not None else None)
+        record["rows_per_sec"] = (record["rows"] / record["wall_seconds"]
+                                  if record["rows"] and record["wall_seconds"] > 0 else None)
+        session_service.add_perf_record(session_id, record)
+
+
+def export_jsonl(records: list, path: str):
+    """Write performance records as JSON lines."""
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, default=str) + "\n")
+
+
+def export_chrome_trace(records: list, path: str):
+    """Write performance records in Chrome trace format (chrome://tracing, Perfetto)."""
+    events = []
+    for record in records:
+        args = {key: value for key, value in record.items()
+                if key not in ("stage", "start", "wall_seconds", "pid", "tid")}
+        events.append({
+            "name": record["stage"],
+            "ph": "X",
+            "ts": record["start"] * 1e6,
+            "dur": record["wall_seconds"] * 1e6,
+            "pid": record["pid"],
+            "tid": record["tid"],
+            "args": args,
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
@@ -0,0 +1,124 @@
+# search_tools.py
+
+import math
+import random
+import time
+
+
+class SearchBudget:
+    """
+    Wall-clock and/or CPU-seconds budget for a search.
+    Either limit may be None (unlimited).
+    """
+
+    def __init__(self, wall_seconds: float | None = None, cpu_seconds: float | None = None):
+        self.wall_seconds = wall_seconds
+        self.cpu_seconds = cpu_seconds
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+
+    def elapsed(self) -> dict:
+        return {
+            "wall_seconds": time.perf_counter() - self.wall_start,
+            "cpu_seconds": time.process_time() - self.cpu_start,
+        }
+
+    def exhausted(self) -> bool:
+        used = self.elapsed()
+        if self.wall_seconds is not None and used["wall_seconds"] >= self.wall_seconds:
+            return True
+        if self.cpu_seconds is not None and used["cpu_seconds"] >= self.cpu_seconds:
+            return True
+        return False
+
+
+def config_key(config: dict) -> tuple:
+    """Hashable, order-independent key for a parameter dict."""
+    return tuple(sorted(config.items(), key=lambda item: item[0]))
+
+
+def sample_configurations(n: int, random_state: int = 0) -> list:
+    """Sample `n` distinct RandomForest parameter dicts from a small search space."""
+    rng = random.Random(random_state)
+    space = {
+        "n_estimators": [50, 100, 200, 300, 400],
+        "max_depth": [None, 4, 6, 8, 12, 16, 24],
+        "max_features": ["sqrt", "log2", None, 0.5],
+        "min_samples_leaf": [1, 2, 4, 8, 16],
+    }
+    max_distinct = math.prod(len(values) for values in space.values())
+
+    configs, seen = [], set()
+    while len(configs) < min(n, max_distinct):
+        config = {name: rng.choice(values) for name, values in space.items()}
+        key = config_key(config)
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+
+def successive_halving(configs: list, evaluate, min_resource: float, max_resource: float = 1.0,
+                       eta: int = 3, budget: SearchBudget | None = None, history: list | None = None):
+    """
+    Successive halving: evaluate every config on `min_resource`, keep the best
+    1/eta, multiply the resource by eta and repeat until `max_resource`.
+
+    evaluate(config, resource) -> score (higher is better).
+    Returns a list of (score, resource, config) for the last rung reached,
+    best first. Stops early when the budget is exhausted.
+    """
+    survivors = list(configs)
+    resource = min_resource
+    rung = []
+
+    while survivors:
+        rung = []
+        for config in survivors:
+            if budget is not None and budget.exhausted() and rung:
+                break
+            score = evaluate(config, resource)
+            rung.append((score, resource, config))
+            if history is not None:
+                history.append({"params": config, "resource": resource, "score": score})
+
+        rung.sort(key=lambda item: item[0], reverse=True)
+        if resource >= max_resource or len(rung) <= 1:
+            break
+        if budget is not None and budget.exhausted():
+            break
+
+        survivors = [config for _, _, config in rung[:max(1, len(rung) // eta)]]
+        resource = min(resource * eta, max_resource)
+
+    return rung
+
+
+def hyperband(sample, evaluate, min_resource: float, max_resource: float = 1.0, eta: int = 3,
+              budget: SearchBudget | None = None, history: list | None = None,
+              n_configs: int | None = None):
+    """
+    Hyperband: run several successive-halving brackets that trade the number of
+    configurations against the starting resource.
+
+    sample(n) -> list of n configs; evaluate(config, resource) -> score.
+    n_configs: configurations of the most exploratory bracket (the one starting at
+    min_resource); the other brackets are scaled from it with the usual Hyperband
+    ratios. None keeps the textbook eta ** s_max.
+    Returns (score, resource, config) results of every bracket, best first.
+    """
+    s_max = int(math.floor(math.log(max_resource / min_resource, eta) + 1e-9))
+    scale = n_configs / eta ** s_max if n_configs else 1.0
+    results = []
+
+    for s in range(s_max, -1, -1):
+        if budget is not None and budget.exhausted():
+            break
+        bracket_configs = int(math.ceil(scale * (s_max + 1) / (s + 1) * eta ** s))
+        bracket_min = max_resource * eta ** (-s)
+        results.extend(successive_halving(sample(bracket_configs), evaluate, bracket_min,
+                                          max_resource, eta, budget, history))
+
+    # Prefer results obtained on more data, then higher score
+    results.sort(key=lambda item: (item[1], item[0]), reverse=True)
+    return results
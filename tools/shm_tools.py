@@ -0,0 +1,81 @@
+# shm_tools.py
+
+import numpy as np
+from multiprocessing import shared_memory
+from scipy import sparse
+
+
+def _share_array(arr: np.ndarray, blocks: list) -> dict:
+    """Copy one array into a new shared memory block and return its spec."""
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    blocks.append(shm)
+    return {"kind": "shm", "name": shm.name, "shape": arr.shape, "dtype": arr.dtype.str}
+
+
+def share_arrays(arrays: dict):
+    """
+    Place NumPy arrays (and CSR matrices) in shared memory so worker processes
+    can attach to them instead of receiving a pickled copy per task.
+
+    Object-dtype arrays cannot live in shared memory and are passed by value.
+    Returns (specs, blocks): `specs` is small and picklable, `blocks` must be
+    released with `release_shared` once the workers are done.
+    """
+    specs = {}
+    blocks = []
+    for key, value in arrays.items():
+        if sparse.issparse(value):
+            value = value.tocsr()
+            specs[key] = {
+                "kind": "csr",
+                "shape": value.shape,
+                "data": _share_array(value.data, blocks),
+                "indices": _share_array(value.indices, blocks),
+                "indptr": _share_array(value.indptr, blocks),
+            }
+        elif isinstance(value, np.ndarray) and value.dtype != object:
+            specs[key] = _share_array(value, blocks)
+        else:
+            specs[key] = {"kind": "value", "value": value}
+    return specs, blocks
+
+
+def _attach_array(spec: dict, handles: list) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    handles.append(shm)
+    return np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=shm.buf)
+
+
+def attach_arrays(specs: dict):
+    """
+    Rebuild the arrays described by `share_arrays` inside a worker (zero-copy).
+    Returns (arrays, handles); keep `handles` alive as long as the arrays are used.
+    """
+    arrays = {}
+    handles = []
+    for key, spec in specs.items():
+        if spec["kind"] == "csr":
+            arrays[key] = sparse.csr_matrix(
+                (_attach_array(spec["data"], handles),
+                 _attach_array(spec["indices"], handles),
+                 _attach_array(spec["indptr"], handles)),
+                shape=spec["shape"],
+                copy=False
+            )
+        elif spec["kind"] == "shm":
+            arrays[key] = _attach_array(spec, handles)
+        else:
+            arrays[key] = spec["value"]
+    return arrays, handles
+
+
+def release_shared(blocks: list):
+    """Close and unlink shared memory blocks created by `share_arrays`."""
+    for shm in blocks:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,270 @@
+# stream_stats.py - mergeable sketches (moments, quantiles, distinct counts) for streaming EDA
+
+import numpy as np
+import pandas as pd
+
+
+class RunningMoments:
+    """
+    Count, mean, variance, min and max of a numeric stream.
+    Each chunk is folded in with the parallel form of Welford's update
+    (Chan et al.), so instances computed on different chunks can be merged.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _combine(self, count, mean, m2, vmin, vmax):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, vmin)
+        self.max = max(self.max, vmax)
+
+    def update(self, values: np.ndarray):
+        """Fold a chunk of non-missing float values into the running moments."""
+        if len(values) == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        self._combine(len(values), mean, m2, float(values.min()), float(values.max()))
+
+    def merge(self, other: "RunningMoments"):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, like pandas)."""
+        if self.count < 2:
+            return float("nan")
+        return float(np.sqrt(self.m2 / (self.count - 1)))
+
+
+class QuantileSketch:
+    """
+    Mergeable approximate quantile sketch.
+    Keeps at most `max_centroids` (mean, weight) centroids; when full, the
+    sorted centroids are folded into equal-weight groups. Memory is bounded
+    regardless of stream length.
+    """
+
+    def __init__(self, max_centroids: int = 256):
+        self.max_centroids = max_centroids
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        if len(means) > self.max_centroids:
+            cum = np.cumsum(weights)
+            groups = np.minimum((cum - weights) * self.max_centroids // cum[-1],
+                                self.max_centroids - 1).astype(np.int64)
+            group_weights = np.bincount(groups, weights=weights)
+            group_sums = np.bincount(groups, weights=means * weights)
+            keep = group_weights > 0
+            weights = group_weights[keep]
+            means = group_sums[keep] / weights
+        self.means, self.weights = means, weights
+
+    def update(self, values: np.ndarray):
+        """Add a chunk of non-missing float values."""
+        if len(values) == 0:
+            return
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other: "QuantileSketch"):
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def quantile(self, q: float) -> float:
+        if len(self.means) == 0:
+            return float("nan")
+        # Place each centroid at the midpoint of the rank range it covers
+        cum = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * self.weights.sum(), cum, self.means))
+
+
+_NUMBER_START = list("0123456789+-.")
+
+
+def value_hashes(values: pd.Series) -> np.ndarray:
+    """
+    64-bit hashes of non-missing values that do not depend on the chunk's dtype:
+    numbers (and strings that parse as numbers) are hashed as float64, anything
+    else as its string form. A column read as int in one chunk and as float or
+    object in the next (e.g. once NaNs or stray strings appear) still hashes
+    equal values identically.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        numbers, text = values, values.iloc[:0]
+    else:
+        # Duplicates add nothing to a distinct count: parse each value once, and
+        # only the ones that can start a number
+        text = pd.Series(values.unique(), dtype=object).astype(str)
+        parsed = pd.to_numeric(text[text.str[:1].isin(_NUMBER_START)], errors="coerce").dropna()
+        numbers, text = parsed, text.drop(parsed.index)
+    # + 0.0 folds -0.0 into 0.0
+    numbers = pd.Series(numbers.to_numpy(dtype=np.float64) + 0.0)
+    return np.concatenate([
+        pd.util.hash_pandas_object(numbers, index=False).to_numpy(dtype=np.uint64),
+        pd.util.hash_pandas_object(text, index=False).to_numpy(dtype=np.uint64),
+    ])
+
+
+class HyperLogLog:
+    """
+    Mergeable approximate distinct counter (HyperLogLog, 2**p registers).
+    Relative error is about 1.04 / sqrt(2**p), i.e. ~1.6% for p=12.
+    """
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, values: pd.Series):
+        """Add a chunk of non-missing values of any dtype (see value_hashes)."""
+        if len(values) == 0:
+            return
+        hashes = value_hashes(values)
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes << np.uint64(self.p)
+        # Rank = position of the leftmost 1-bit in the remaining 64 - p bits
+        nonzero = rest != 0
+        ranks = np.full(len(rest), 64 - self.p + 1, dtype=np.uint8)
+        ranks[nonzero] = (64 - np.floor(np.log2(rest[nonzero].astype(np.float64)))).astype(np.uint8)
+        np.maximum.at(self.registers, idx, ranks)
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.m and zeros:
+            # Small-range correction (linear counting)
+            estimate = self.m * np.log(self.m / zeros)
+        return int(round(estimate))
+
+
+class ColumnProfile:
+    """Streaming statistics for one column."""
+
+    def __init__(self, dtype: str):
+        self.dtype = dtype
+        self.count = 0
+        self.missing = 0
+        self.distinct = HyperLogLog()
+        self.moments = None
+        self.quantiles = None
+
+    def update(self, series: pd.Series):
+        values = series.dropna()
+        self.missing += len(series) - len(values)
+        self.count += len(values)
+        self.distinct.update(values)
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            if self.moments is None:
+                self.moments = RunningMoments()
+                self.quantiles = QuantileSketch()
+            arr = values.to_numpy(dtype=np.float64)
+            self.moments.update(arr)
+            self.quantiles.update(arr)
+
+    def merge(self, other: "ColumnProfile"):
+        self.count += other.count
+        self.missing += other.missing
+        self.distinct.merge(other.distinct)
+        if other.moments is not None:
+            if self.moments is None:
+                self.moments = RunningMoments()
+                self.quantiles = QuantileSketch()
+            self.moments.merge(other.moments)
+            self.quantiles.merge(other.quantiles)
+
+    def describe(self) -> dict:
+        stats = {"count": self.count, "unique": self.distinct.count()}
+        if self.moments is not None and self.moments.count:
+            stats.update({
+                "mean": self.moments.mean,
+                "std": self.moments.std,
+                "min": self.moments.min,
+                "25%": self.quantiles.quantile(0.25),
+                "50%": self.quantiles.quantile(0.50),
+                "75%": self.quantiles.quantile(0.75),
+                "max": self.moments.max,
+            })
+        return stats
+
+
+class StreamingProfiler:
+    """
+    Chunk-by-chunk dataset profiler with bounded memory.
+    Produces a summary with the same keys as EDAAgent's in-memory summary.
+    Profilers built on different chunks (or files) can be merged.
+    """
+
+    def __init__(self, target_col: str, max_target_classes: int = 30):
+        self.target_col = target_col
+        self.max_target_classes = max_target_classes
+        self.n_rows = 0
+        self.columns = {}
+        self.target_counts = {}
+
+    def update(self, chunk: pd.DataFrame):
+        self.n_rows += len(chunk)
+        for col in chunk.columns:
+            profile = self.columns.get(col)
+            if profile is None:
+                profile = self.columns[col] = ColumnProfile(str(chunk[col].dtype))
+            elif profile.dtype != str(chunk[col].dtype):
+                # Chunks disagree (e.g. an int column with NaNs further down)
+                both_numeric = (profile.moments is not None
+                                and pd.api.types.is_numeric_dtype(chunk[col].dtype))
+                profile.dtype = "float64" if both_numeric else "object"
+            profile.update(chunk[col])
+
+        if self.target_counts is not None and self.target_col in chunk.columns:
+            for value, n in chunk[self.target_col].value_counts().items():
+                self.target_counts[value] = self.target_counts.get(value, 0) + int(n)
+            if len(self.target_counts) >= self.max_target_classes:
+                self.target_counts = None  # stop counting, too many classes
+
+    def merge(self, other: "StreamingProfiler"):
+        self.n_rows += other.n_rows
+        for col, profile in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(profile)
+            else:
+                self.columns[col] = profile
+        if self.target_counts is None or other.target_counts is None:
+            self.target_counts = None
+        else:
+            for value, n in other.target_counts.items():
+                self.target_counts[value] = self.target_counts.get(value, 0) + n
+            if len(self.target_counts) >= self.max_target_classes:
+                self.target_counts = None
+
+    def summary(self) -> dict:
+        return {
+            "shape": (self.n_rows, len(self.columns)),
+            "dtypes": {col: p.dtype for col, p in self.columns.items()},
+            "missing_values": {col: p.missing for col, p in self.columns.items()},
+            "target_distribution": dict(self.target_counts)
+            if self.target_counts is not None else "Too many unique values",
+            "description": {col: p.describe() for col, p in self.columns.items()},
+            "mode": "streaming"
+        }